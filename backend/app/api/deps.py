@@ -1,15 +1,40 @@
 """API dependencies."""
-from typing import Generator
-from sqlalchemy.orm import Session
-from fastapi import Depends
+from datetime import datetime
+from decimal import Decimal
+from typing import AsyncGenerator, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends, Header, HTTPException, Query, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 
-from app.db.database import get_db
+from app.db.database import get_async_db
+from app.db.replica import replica_router
 from app.core.security import get_current_user_id, get_current_tenant_id
+from app.models.deal import DealStage
+from app.models.user import User
+from app.schemas.deal import DealFilterParams
+from app.services.idempotency_service import IdempotencyContext, request_fingerprint
 
 
-def get_db_session() -> Generator:
-    """Get database session."""
-    yield from get_db()
+def get_db_session(db: AsyncSession = Depends(get_async_db)) -> AsyncSession:
+    """Get async database session."""
+    return db
+
+
+async def get_read_db_session(
+    tenant_id: int = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get async database session for read-only endpoints.
+
+    Uses the read replica if one is configured, within the lag bound and
+    caught up with this worker's writes for the tenant; the primary
+    session otherwise (see ``app.db.replica``).
+    """
+    async with replica_router.read_session(tenant_id, db) as session:
+        yield session
 
 
 def get_user_id(user_id: int = Depends(get_current_user_id)) -> int:
@@ -20,3 +45,81 @@ def get_user_id(user_id: int = Depends(get_current_user_id)) -> int:
 def get_tenant_id(tenant_id: int = Depends(get_current_tenant_id)) -> int:
     """Get current tenant ID."""
     return tenant_id
+
+
+async def get_admin_user_id(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> int:
+    """
+    Get current user ID, requiring an active admin (operational endpoints).
+
+    Raises:
+        HTTPException: 403 if the user is not an active admin
+    """
+    is_admin = await db.scalar(
+        select(User.is_admin).where(User.id == user_id, User.is_active.is_(True))
+    )
+    if not is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return user_id
+
+
+def get_deal_filters(
+    stage: Optional[DealStage] = Query(None),
+    stages: Optional[List[DealStage]] = Query(None),
+    min_value: Optional[Decimal] = Query(None),
+    max_value: Optional[Decimal] = Query(None),
+    min_health: Optional[int] = Query(None),
+    max_health: Optional[int] = Query(None),
+    close_after: Optional[datetime] = Query(None),
+    close_before: Optional[datetime] = Query(None),
+    stale_days: Optional[int] = Query(None),
+    company_prefix: Optional[str] = Query(None),
+    sort: str = Query("-updated_at"),
+) -> DealFilterParams:
+    """Get validated deal filter and sort parameters from the query string."""
+    try:
+        return DealFilterParams(
+            stage=stage,
+            stages=stages,
+            min_value=min_value,
+            max_value=max_value,
+            min_health=min_health,
+            max_health=max_health,
+            close_after=close_after,
+            close_before=close_before,
+            stale_days=stale_days,
+            company_prefix=company_prefix,
+            sort=sort,
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False, include_context=False))
+
+
+async def get_idempotency(
+    request: Request,
+    db: AsyncSession = Depends(get_db_session),
+    tenant_id: int = Depends(get_tenant_id),
+    idempotency_key: Optional[str] = Header(None, min_length=1, max_length=255),
+) -> AsyncGenerator[IdempotencyContext, None]:
+    """
+    Get the idempotency context for a write request.
+
+    Claims the Idempotency-Key (if sent) before the handler runs, and
+    releases it again if the handler fails so the client can retry.
+    """
+    body = await request.body()
+    context = IdempotencyContext(
+        tenant_id, idempotency_key, request_fingerprint(request.method, request.url.path, body)
+    )
+    await context.reserve(db)
+
+    try:
+        yield context
+    except Exception:
+        await context.release(db)
+        raise
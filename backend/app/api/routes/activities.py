@@ -1,36 +1,67 @@
 """Activity routes."""
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
-from app.api.deps import get_db_session, get_user_id, get_tenant_id
-from app.schemas.activity import ActivityCreate, ActivityResponse
-from app.models.activity import Activity
+from app.db.database import get_session_factory
+from app.api.deps import (
+    get_db_session,
+    get_read_db_session,
+    get_user_id,
+    get_tenant_id,
+    get_idempotency,
+)
+from app.schemas.activity import (
+    ActivityCreate,
+    ActivityResponse,
+    ActivityPage,
+    ActivityBatchResponse,
+)
+from app.models.activity import Activity, ActivityType
 from app.models.deal import Deal
+from app.models.outbox import OutboxEventType
+from app.services.activity_batch_service import ActivityBatchService
+from app.services.activity_counters import record_activities
+from app.services.contact_buffer import contact_buffer
+from app.services.outbox import append_events, outbox_event
+from app.services.archive_service import ArchiveService, decode_payload
+from app.services.activity_timeline import ActivityTimelineService
+from app.services.cursor import InvalidCursorError
+from app.services.export_service import ExportService, export_response
+from app.services.idempotency_service import IdempotencyContext
+from app.api.serializers import FastJSONResponse
+from app.core.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
 router = APIRouter()
+batch_service = ActivityBatchService()
+timeline_service = ActivityTimelineService()
+archive_service = ArchiveService()
+export_service = ExportService()
 
 
 @router.post("", response_model=ActivityResponse, status_code=status.HTTP_201_CREATED)
 async def create_activity(
     activity_data: ActivityCreate,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     user_id: int = Depends(get_user_id),
     tenant_id: int = Depends(get_tenant_id),
+    idempotency: IdempotencyContext = Depends(get_idempotency),
 ):
-    """Create a new activity."""
+    """Create a new activity (supports the Idempotency-Key header)."""
+    if idempotency.replay:
+        return idempotency.replay
+
     # Verify deal exists and belongs to tenant
-    deal = (
-        db.query(Deal)
-        .filter(Deal.id == activity_data.deal_id, Deal.tenant_id == tenant_id)
-        .first()
+    deal_id = await db.scalar(
+        select(Deal.id).where(Deal.id == activity_data.deal_id, Deal.tenant_id == tenant_id)
     )
 
-    if not deal:
+    if not deal_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Deal not found",
@@ -38,48 +69,211 @@ async def create_activity(
 
     # Create activity
     activity = Activity(
+        tenant_id=tenant_id,
         user_id=user_id,
         **activity_data.model_dump(),
     )
 
-    # Update deal's last_contact_at
-    deal.last_contact_at = datetime.utcnow()
-
     db.add(activity)
-    db.commit()
-    db.refresh(activity)
+    await db.flush()
+    await db.run_sync(
+        append_events,
+        [
+            outbox_event(
+                tenant_id,
+                OutboxEventType.ACTIVITY_CREATED,
+                activity.id,
+                deal_id=deal_id,
+                activity_type=activity.activity_type.value,
+            )
+        ],
+    )
+    # Counters and change sequence in one deal UPDATE, last as it locks the tenant row
+    await db.run_sync(record_activities, [(deal_id, activity.activity_type, None)], tenant_id)
+    await db.refresh(activity)
+
+    response = FastJSONResponse(
+        ActivityResponse.model_validate(activity), status_code=status.HTTP_201_CREATED
+    )
+
+    await idempotency.complete(db, response)
+    await db.commit()
+
+    # Update deal's last_contact_at (coalesced, written by the flush loop)
+    contact_buffer.bump(deal_id)
+
+    logger.info(f"Created activity {activity.id} for deal {deal_id}")
+
+    return response
+
+
+@router.post("/batch", response_model=ActivityBatchResponse, status_code=status.HTTP_201_CREATED)
+async def create_activities_batch(
+    items: List[Dict[str, Any]],
+    db: AsyncSession = Depends(get_db_session),
+    user_id: int = Depends(get_user_id),
+    tenant_id: int = Depends(get_tenant_id),
+    idempotency: IdempotencyContext = Depends(get_idempotency),
+):
+    """
+    Log many activities across many deals in a single request.
+
+    Intended for telephony and mail-sync integrations. Items may carry a
+    ``created_at`` timestamp of the call or email. Every item gets a result
+    (by request index) with either the created activity ID or its errors;
+    valid items are written even if others are rejected. Each deal's
+    ``last_contact_at`` is advanced once to its newest activity.
+    Supports the ``Idempotency-Key`` header for safe retries.
+
+    Args:
+        items: List of activity data
+
+    Returns:
+        Per-item results
+    """
+    if idempotency.replay:
+        return idempotency.replay
+
+    if not items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No activities provided"
+        )
 
-    logger.info(f"Created activity {activity.id} for deal {deal.id}")
+    if len(items) > settings.ACTIVITY_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Maximum {settings.ACTIVITY_BATCH_MAX_ITEMS} activities per batch"
+        )
+
+    valid, rejected = batch_service.validate_items(items)
+    results = await db.run_sync(batch_service.ingest, tenant_id, user_id, valid)
+
+    results = sorted(rejected + results, key=lambda result: result.index)
+    error_count = sum(1 for result in results if result.errors)
+
+    response = FastJSONResponse(
+        ActivityBatchResponse(
+            results=results,
+            created_count=len(results) - error_count,
+            error_count=error_count,
+        ),
+        status_code=status.HTTP_201_CREATED,
+    )
 
-    return ActivityResponse.model_validate(activity)
+    await idempotency.complete(db, response)
+    await db.commit()
 
+    return response
 
-@router.get("/deal/{deal_id}", response_model=List[ActivityResponse])
+
+@router.get("/feed", response_model=ActivityPage)
+async def get_activity_feed(
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    user_id: Optional[int] = Query(None),
+    activity_type: Optional[ActivityType] = Query(None),
+    since: Optional[datetime] = Query(None),
+    db: AsyncSession = Depends(get_read_db_session),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """
+    Get a page of all activities in the tenant's pipeline, newest first.
+
+    Filters:
+        - user_id: Activities logged by one user
+        - activity_type: One activity type
+        - since: Created at or after this time (e.g. start of today)
+
+    Pass ``next_cursor`` of a page as ``cursor`` to load the next one.
+    """
+    try:
+        query = timeline_service.feed_query(
+            tenant_id, user_id, activity_type, since, cursor, limit + 1
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return FastJSONResponse(_activity_page((await db.scalars(query)).all(), limit))
+
+
+@router.get("/deal/{deal_id}", response_model=ActivityPage)
 async def get_deal_activities(
     deal_id: int,
-    db: Session = Depends(get_db_session),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    activity_type: Optional[ActivityType] = Query(None),
+    db: AsyncSession = Depends(get_read_db_session),
     tenant_id: int = Depends(get_tenant_id),
 ):
-    """Get all activities for a deal."""
+    """
+    Get a page of a deal's activities, newest first.
+
+    Pass ``next_cursor`` of a page as ``cursor`` to load the next one.
+    Timelines of archived deals are read from the archive.
+    """
     # Verify deal exists and belongs to tenant
-    deal = (
-        db.query(Deal)
-        .filter(Deal.id == deal_id, Deal.tenant_id == tenant_id)
-        .first()
+    deal_exists = await db.scalar(
+        select(Deal.id).where(Deal.id == deal_id, Deal.tenant_id == tenant_id)
     )
 
-    if not deal:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Deal not found",
-        )
+    if not deal_exists:
+        payload = await db.scalar(archive_service.archived_deal_query(tenant_id, deal_id))
+        if payload is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Deal not found",
+            )
+        try:
+            activities, next_cursor = archive_service.page_activities(
+                decode_payload(payload)["activities"], activity_type, cursor, limit
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return FastJSONResponse({"activities": activities, "next_cursor": next_cursor})
+
+    try:
+        query = timeline_service.timeline_query(deal_id, activity_type, cursor, limit + 1)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return FastJSONResponse(_activity_page((await db.scalars(query)).all(), limit))
 
-    # Get activities
-    activities = (
-        db.query(Activity)
-        .filter(Activity.deal_id == deal_id)
-        .order_by(Activity.created_at.desc())
-        .all()
+
+def _activity_page(activities: List[Activity], limit: int) -> ActivityPage:
+    """Build a page from up to limit + 1 rows (the extra row means more exist)."""
+    page = activities[:limit]
+    return ActivityPage(
+        activities=[ActivityResponse.model_validate(activity) for activity in page],
+        next_cursor=timeline_service.encode_cursor(page[-1]) if len(activities) > limit else None,
     )
 
-    return [ActivityResponse.model_validate(activity) for activity in activities]
+
+@router.get("/export")
+async def export_activities(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    gzip: bool = Query(False),
+    deal_id: Optional[int] = Query(None),
+    activity_type: Optional[ActivityType] = Query(None),
+    session_factory=Depends(get_session_factory),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """
+    Export the tenant's activities as CSV or NDJSON.
+
+    Rows are streamed from a server-side cursor, so memory use does not
+    grow with the number of activities.
+
+    Returns:
+        Streaming file download (optionally gzip-compressed)
+    """
+    query = export_service.activity_export_query(tenant_id, deal_id, activity_type)
+
+    logger.info(f"Exporting activities ({export_format}) for tenant {tenant_id}")
+
+    return export_response(
+        export_service.stream(session_factory, query, export_format, gzip),
+        "activities",
+        export_format,
+        gzip,
+    )
@@ -1,11 +1,13 @@
 """Authentication routes."""
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db_session
 from app.schemas.user import UserCreate, UserLogin, Token, UserResponse
 from app.models.user import User, Tenant
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import create_access_token
+from app.core.hashing import password_hasher
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -14,33 +16,38 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db_session)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db_session)):
     """Register a new user and tenant."""
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
+    # End the read transaction and return the connection to the pool while
+    # bcrypt runs, then write in a new transaction
+    await db.rollback()
+    hashed_password = await password_hasher.hash(user_data.password)
+
     # Create tenant
     subdomain = user_data.tenant_name.lower().replace(" ", "-")
     tenant = Tenant(name=user_data.tenant_name, subdomain=subdomain)
     db.add(tenant)
-    db.flush()
+    await db.flush()
 
     # Create user
     user = User(
         tenant_id=tenant.id,
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=hashed_password,
         full_name=user_data.full_name,
         is_admin=True,  # First user is admin
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     # Create access token
     access_token = create_access_token(
@@ -56,12 +63,12 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db_session))
 
 
 @router.post("/login", response_model=Token)
-async def login(credentials: UserLogin, db: Session = Depends(get_db_session)):
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db_session)):
     """Login user."""
     # Find user
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await db.scalar(select(User).where(User.email == credentials.email))
 
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not user or not await password_hasher.verify(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
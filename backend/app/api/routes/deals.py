@@ -1,17 +1,74 @@
 """Deal routes."""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import Optional, List
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+import os
+import orjson
 from datetime import datetime
-
-from app.api.deps import get_db_session, get_user_id, get_tenant_id
-from app.schemas.deal import DealCreate, DealUpdate, DealResponse, DealListResponse
+from decimal import Decimal
+
+from app.db.database import get_session_factory
+from app.api.deps import (
+    get_db_session,
+    get_read_db_session,
+    get_user_id,
+    get_tenant_id,
+    get_deal_filters,
+    get_idempotency,
+)
+from app.schemas.deal import (
+    DealCreate,
+    DealUpdate,
+    DealResponse,
+    DealListResponse,
+    DealFilterParams,
+    BulkCreateResponse,
+    BulkDealUpdate,
+)
 from app.schemas.insights import DealInsights, PipelineSummary
+from app.schemas.import_job import ImportJobResponse
+from app.schemas.board import BoardResponse, BoardColumn
+from app.schemas.archive import ArchivedDealListResponse, ArchivedDealSummary
+from app.schemas.change_feed import DealChangesResponse
 from app.models.deal import Deal, DealStage
 from app.models.activity import Activity, ActivityType
+from app.models.import_job import ImportJob, ImportStatus, ImportFormat
+from app.models.outbox import OutboxEventType
 from app.services.ai_service import AIService
 from app.services.health_scoring import calculate_deal_health_score
 from app.services.insights_service import InsightsService
+from app.services.deal_query import DealQueryPlanner
+from app.services.board_service import BoardService
+from app.services.cursor import InvalidCursorError
+from app.services.bulk_service import BulkDealService
+from app.services.activity_counters import initial_counters, record_activities
+from app.services.contact_buffer import contact_buffer
+from app.services.import_service import ImportService
+from app.services.export_service import ExportService, export_response
+from app.services.archive_service import ArchiveService, decode_payload
+from app.services.outbox import append_events, deal_change_events, outbox_event
+from app.services.change_feed import (
+    FEED_START,
+    ChangeFeedService,
+    next_change_seqs,
+    record_tombstones,
+)
+from app.services.idempotency_service import IdempotencyContext
+from app.api.serializers import FastJSONResponse
+from app.services.serialization import deal_to_dict, deal_list_json
+from app.core.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -19,30 +76,48 @@ logger = get_logger(__name__)
 router = APIRouter()
 ai_service = AIService()
 insights_service = InsightsService()
+bulk_service = BulkDealService()
+import_service = ImportService()
+export_service = ExportService()
+archive_service = ArchiveService()
+
+# Header marking responses served from the archive
+ARCHIVED_HEADER = "Deal-Archived"
 
 
 @router.post("", response_model=DealResponse, status_code=status.HTTP_201_CREATED)
 async def create_deal(
     deal_data: DealCreate,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     user_id: int = Depends(get_user_id),
     tenant_id: int = Depends(get_tenant_id),
+    idempotency: IdempotencyContext = Depends(get_idempotency),
 ):
-    """Create a new deal."""
+    """
+    Create a new deal.
+
+    Send an ``Idempotency-Key`` header to make retries safe: a repeated
+    request with the same key returns the stored response.
+    """
+    if idempotency.replay:
+        return idempotency.replay
+
     # Create deal
     deal = Deal(
         tenant_id=tenant_id,
         **deal_data.model_dump(),
+        **initial_counters(ActivityType.SYSTEM),
     )
 
     # Calculate initial health score
     deal.health_score = calculate_deal_health_score(deal)
 
     db.add(deal)
-    db.flush()
+    await db.flush()
 
     # Create system activity
     activity = Activity(
+        tenant_id=tenant_id,
         deal_id=deal.id,
         user_id=user_id,
         activity_type=ActivityType.SYSTEM,
@@ -50,48 +125,71 @@ async def create_deal(
         description=f"Deal '{deal.title}' wurde angelegt",
     )
     db.add(activity)
-    db.commit()
-    db.refresh(deal)
+    await db.run_sync(
+        append_events,
+        [outbox_event(tenant_id, OutboxEventType.DEAL_CREATED, deal.id, stage=deal.stage.value)],
+    )
+
+    # Taken last, so the tenant row is locked only until the commit
+    deal.change_seq = await db.run_sync(next_change_seqs, tenant_id)
+    await db.flush()
+    await db.refresh(deal)
+
+    # Store the response for replays without AI recommendations, so the
+    # transaction (and the tenant row lock) does not wait for Gemini
+    data = deal_to_dict(deal)
+    await idempotency.complete(db, FastJSONResponse(data, status_code=status.HTTP_201_CREATED))
+    await db.commit()
 
     logger.info(f"Created deal {deal.id} for tenant {tenant_id}")
 
     # Get AI recommendations
-    response_data = DealResponse.model_validate(deal)
-    response_data.next_actions = ai_service.generate_next_actions(deal)
-
-    return response_data
+    data["next_actions"] = ai_service.generate_next_actions(deal)
+    return FastJSONResponse(data, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("", response_model=DealListResponse)
 async def list_deals(
-    stage: Optional[DealStage] = Query(None),
+    filters: DealFilterParams = Depends(get_deal_filters),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
     tenant_id: int = Depends(get_tenant_id),
 ):
-    """List all deals for the tenant."""
-    query = db.query(Deal).filter(Deal.tenant_id == tenant_id)
+    """
+    List deals for the tenant with server-side filtering and sorting.
+
+    Filters:
+        - stage / stages: One or more pipeline stages
+        - min_value / max_value: Deal value range
+        - min_health / max_health: Health score range
+        - close_after / close_before: Expected close window
+        - stale_days: No contact for at least N days
+        - company_prefix: Company name prefix
+        - sort: Comma-separated sort keys, "-" prefix for descending
+    """
+    planner = DealQueryPlanner(tenant_id, filters)
 
-    if stage:
-        query = query.filter(Deal.stage == stage)
+    rows = (await db.execute(planner.paginated(skip, limit))).all()
+    if rows:
+        total = rows[0].total
+    else:
+        # Page past the end - the window count is not available
+        total = await db.scalar(planner.count()) if skip else 0
 
-    total = query.count()
-    deals = query.order_by(Deal.updated_at.desc()).offset(skip).limit(limit).all()
+    contact_buffer.merge(deal for deal, _ in rows)
 
-    # Add AI recommendations to each deal
-    deals_with_actions = []
-    for deal in deals:
-        deal_response = DealResponse.model_validate(deal)
-        deal_response.next_actions = ai_service.generate_next_actions(deal)
-        deals_with_actions.append(deal_response)
+    # Add AI recommendations to each deal (Gemini for the first few only)
+    deals = [deal for deal, _ in rows]
+    actions = ai_service.generate_next_actions_for(deals, settings.AI_SUGGESTIONS_PER_REQUEST)
+    deals_with_actions = [deal_to_dict(deal, deal_actions) for deal, deal_actions in zip(deals, actions)]
 
-    return DealListResponse(deals=deals_with_actions, total=total)
+    return FastJSONResponse({"deals": deals_with_actions, "total": total})
 
 
 @router.get("/insights/summary", response_model=DealInsights)
 async def get_deal_insights(
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
     tenant_id: int = Depends(get_tenant_id),
 ):
     """
@@ -103,167 +201,151 @@ async def get_deal_insights(
         - High-priority deals
         - Upcoming close dates
         - Stage conversion rates
+
+
+    The insights service runs its queries through ``run_sync`` on the
+    async session's connection.
     """
     # Get pipeline summary
-    summary = insights_service.get_pipeline_summary(db, tenant_id)
+    summary = await db.run_sync(insights_service.get_pipeline_summary, tenant_id)
 
     # Get weekly summary text
-    weekly_summary = insights_service.get_weekly_summary(db, tenant_id)
+    weekly_summary = await db.run_sync(insights_service.get_weekly_summary, tenant_id)
 
-    # Get at-risk deals
-    at_risk_deals = insights_service.get_at_risk_deals(db, tenant_id)
-    at_risk_responses = []
-    for deal in at_risk_deals[:5]:  # Limit to top 5
-        response = DealResponse.model_validate(deal)
-        response.next_actions = ai_service.generate_next_actions(deal)
-        at_risk_responses.append(response)
+    # Get at-risk deals (top 5)
+    at_risk_deals = (await db.run_sync(insights_service.get_at_risk_deals, tenant_id))[:5]
 
     # Get high-priority deals
-    high_priority_deals = insights_service.get_high_priority_deals(db, tenant_id)
-    high_priority_responses = []
-    for deal in high_priority_deals[:5]:
-        response = DealResponse.model_validate(deal)
-        response.next_actions = ai_service.generate_next_actions(deal)
-        high_priority_responses.append(response)
+    high_priority_deals = (await db.run_sync(insights_service.get_high_priority_deals, tenant_id))[:5]
 
     # Get upcoming close deals
-    upcoming_close = insights_service.get_upcoming_close_dates(db, tenant_id, days=14)
-    upcoming_responses = []
-    for deal in upcoming_close:
-        response = DealResponse.model_validate(deal)
-        response.next_actions = ai_service.generate_next_actions(deal)
-        upcoming_responses.append(response)
+    upcoming_close = await db.run_sync(insights_service.get_upcoming_close_dates, tenant_id, 14)
+
+    # Add AI recommendations (Gemini for the first few deals only)
+    featured = [*at_risk_deals, *high_priority_deals, *upcoming_close]
+    actions = iter(ai_service.generate_next_actions_for(featured, settings.AI_SUGGESTIONS_PER_REQUEST))
+    at_risk_responses = [deal_to_dict(deal, next(actions)) for deal in at_risk_deals]
+    high_priority_responses = [deal_to_dict(deal, next(actions)) for deal in high_priority_deals]
+    upcoming_responses = [deal_to_dict(deal, next(actions)) for deal in upcoming_close]
 
     # Get stage conversion rates
-    conversion_rates = insights_service.get_stage_conversion_rates(db, tenant_id)
+    conversion_rates = await db.run_sync(insights_service.get_stage_conversion_rates, tenant_id)
 
     logger.info(f"Generated insights for tenant {tenant_id}")
 
-    return DealInsights(
-        summary=PipelineSummary(**summary),
-        weekly_summary=weekly_summary,
-        at_risk_deals=at_risk_responses,
-        high_priority_deals=high_priority_responses,
-        upcoming_close_deals=upcoming_responses,
-        stage_conversion_rates=conversion_rates,
+    return FastJSONResponse(
+        {
+            "summary": PipelineSummary(**summary).model_dump(),
+            "weekly_summary": weekly_summary,
+            "at_risk_deals": at_risk_responses,
+            "high_priority_deals": high_priority_responses,
+            "upcoming_close_deals": upcoming_responses,
+            "stage_conversion_rates": conversion_rates,
+        }
     )
 
 
-@router.get("/{deal_id}", response_model=DealResponse)
-async def get_deal(
-    deal_id: int,
-    db: Session = Depends(get_db_session),
+@router.get("/board", response_model=BoardResponse)
+async def get_pipeline_board(
+    per_stage: int = Query(20, ge=1, le=100),
+    filters: DealFilterParams = Depends(get_deal_filters),
+    db: AsyncSession = Depends(get_db_session),
     tenant_id: int = Depends(get_tenant_id),
 ):
-    """Get a specific deal by ID."""
-    deal = (
-        db.query(Deal)
-        .filter(Deal.id == deal_id, Deal.tenant_id == tenant_id)
-        .first()
-    )
-
-    if not deal:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Deal not found",
-        )
+    """
+    Get the pipeline board: deals grouped by stage.
 
-    # Add AI recommendations
-    response_data = DealResponse.model_validate(deal)
-    response_data.next_actions = ai_service.generate_next_actions(deal)
+    Every column carries the stage's deal count and value sum plus its top
+    ``per_stage`` deals, all from one window-function query. Use a column's
+    ``next_cursor`` with ``GET /api/deals/board/{board_stage}`` to load more.
 
-    return response_data
+    Accepts the deal list filters. ``sort`` must be one of value,
+    updated_at or created_at (optionally with "-"). AI recommendations are
+    not generated for board cards.
+    """
+    board = _board_service(tenant_id, filters)
+
+    rows = (await db.execute(board.board_query(per_stage))).all()
+
+    columns = {stage: {"deals": [], "count": 0, "total_value": None} for stage in board.stages()}
+    contact_buffer.merge(deal for deal, _, _ in rows)
+
+    for deal, stage_count, stage_value in rows:
+        column = columns[deal.stage]
+        column["deals"].append(deal)
+        column["count"] = stage_count
+        column["total_value"] = stage_value
+
+    return FastJSONResponse(
+        {
+            "columns": [
+                _board_column(board, stage, column["deals"], column["count"], column["total_value"])
+                for stage, column in columns.items()
+            ]
+        }
+    )
 
 
-@router.patch("/{deal_id}", response_model=DealResponse)
-async def update_deal(
-    deal_id: int,
-    deal_data: DealUpdate,
-    db: Session = Depends(get_db_session),
-    user_id: int = Depends(get_user_id),
+@router.get("/board/{board_stage}", response_model=BoardColumn)
+async def get_pipeline_board_column(
+    board_stage: DealStage,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    filters: DealFilterParams = Depends(get_deal_filters),
+    db: AsyncSession = Depends(get_db_session),
     tenant_id: int = Depends(get_tenant_id),
 ):
-    """Update a deal."""
-    deal = (
-        db.query(Deal)
-        .filter(Deal.id == deal_id, Deal.tenant_id == tenant_id)
-        .first()
-    )
-
-    if not deal:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Deal not found",
-        )
-
-    # Track stage changes
-    old_stage = deal.stage
-    update_data = deal_data.model_dump(exclude_unset=True)
-
-    # Update fields
-    for field, value in update_data.items():
-        setattr(deal, field, value)
-
-    # Update last_contact_at when deal is updated
-    deal.last_contact_at = datetime.utcnow()
-
-    # Recalculate health score
-    deal.health_score = calculate_deal_health_score(deal)
-
-    # Create activity for stage change
-    if "stage" in update_data and old_stage != deal.stage:
-        activity = Activity(
-            deal_id=deal.id,
-            user_id=user_id,
-            activity_type=ActivityType.STAGE_CHANGE,
-            title="Stage geändert",
-            description=f"Stage von '{old_stage.value}' zu '{deal.stage.value}' geändert",
-        )
-        db.add(activity)
-
-    db.commit()
-    db.refresh(deal)
+    """
+    Load more deals of one board column.
 
-    logger.info(f"Updated deal {deal.id}")
+    Pages with the keyset cursor from the board (or a previous page), using
+    the same filters and sort as the board request. ``board_stage`` is
+    the column's stage (the ``stage`` query filter still applies).
+    """
+    board = _board_service(tenant_id, filters)
 
-    # Add AI recommendations
-    response_data = DealResponse.model_validate(deal)
-    response_data.next_actions = ai_service.generate_next_actions(deal)
+    try:
+        query = board.column_query(board_stage, cursor, limit + 1)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    return response_data
+    deals = (await db.scalars(query)).all()
+    contact_buffer.merge(deals)
+    count, total_value = (await db.execute(board.column_totals_query(board_stage))).one()
 
+    column = _board_column(board, board_stage, deals[:limit], count, total_value)
+    column["next_cursor"] = board.encode_cursor(deals[limit - 1]) if len(deals) > limit else None
+    return FastJSONResponse(column)
 
-@router.delete("/{deal_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_deal(
-    deal_id: int,
-    db: Session = Depends(get_db_session),
-    tenant_id: int = Depends(get_tenant_id),
-):
-    """Delete a deal."""
-    deal = (
-        db.query(Deal)
-        .filter(Deal.id == deal_id, Deal.tenant_id == tenant_id)
-        .first()
-    )
 
-    if not deal:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Deal not found",
-        )
+def _board_service(tenant_id: int, filters: DealFilterParams) -> BoardService:
+    """Create the board service, rejecting unsupported sorts."""
+    try:
+        return BoardService(tenant_id, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
 
-    db.delete(deal)
-    db.commit()
 
-    logger.info(f"Deleted deal {deal_id}")
+def _board_column(
+    board: BoardService, stage: DealStage, deals: List[Deal], count: int, total_value: Any
+) -> Dict[str, Any]:
+    """Build a board column payload; the cursor is set while the stage has more deals."""
+    return {
+        "stage": stage,
+        "count": count,
+        "total_value": Decimal(str(total_value or 0)),
+        "deals": [deal_to_dict(deal) for deal in deals],
+        "next_cursor": board.encode_cursor(deals[-1]) if deals and count > len(deals) else None,
+    }
 
 
-@router.post("/bulk", response_model=List[DealResponse], status_code=status.HTTP_201_CREATED)
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
 async def bulk_create_deals(
-    deals_data: List[DealCreate],
-    db: Session = Depends(get_db_session),
+    deals_data: List[Dict[str, Any]],
+    db: AsyncSession = Depends(get_db_session),
     user_id: int = Depends(get_user_id),
     tenant_id: int = Depends(get_tenant_id),
+    idempotency: IdempotencyContext = Depends(get_idempotency),
 ):
     """
     Create multiple deals in a single request.
@@ -273,79 +355,76 @@ async def bulk_create_deals(
     - Automation workflows
     - Batch processing from external systems
 
+    Rows are validated individually: invalid rows are reported in
+    ``errors`` (by request index) while all valid rows are created.
+    Deals and their activities are written with one multi-row INSERT each.
+    AI recommendations are not generated for bulk-created deals.
+    Supports the ``Idempotency-Key`` header for safe retries.
+
     Args:
         deals_data: List of deal creation data
 
     Returns:
-        List of created deals
+        Created deals and per-row errors
     """
+    if idempotency.replay:
+        return idempotency.replay
+
     if not deals_data:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No deals provided"
         )
 
-    if len(deals_data) > 100:
+    if len(deals_data) > settings.BULK_MAX_DEALS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Maximum 100 deals per bulk request"
-        )
-
-    created_deals = []
-
-    for deal_data in deals_data:
-        # Create deal
-        deal = Deal(
-            tenant_id=tenant_id,
-            **deal_data.model_dump(),
+            detail=f"Maximum {settings.BULK_MAX_DEALS} deals per bulk request"
         )
 
-        # Calculate initial health score
-        deal.health_score = calculate_deal_health_score(deal)
+    valid, errors = bulk_service.validate_create_rows(deals_data)
 
-        db.add(deal)
-        db.flush()
-
-        # Create system activity
-        activity = Activity(
-            deal_id=deal.id,
-            user_id=user_id,
-            activity_type=ActivityType.SYSTEM,
-            title="Deal erstellt",
-            description=f"Deal '{deal.title}' wurde per Bulk-Import angelegt",
-        )
-        db.add(activity)
+    created_deals = await db.run_sync(
+        bulk_service.insert_deals, tenant_id, user_id, [deal_data for _, deal_data in valid]
+    )
 
-        created_deals.append(deal)
+    created_json = deal_list_json(created_deals)
 
-    db.commit()
+    response = FastJSONResponse(
+        {
+            "created": orjson.Fragment(created_json),
+            "errors": [error.model_dump() for error in errors],
+            "created_count": len(created_deals),
+            "error_count": len(errors),
+        },
+        status_code=status.HTTP_201_CREATED,
+    )
 
-    # Refresh and prepare responses
-    responses = []
-    for deal in created_deals:
-        db.refresh(deal)
-        response = DealResponse.model_validate(deal)
-        response.next_actions = ai_service.generate_next_actions(deal)
-        responses.append(response)
+    await idempotency.complete(db, response)
+    await db.commit()
 
-    logger.info(f"Bulk created {len(created_deals)} deals for tenant {tenant_id}")
+    logger.info(
+        f"Bulk created {len(created_deals)} deals for tenant {tenant_id} "
+        f"({len(errors)} rejected)"
+    )
 
-    return responses
+    return response
 
 
 @router.patch("/bulk-update", response_model=List[DealResponse])
 async def bulk_update_deals(
-    updates: List[dict],
-    db: Session = Depends(get_db_session),
+    updates: List[BulkDealUpdate],
+    db: AsyncSession = Depends(get_db_session),
     user_id: int = Depends(get_user_id),
     tenant_id: int = Depends(get_tenant_id),
+    idempotency: IdempotencyContext = Depends(get_idempotency),
 ):
     """
     Update multiple deals in a single request.
 
     Each update should include:
     - id: Deal ID to update
-    - ...fields to update
+    - ...fields to update (validated like DealUpdate)
 
     Example:
     [
@@ -353,79 +432,371 @@ async def bulk_update_deals(
         {"id": 2, "value": 50000}
     ]
 
+    Deals that do not exist for the tenant are skipped. AI recommendations
+    are not generated for bulk-updated deals. Supports the
+    ``Idempotency-Key`` header for safe retries.
+
     Returns:
         List of updated deals
     """
+    if idempotency.replay:
+        return idempotency.replay
+
     if not updates:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No updates provided"
         )
 
-    if len(updates) > 100:
+    if len(updates) > settings.BULK_MAX_DEALS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Maximum 100 deals per bulk update"
+            detail=f"Maximum {settings.BULK_MAX_DEALS} deals per bulk update"
         )
 
-    updated_deals = []
+    updated_ids = await db.run_sync(bulk_service.update_deals, tenant_id, user_id, updates)
+
+    # Reload all updated deals with one query
+    deals = {}
+    if updated_ids:
+        result = await db.scalars(
+            select(Deal)
+            .where(Deal.id.in_(updated_ids))
+            .execution_options(populate_existing=True)
+        )
+        deals = {deal.id: deal for deal in result}
+    response = Response(
+        deal_list_json(deals[deal_id] for deal_id in updated_ids),
+        media_type="application/json",
+    )
+
+    await idempotency.complete(db, response)
+    await db.commit()
 
-    for update_data in updates:
-        if "id" not in update_data:
+    logger.info(f"Bulk updated {len(updated_ids)} deals for tenant {tenant_id}")
+
+    return response
+
+
+@router.post("/import", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def import_deals(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    file_format: Optional[ImportFormat] = Query(None, alias="format"),
+    chunk_size: int = Query(settings.IMPORT_CHUNK_SIZE, ge=1, le=settings.BULK_MAX_DEALS),
+    db: AsyncSession = Depends(get_db_session),
+    session_factory=Depends(get_session_factory),
+    user_id: int = Depends(get_user_id),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """
+    Import deals from a CSV or NDJSON file.
+
+    The upload is spooled to a temporary file and imported in the
+    background, one chunk of rows per commit. Invalid rows are counted and
+    reported without stopping the import. Poll the returned job via
+    ``GET /api/deals/import/{job_id}``.
+
+    CSV files need a header row with DealCreate field names
+    (title, company_name, value, ...). NDJSON files hold one deal object
+    per line. The format is detected from the file name unless given.
+
+    Returns:
+        The queued import job
+    """
+    # Copy the upload in a worker thread (file I/O would block the event loop).
+    # The job is only created once the copy is complete, so a failed upload
+    # does not leave a job that never runs.
+    spool_path = await run_in_threadpool(import_service.spool_upload, file.file)
+
+    job = ImportJob(
+        tenant_id=tenant_id,
+        user_id=user_id,
+        file_format=file_format or import_service.detect_format(file.filename, file.content_type),
+        filename=file.filename,
+        status=ImportStatus.PENDING,
+        processed_rows=0,
+        imported_rows=0,
+        failed_rows=0,
+        errors=[],
+    )
+    try:
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+    except BaseException:
+        await run_in_threadpool(os.unlink, spool_path)
+        raise
+
+    background_tasks.add_task(
+        import_service.run_import_file, session_factory, job.id, spool_path, chunk_size
+    )
+
+    logger.info(f"Queued import job {job.id} ({job.file_format.value}) for tenant {tenant_id}")
+
+    return ImportJobResponse.model_validate(job)
+
+
+@router.get("/import/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db_session),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """Get progress and error counts of an import job."""
+    job = await db.scalar(
+        select(ImportJob).where(ImportJob.id == job_id, ImportJob.tenant_id == tenant_id)
+    )
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found",
+        )
+
+    return ImportJobResponse.model_validate(job)
+
+
+@router.get("/export")
+async def export_deals(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    gzip: bool = Query(False),
+    filters: DealFilterParams = Depends(get_deal_filters),
+    session_factory=Depends(get_session_factory),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """
+    Export the tenant's deals as CSV or NDJSON.
+
+    Accepts the same filters and sort keys as the deal list. Rows are
+    streamed from a server-side cursor, so memory use does not grow with
+    the number of deals.
+
+    Returns:
+        Streaming file download (optionally gzip-compressed)
+    """
+    query = export_service.deal_export_query(tenant_id, filters)
+
+    logger.info(f"Exporting deals ({export_format}) for tenant {tenant_id}")
+
+    return export_response(
+        export_service.stream(session_factory, query, export_format, gzip),
+        "deals",
+        export_format,
+        gzip,
+    )
+
+
+@router.get("/archive", response_model=ArchivedDealListResponse)
+async def list_archived_deals(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    db: AsyncSession = Depends(get_db_session),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """
+    List archived closed deals, most recently closed first.
+
+    Archived deals stay readable through ``GET /api/deals/{id}`` and the
+    activity timeline.
+    """
+    archived = (await db.scalars(archive_service.list_query(tenant_id, skip, limit))).all()
+    total = await db.scalar(archive_service.count_query(tenant_id))
+
+    return FastJSONResponse(
+        ArchivedDealListResponse(
+            deals=[ArchivedDealSummary.model_validate(deal) for deal in archived],
+            total=total,
+        )
+    )
+
+
+@router.get("/changes", response_model=DealChangesResponse)
+async def list_deal_changes(
+    since: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_db_session),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """
+    List deals created, updated or removed after a cursor.
+
+    Omit ``since`` for a full sync. Each page returns ``next_cursor`` to
+    pass as ``since`` for the next page or the next poll; it is returned
+    on empty pages too. A deal appears with its latest state only once,
+    however often it changed; deleted and archived deals appear as
+    tombstones without a deal.
+    """
+    try:
+        after = ChangeFeedService.decode_cursor(since) if since else FEED_START
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    rows = (await db.execute(ChangeFeedService.changes_query(tenant_id, after, limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    live_ids = [row.deal_id for row in rows if row.reason is None]
+    deals = {}
+    if live_ids:
+        deals = {
+            deal.id: deal
+            for deal in await db.scalars(
+                select(Deal).where(Deal.tenant_id == tenant_id, Deal.id.in_(live_ids))
+            )
+        }
+        contact_buffer.merge(deals.values())
+
+    changes = [
+        {
+            "change_seq": row.change_seq,
+            "deal_id": row.deal_id,
+            "deleted": row.reason is not None,
+            "reason": row.reason,
+            "deal": deal_to_dict(deals[row.deal_id]) if row.reason is None else None,
+        }
+        for row in rows
+        # Deleted since the feed query - its tombstone follows later in the feed
+        if row.reason is not None or row.deal_id in deals
+    ]
+    position = (rows[-1].change_seq, rows[-1].deal_id) if rows else after
+
+    return FastJSONResponse(
+        {
+            "changes": changes,
+            "next_cursor": ChangeFeedService.encode_cursor(*position),
+            "has_more": has_more,
+        }
+    )
+
+
+@router.get("/{deal_id}", response_model=DealResponse)
+async def get_deal(
+    deal_id: int,
+    db: AsyncSession = Depends(get_db_session),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """
+    Get a specific deal by ID.
+
+    Falls back to the archive for archived closed deals (marked with the
+    ``Deal-Archived: true`` header, without AI recommendations).
+    """
+    deal = await db.scalar(
+        select(Deal).where(Deal.id == deal_id, Deal.tenant_id == tenant_id)
+    )
+
+    if not deal:
+        payload = await db.scalar(archive_service.archived_deal_query(tenant_id, deal_id))
+        if payload is None:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Each update must include 'id' field"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Deal not found",
             )
+        return FastJSONResponse(
+            decode_payload(payload)["deal"], headers={ARCHIVED_HEADER: "true"}
+        )
+
+    contact_buffer.merge([deal])
+
+    # Add AI recommendations
+    return FastJSONResponse(deal_to_dict(deal, ai_service.generate_next_actions(deal)))
+
 
-        deal_id = update_data.pop("id")
+@router.patch("/{deal_id}", response_model=DealResponse)
+async def update_deal(
+    deal_id: int,
+    deal_data: DealUpdate,
+    db: AsyncSession = Depends(get_db_session),
+    user_id: int = Depends(get_user_id),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """Update a deal."""
+    deal = await db.scalar(
+        select(Deal).where(Deal.id == deal_id, Deal.tenant_id == tenant_id)
+    )
 
-        deal = (
-            db.query(Deal)
-            .filter(Deal.id == deal_id, Deal.tenant_id == tenant_id)
-            .first()
+    if not deal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deal not found",
         )
 
-        if not deal:
-            logger.warning(f"Deal {deal_id} not found for tenant {tenant_id}, skipping")
-            continue
+    # Track stage and health changes
+    old_stage = deal.stage
+    old_health_score = deal.health_score
+    update_data = deal_data.model_dump(exclude_unset=True)
 
-        # Track stage changes
-        old_stage = deal.stage
+    # Update fields
+    for field, value in update_data.items():
+        setattr(deal, field, value)
 
-        # Update fields
-        for field, value in update_data.items():
-            if hasattr(deal, field):
-                setattr(deal, field, value)
+    # Update last_contact_at when deal is updated. The row is written
+    # anyway, so this supersedes a buffered bump from logged activities.
+    deal.last_contact_at = datetime.utcnow()
+    contact_buffer.discard(deal.id)
 
-        # Update last_contact_at
-        deal.last_contact_at = datetime.utcnow()
+    # Recalculate health score
+    deal.health_score = calculate_deal_health_score(deal)
 
-        # Recalculate health score
-        deal.health_score = calculate_deal_health_score(deal)
+    # Create activity for stage change
+    if "stage" in update_data and old_stage != deal.stage:
+        activity = Activity(
+            tenant_id=tenant_id,
+            deal_id=deal.id,
+            user_id=user_id,
+            activity_type=ActivityType.STAGE_CHANGE,
+            title="Stage geändert",
+            description=f"Stage von '{old_stage.value}' zu '{deal.stage.value}' geändert",
+        )
+        db.add(activity)
+        await db.flush()
+        await db.run_sync(record_activities, [(deal.id, ActivityType.STAGE_CHANGE, None)])
+
+    deal.change_seq = await db.run_sync(next_change_seqs, tenant_id)
+    await db.run_sync(
+        append_events,
+        deal_change_events(
+            tenant_id,
+            deal.id,
+            update_data,
+            deal.stage,
+            deal.health_score,
+            old_stage,
+            old_health_score,
+        ),
+    )
+    await db.commit()
+    await db.refresh(deal)
 
-        # Create activity for stage change
-        if "stage" in update_data and old_stage != deal.stage:
-            activity = Activity(
-                deal_id=deal.id,
-                user_id=user_id,
-                activity_type=ActivityType.STAGE_CHANGE,
-                title="Stage geändert (Bulk)",
-                description=f"Stage von '{old_stage.value}' zu '{deal.stage.value}' geändert",
-            )
-            db.add(activity)
+    logger.info(f"Updated deal {deal.id}")
 
-        updated_deals.append(deal)
+    # Add AI recommendations
+    return FastJSONResponse(deal_to_dict(deal, ai_service.generate_next_actions(deal)))
 
-    db.commit()
 
-    # Refresh and prepare responses
-    responses = []
-    for deal in updated_deals:
-        db.refresh(deal)
-        response = DealResponse.model_validate(deal)
-        response.next_actions = ai_service.generate_next_actions(deal)
-        responses.append(response)
+@router.delete("/{deal_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_deal(
+    deal_id: int,
+    db: AsyncSession = Depends(get_db_session),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """Delete a deal."""
+    deal = await db.scalar(
+        select(Deal).where(Deal.id == deal_id, Deal.tenant_id == tenant_id)
+    )
+
+    if not deal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deal not found",
+        )
 
-    logger.info(f"Bulk updated {len(updated_deals)} deals for tenant {tenant_id}")
+    await db.delete(deal)
+    await db.run_sync(record_tombstones, tenant_id, [deal_id])
+    await db.run_sync(
+        append_events, [outbox_event(tenant_id, OutboxEventType.DEAL_DELETED, deal_id)]
+    )
+    await db.commit()
 
-    return responses
+    logger.info(f"Deleted deal {deal_id}")
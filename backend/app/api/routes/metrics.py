@@ -0,0 +1,27 @@
+"""Operational metrics routes (admin users only)."""
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_admin_user_id
+from app.core.hashing import password_hasher
+from app.db.pool_metrics import pool_stats
+from app.db.replica import replica_router
+
+router = APIRouter()
+
+
+@router.get("/password-hashing", dependencies=[Depends(get_admin_user_id)])
+async def password_hashing_metrics():
+    """Get queue depth and timings of the password hashing pool."""
+    return password_hasher.stats()
+
+
+@router.get("/db-pool", dependencies=[Depends(get_admin_user_id)])
+async def db_pool_metrics():
+    """Get configuration, occupancy, checkout waits and invalidations of the connection pools."""
+    return pool_stats()
+
+
+@router.get("/db-replica", dependencies=[Depends(get_admin_user_id)])
+async def db_replica_metrics():
+    """Get the read replica lag and how read-only requests were routed."""
+    return replica_router.stats()
@@ -1,13 +1,23 @@
 """Webhook routes for automation integrations (Zapier, Make.com, n8n)."""
-from fastapi import APIRouter, Depends, HTTPException, Header, status
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, status
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
 import hmac
-import hashlib
+import secrets
 
-from app.api.deps import get_db_session
+from app.api.deps import get_admin_user_id, get_db_session, get_tenant_id
+from app.api.serializers import FastJSONResponse
 from app.models.deal import Deal
-from app.schemas.deal import DealResponse
+from app.models.webhook import DeliveryStatus, WebhookDelivery, WebhookEvent, WebhookSubscription
+from app.schemas.webhook import (
+    WebhookSubscriptionCreate,
+    WebhookSubscriptionCreated,
+    WebhookSubscriptionResponse,
+    WebhookDeliveryResponse,
+)
+from app.services.webhook_service import UnsafeTargetError, check_target, deal_event_payload, sign_payload
 from app.core.config import settings
 from app.core.logging import get_logger
 
@@ -15,14 +25,14 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 
-# Webhook secret for signature validation
-WEBHOOK_SECRET = getattr(settings, "WEBHOOK_SECRET", "your-webhook-secret-change-in-production")
-
 
 def verify_webhook_signature(payload: str, signature: Optional[str]) -> bool:
     """
     Verify webhook signature using HMAC SHA256.
 
+    Outbound deliveries are signed the same way, keyed with the secret
+    returned when their subscription was created.
+
     Args:
         payload: Request body as string
         signature: Signature from X-Webhook-Signature header
@@ -33,19 +43,28 @@ def verify_webhook_signature(payload: str, signature: Optional[str]) -> bool:
     if not signature:
         return False
 
-    expected_signature = hmac.new(
-        WEBHOOK_SECRET.encode(),
-        payload.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    expected_signature = sign_payload(payload, settings.WEBHOOK_SECRET)
 
     return hmac.compare_digest(signature, expected_signature)
 
 
+async def _get_deal(db: AsyncSession, deal_id: int) -> Deal:
+    """Get a deal for a pull webhook or raise 404."""
+    deal = await db.scalar(select(Deal).where(Deal.id == deal_id))
+
+    if not deal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deal not found"
+        )
+
+    return deal
+
+
 @router.post("/deal-updated")
 async def webhook_deal_updated(
     deal_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     x_webhook_signature: Optional[str] = Header(None),
 ):
     """
@@ -65,30 +84,17 @@ async def webhook_deal_updated(
     # Note: Signature verification is optional for demo purposes
     # In production, you should enforce signature verification
 
-    deal = db.query(Deal).filter(Deal.id == deal_id).first()
-
-    if not deal:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Deal not found"
-        )
-
-    response_data = DealResponse.model_validate(deal)
+    deal = await _get_deal(db, deal_id)
 
     logger.info(f"Webhook: deal-updated triggered for deal {deal_id}")
 
-    return {
-        "event": "deal.updated",
-        "deal": response_data,
-        "tenant_id": deal.tenant_id,
-        "timestamp": deal.updated_at.isoformat(),
-    }
+    return FastJSONResponse(deal_event_payload(WebhookEvent.DEAL_UPDATED, deal))
 
 
 @router.post("/deal-won")
 async def webhook_deal_won(
     deal_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     x_webhook_signature: Optional[str] = Header(None),
 ):
     """
@@ -106,37 +112,17 @@ async def webhook_deal_won(
     Returns:
         Won deal data with value and customer information
     """
-    deal = db.query(Deal).filter(Deal.id == deal_id).first()
-
-    if not deal:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Deal not found"
-        )
-
-    response_data = DealResponse.model_validate(deal)
+    deal = await _get_deal(db, deal_id)
 
     logger.info(f"Webhook: deal-won triggered for deal {deal_id}, value: {deal.value}")
 
-    return {
-        "event": "deal.won",
-        "deal": response_data,
-        "tenant_id": deal.tenant_id,
-        "value": float(deal.value),
-        "company": deal.company_name,
-        "contact": {
-            "name": deal.contact_person,
-            "email": deal.contact_email,
-            "phone": deal.contact_phone,
-        },
-        "timestamp": deal.updated_at.isoformat(),
-    }
+    return FastJSONResponse(deal_event_payload(WebhookEvent.DEAL_WON, deal))
 
 
 @router.post("/health-alert")
 async def webhook_health_alert(
     deal_id: int,
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_db_session),
     x_webhook_signature: Optional[str] = Header(None),
 ):
     """
@@ -154,31 +140,11 @@ async def webhook_health_alert(
     Returns:
         At-risk deal data with health score and recommendations
     """
-    deal = db.query(Deal).filter(Deal.id == deal_id).first()
-
-    if not deal:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Deal not found"
-        )
-
-    response_data = DealResponse.model_validate(deal)
+    deal = await _get_deal(db, deal_id)
 
     logger.warning(f"Webhook: health-alert triggered for deal {deal_id}, health score: {deal.health_score}")
 
-    return {
-        "event": "deal.health_alert",
-        "deal": response_data,
-        "tenant_id": deal.tenant_id,
-        "health_score": deal.health_score,
-        "alert_level": "critical" if deal.health_score < 30 else "warning",
-        "recommended_actions": [
-            "Schedule immediate follow-up call",
-            "Review deal status with team",
-            "Update deal notes with current situation",
-        ],
-        "timestamp": deal.updated_at.isoformat(),
-    }
+    return FastJSONResponse(deal_event_payload(WebhookEvent.DEAL_HEALTH_ALERT, deal))
 
 
 @router.get("/test")
@@ -200,3 +166,211 @@ async def test_webhook():
             "/api/webhooks/health-alert",
         ],
     }
+
+
+@router.post(
+    "/subscriptions",
+    response_model=WebhookSubscriptionCreated,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(get_admin_user_id)],
+)
+async def create_subscription(
+    subscription_data: WebhookSubscriptionCreate,
+    db: AsyncSession = Depends(get_db_session),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """
+    Subscribe an endpoint to pushed events.
+
+    DealFlow POSTs each subscribed event (``deal.updated``, ``deal.won``,
+    ``deal.health_alert``) to the URL, signed in ``X-Webhook-Signature``
+    with a secret generated for the subscription. The secret is only
+    returned in this response (and when rotated). Failed deliveries
+    are retried with exponential backoff and dead-lettered after
+    ``WEBHOOK_MAX_ATTEMPTS`` attempts.
+
+    With ``digest_window_seconds`` set, events are batched instead: one
+    ``digest`` delivery per window (or per ``digest_max_events`` entries)
+    lists the events, with repeated events of the same deal collapsed
+    into their latest entry.
+
+    Requires an admin. The URL must resolve to public addresses only;
+    private, loopback and link-local targets are rejected with 400.
+    """
+    try:
+        await check_target(subscription_data.url)
+    except UnsafeTargetError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    subscription = WebhookSubscription(
+        tenant_id=tenant_id,
+        url=subscription_data.url,
+        events=[event.value for event in dict.fromkeys(subscription_data.events)],
+        secret=secrets.token_hex(32),
+        max_concurrency=subscription_data.max_concurrency,
+        digest_window_seconds=subscription_data.digest_window_seconds,
+        digest_max_events=subscription_data.digest_max_events,
+    )
+    db.add(subscription)
+    await db.commit()
+    await db.refresh(subscription)
+
+    logger.info(f"Created webhook subscription {subscription.id} for tenant {tenant_id}")
+
+    return subscription
+
+
+@router.get(
+    "/subscriptions",
+    response_model=List[WebhookSubscriptionResponse],
+    dependencies=[Depends(get_admin_user_id)],
+)
+async def list_subscriptions(
+    db: AsyncSession = Depends(get_db_session),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """List the tenant's webhook subscriptions."""
+    result = await db.scalars(
+        select(WebhookSubscription)
+        .where(WebhookSubscription.tenant_id == tenant_id)
+        .order_by(WebhookSubscription.id)
+    )
+    return result.all()
+
+
+@router.post(
+    "/subscriptions/{subscription_id}/secret",
+    response_model=WebhookSubscriptionCreated,
+    dependencies=[Depends(get_admin_user_id)],
+)
+async def rotate_subscription_secret(
+    subscription_id: int,
+    db: AsyncSession = Depends(get_db_session),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """
+    Replace a subscription's signing secret and return the new one once.
+
+    Deliveries sent afterwards (including retries) are signed with the new
+    secret. Subscriptions created before per-subscription secrets have none
+    and must be rotated before they are delivered to again.
+    """
+    subscription = await db.scalar(
+        select(WebhookSubscription).where(
+            WebhookSubscription.id == subscription_id,
+            WebhookSubscription.tenant_id == tenant_id,
+        )
+    )
+
+    if not subscription:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Subscription not found",
+        )
+
+    subscription.secret = secrets.token_hex(32)
+    await db.commit()
+    await db.refresh(subscription)
+
+    logger.info(f"Rotated secret of webhook subscription {subscription_id}")
+
+    return subscription
+
+
+@router.delete(
+    "/subscriptions/{subscription_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(get_admin_user_id)],
+)
+async def delete_subscription(
+    subscription_id: int,
+    db: AsyncSession = Depends(get_db_session),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """Delete a subscription and its queued deliveries."""
+    subscription = await db.scalar(
+        select(WebhookSubscription).where(
+            WebhookSubscription.id == subscription_id,
+            WebhookSubscription.tenant_id == tenant_id,
+        )
+    )
+
+    if not subscription:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Subscription not found",
+        )
+
+    await db.execute(delete(WebhookDelivery).where(WebhookDelivery.subscription_id == subscription_id))
+    await db.delete(subscription)
+    await db.commit()
+
+    logger.info(f"Deleted webhook subscription {subscription_id}")
+
+
+@router.get(
+    "/deliveries",
+    response_model=List[WebhookDeliveryResponse],
+    dependencies=[Depends(get_admin_user_id)],
+)
+async def list_deliveries(
+    delivery_status: Optional[DeliveryStatus] = Query(None, alias="status"),
+    subscription_id: Optional[int] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db_session),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """
+    List recent deliveries, newest first.
+
+    Use ``?status=dead`` to inspect the dead-letter queue.
+    """
+    query = select(WebhookDelivery).where(WebhookDelivery.tenant_id == tenant_id)
+    if delivery_status is not None:
+        query = query.where(WebhookDelivery.status == delivery_status)
+    if subscription_id is not None:
+        query = query.where(WebhookDelivery.subscription_id == subscription_id)
+
+    result = await db.scalars(query.order_by(WebhookDelivery.id.desc()).limit(limit))
+    return result.all()
+
+
+@router.post(
+    "/deliveries/{delivery_id}/retry",
+    response_model=WebhookDeliveryResponse,
+    dependencies=[Depends(get_admin_user_id)],
+)
+async def retry_delivery(
+    delivery_id: int,
+    db: AsyncSession = Depends(get_db_session),
+    tenant_id: int = Depends(get_tenant_id),
+):
+    """Requeue a dead-lettered delivery with a fresh attempt budget."""
+    delivery = await db.scalar(
+        select(WebhookDelivery).where(
+            WebhookDelivery.id == delivery_id,
+            WebhookDelivery.tenant_id == tenant_id,
+        )
+    )
+
+    if not delivery:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Delivery not found",
+        )
+
+    if delivery.status != DeliveryStatus.DEAD:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Only dead-lettered deliveries can be retried",
+        )
+
+    delivery.status = DeliveryStatus.PENDING
+    delivery.attempts = 0
+    delivery.next_attempt_at = datetime.utcnow()
+    await db.commit()
+    await db.refresh(delivery)
+
+    logger.info(f"Requeued webhook delivery {delivery_id}")
+
+    return delivery
@@ -0,0 +1,22 @@
+"""
+Fast JSON responses.
+
+Deal endpoints encode ORM rows straight to JSON with orjson instead of
+validating a DealResponse per row and letting FastAPI validate and encode
+the response model again (see ``app.services.serialization``).
+"""
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+
+from app.services.serialization import dumps
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson response that also encodes Decimal values and pydantic models."""
+
+    def render(self, content: Any) -> bytes:
+        """Render content as JSON."""
+        if hasattr(content, "model_dump"):
+            content = content.model_dump()
+        return dumps(content)
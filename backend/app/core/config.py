@@ -1,6 +1,6 @@
 """Application configuration."""
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -14,15 +14,79 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None  # Derived from DATABASE_URL if unset
+
+    # Database connection pools (per engine and worker process)
+    DB_POOL_SIZE: int = 5  # Connections kept open
+    DB_MAX_OVERFLOW: int = 10  # Extra connections opened under load
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # Wait for a free connection before failing
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Replace older connections at checkout (-1 disables)
+    DB_POOL_PRE_PING: bool = True  # Ping on every checkout (False: rely on recycling)
+
+    # Read replica for read-only endpoints (deal list, insights, activity reads)
+    REPLICA_DATABASE_URL: Optional[str] = None
+    ASYNC_REPLICA_DATABASE_URL: Optional[str] = None  # Derived from REPLICA_DATABASE_URL if unset
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # Read from the primary while the replica lags more
+    REPLICA_HEARTBEAT_INTERVAL_SECONDS: float = 1.0
+
+    # Per-request SQL statistics (logged per request, Server-Timing header in debug)
+    SQL_STATS_ENABLED: bool = True
+    SQL_REPEATED_STATEMENT_THRESHOLD: int = 10  # Warn when one statement runs more often per request
 
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_TOKEN_CACHE_SIZE: int = 10000  # Verified tokens kept in memory (0 disables)
+    PASSWORD_HASH_WORKERS: int = 4  # Threads hashing passwords off the event loop
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Queued + running hashes before 503
 
     # AI
     GEMINI_API_KEY: str
     GEMINI_MODEL: str = "gemini-2.0-flash-exp"
+    AI_SUGGESTIONS_PER_REQUEST: int = 5  # Deals per list/insights request getting Gemini suggestions
+
+    # Bulk operations
+    BULK_MAX_DEALS: int = 5000
+    ACTIVITY_BATCH_MAX_ITEMS: int = 5000
+    IMPORT_CHUNK_SIZE: int = 500
+    IMPORT_MAX_REPORTED_ERRORS: int = 100
+
+    # Write-behind buffer for deal last-contact timestamps
+    CONTACT_FLUSH_INTERVAL_SECONDS: float = 2.0
+
+    # Archiving of closed deals
+    ARCHIVE_CLOSED_DEALS_AFTER_DAYS: int = 365
+    ARCHIVE_BATCH_SIZE: int = 200
+
+    # Per-tenant rate limits: class=tokens per second/burst
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: str = "read=20/60,write=10/30,bulk=0.5/10,export=0.2/5,ai=2/20,auth=1/10"
+    RATE_LIMIT_REDIS_URL: Optional[str] = None  # Share buckets between workers
+
+    # Transactional outbox relay
+    OUTBOX_RELAY_IN_PROCESS: bool = True  # Disable when running outbox_relay.py separately
+    OUTBOX_RELAY_INTERVAL_SECONDS: float = 0.5
+    OUTBOX_BATCH_SIZE: int = 500  # Events locked and handled per transaction
+    OUTBOX_MAX_ATTEMPTS: int = 5  # Failed attempts before an event is set aside
+
+    # Outbound webhooks
+    WEBHOOK_SECRET: str = "your-webhook-secret-change-in-production"  # Pull endpoints only
+    WEBHOOK_DISPATCH_INTERVAL_SECONDS: float = 1.0
+    WEBHOOK_BATCH_SIZE: int = 100  # Deliveries claimed per poll
+    WEBHOOK_TIMEOUT_SECONDS: float = 10.0
+    WEBHOOK_MAX_CONNECTIONS: int = 100  # Pooled connections across all endpoints
+    WEBHOOK_ENDPOINT_CONCURRENCY: int = 4  # Parallel requests per endpoint
+    WEBHOOK_MAX_ATTEMPTS: int = 8  # Attempts before dead-lettering
+    WEBHOOK_BACKOFF_BASE_SECONDS: float = 10.0
+    WEBHOOK_BACKOFF_MAX_SECONDS: float = 3600.0
+    WEBHOOK_DIGEST_MAX_EVENTS: int = 100  # Digest entries unless the subscription sets its own
+    WEBHOOK_HEALTH_ALERT_THRESHOLD: int = 40  # Health score raising deal.health_alert
+    WEBHOOK_ALLOW_PRIVATE_TARGETS: bool = False  # Allow private/loopback URLs (local development only)
+
+    # Idempotency
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 3600.0  # Deletion of expired keys
 
     # CORS
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:5174,http://localhost:3000"
@@ -34,5 +98,30 @@ class Settings(BaseSettings):
         """Get CORS origins as list."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def async_database_url(self) -> str:
+        """Get the database URL for the async driver (asyncpg / aiosqlite)."""
+        return self.ASYNC_DATABASE_URL or _async_url(self.DATABASE_URL)
+
+    @property
+    def async_replica_database_url(self) -> Optional[str]:
+        """Get the read replica URL for the async driver (None without a replica)."""
+        if self.ASYNC_REPLICA_DATABASE_URL:
+            return self.ASYNC_REPLICA_DATABASE_URL
+        return _async_url(self.REPLICA_DATABASE_URL) if self.REPLICA_DATABASE_URL else None
+
+
+def _async_url(url: str) -> str:
+    """Convert a sync driver database URL to its async driver equivalent."""
+    for prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgres://", "postgresql+asyncpg://"),
+        ("sqlite:///", "sqlite+aiosqlite:///"),
+    ):
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
 
 settings = Settings()
@@ -0,0 +1,124 @@
+"""
+Password hashing on a bounded worker pool.
+
+bcrypt deliberately costs tens to hundreds of milliseconds of CPU per
+call. Running it inside ``async def`` handlers blocks the event loop and
+every other request on the worker. The hasher runs it on a dedicated
+thread pool instead (the bcrypt backend releases the GIL while hashing),
+caps the number of pending calls and rejects excess work with 503 so a
+login burst cannot queue up unbounded.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.security import get_password_hash, verify_password
+
+logger = get_logger(__name__)
+
+
+class PasswordHasher:
+    """Runs password hashing and verification on a bounded executor."""
+
+    def __init__(self, workers: int, max_pending: int):
+        """
+        Initialize the hasher.
+
+        Args:
+            workers: Number of hashing threads
+            max_pending: Maximum queued plus running calls before rejecting
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._hash_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        """Hash a password off the event loop."""
+        return await self._submit(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash off the event loop."""
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    async def _submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a hashing call on the executor, applying admission control.
+
+        Raises:
+            HTTPException: 503 if too many calls are already pending
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                logger.warning(f"Password hashing queue full ({self._pending} pending), rejecting")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many authentication requests, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+
+        # The call stays pending until the executor is done with it, even if
+        # the awaiting request is cancelled (a started hash keeps running)
+        try:
+            future = self._executor.submit(self._run, time.perf_counter(), func, args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, *_: Any) -> None:
+        """Free the pending slot of a finished or cancelled call."""
+        with self._lock:
+            self._pending -= 1
+
+    def _run(self, submitted: float, func: Callable[..., Any], args: tuple) -> Any:
+        """Execute a hashing call on a worker thread, recording timings."""
+        started = time.perf_counter()
+        with self._lock:
+            self._running += 1
+            self._wait_seconds += started - submitted
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._hash_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue depth and throughput metrics."""
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_seconds / completed * 1000, 2) if completed else 0.0,
+                "avg_hash_ms": round(self._hash_seconds / completed * 1000, 2) if completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
@@ -0,0 +1,306 @@
+"""
+Per-tenant rate limiting with token buckets.
+
+Every API request is sorted into a route class (reads, writes, bulk
+writes, exports, AI-backed calls, auth) and charged against a token bucket
+keyed by tenant and class, so one tenant's integration cannot exhaust the
+capacity shared with everyone else. AI-backed routes (deal reads and
+writes that call Gemini, insights) have their own budget, charged per
+Gemini call the request can make (see ``request_cost``). Requests without
+a valid token are keyed by client address instead of tenant. Requests over
+budget get ``429`` with a ``Retry-After`` header.
+
+Buckets live in process memory by default. Set ``RATE_LIMIT_REDIS_URL`` to
+share them between workers through Redis.
+"""
+import math
+import re
+import time
+from typing import Dict, Optional, Pattern, Sequence, Tuple
+from urllib.parse import parse_qs
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.security import resolve_principal
+
+logger = get_logger(__name__)
+
+# (class, methods or None for all, path pattern); first match wins
+ROUTE_CLASSES: Sequence[Tuple[str, Optional[set], Pattern]] = (
+    ("auth", None, re.compile(r"^/api/auth/")),
+    (
+        "bulk",
+        {"POST", "PATCH"},
+        re.compile(r"^/api/(deals/(bulk|bulk-update|import)|activities/batch)$"),
+    ),
+    ("export", {"GET"}, re.compile(r"^/api/(deals|activities)/export$")),
+    ("ai", {"GET", "POST", "PATCH"}, re.compile(r"^/api/deals(/\d+|/insights/summary)?$")),
+)
+
+
+def parse_limits(spec: str) -> Dict[str, Tuple[float, float]]:
+    """
+    Parse a limit specification like ``"read=20/60,bulk=0.5/10"``.
+
+    Args:
+        spec: Comma-separated ``class=rate/burst`` entries (tokens per second
+            and bucket capacity)
+
+    Returns:
+        (rate, burst) per route class
+    """
+    limits = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, values = entry.partition("=")
+        rate, _, burst = values.partition("/")
+        limits[name.strip()] = (float(rate), float(burst or rate))
+    return limits
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """
+    Get the route class of a request.
+
+    Args:
+        method: HTTP method
+        path: Request path
+
+    Returns:
+        Route class, or None for paths that are not rate limited
+    """
+    if not path.startswith("/api/"):
+        return None
+    for name, methods, pattern in ROUTE_CLASSES:
+        if (methods is None or method in methods) and pattern.match(path):
+            return name
+    return "read" if method in ("GET", "HEAD") else "write"
+
+
+def request_cost(route_class: str, method: str, path: str, query_string: bytes) -> float:
+    """
+    Get the tokens a request takes from its bucket.
+
+    AI-backed list and insights requests generate suggestions for up to
+    ``AI_SUGGESTIONS_PER_REQUEST`` deals and are charged that many tokens
+    (fewer for deal lists with a smaller ``limit``). Everything else costs
+    one token.
+
+    Args:
+        route_class: Route class of the request
+        method: HTTP method
+        path: Request path
+        query_string: Raw query string
+
+    Returns:
+        Token cost
+    """
+    if route_class != "ai" or method != "GET" or path not in ("/api/deals", "/api/deals/insights/summary"):
+        return 1.0
+    cost = settings.AI_SUGGESTIONS_PER_REQUEST
+    if path == "/api/deals":
+        try:
+            limit = int(parse_qs(query_string.decode("latin-1")).get("limit", ["100"])[0])
+        except ValueError:
+            limit = 100  # Rejected by validation, charge the default
+        cost = min(cost, limit)
+    return float(max(cost, 1))
+
+
+class MemoryBuckets:
+    """
+    In-process token buckets.
+
+    Lock-free: each bucket is an immutable (tokens, timestamp) tuple that is
+    read and replaced without awaiting in between, so concurrent requests
+    on the event loop cannot interleave inside an update.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        """
+        Initialize the buckets.
+
+        Args:
+            max_keys: Bucket count that triggers pruning of full buckets
+        """
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    async def acquire(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """
+        Take tokens from a bucket.
+
+        Args:
+            key: Bucket key
+            rate: Refill rate in tokens per second
+            burst: Bucket capacity
+            cost: Tokens to take
+
+        Returns:
+            0 if allowed, otherwise seconds until enough tokens are available
+        """
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+
+        if tokens >= cost:
+            self._buckets[key] = (tokens - cost, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+            return 0.0
+
+        self._buckets[key] = (tokens, now)
+        return (cost - tokens) / rate if rate > 0 else math.inf
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets idle for over an hour (they would be full anyway)."""
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items() if now - bucket[1] < 3600
+        }
+
+    def reset(self) -> None:
+        """Drop all buckets."""
+        self._buckets.clear()
+
+
+# Atomic token bucket update: returns 0 if allowed, else milliseconds to wait
+REDIS_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + (now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = math.ceil((cost - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+return wait
+"""
+
+
+class RedisBuckets:
+    """Token buckets shared between workers through Redis."""
+
+    def __init__(self, url: str, prefix: str = "dealflow:ratelimit:"):
+        """
+        Initialize the Redis backend.
+
+        Args:
+            url: Redis URL
+            prefix: Key prefix of the buckets
+        """
+        import redis.asyncio as redis  # Optional dependency, only needed for this backend
+
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(REDIS_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """Take tokens from a bucket (see MemoryBuckets.acquire)."""
+        wait_ms = await self._script(keys=[self.prefix + key], args=[rate, burst, cost])
+        return int(wait_ms) / 1000
+
+    def reset(self) -> None:
+        """Shared buckets are not reset from a single worker."""
+
+
+class RateLimitMiddleware:
+    """ASGI middleware enforcing per-tenant, per-route-class budgets."""
+
+    def __init__(self, app: ASGIApp, backend=None, limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            backend: Bucket backend (defaults to the process-wide limiter)
+            limits: (rate, burst) per route class (defaults to RATE_LIMITS)
+        """
+        self.app = app
+        self.backend = backend or rate_limiter
+        self.limits = limits or parse_limits(settings.RATE_LIMITS)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Check the request's budget before passing it on."""
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify(scope["method"], scope["path"])
+        limit = self.limits.get(route_class)
+        if not limit:
+            await self.app(scope, receive, send)
+            return
+
+        key = self._key(scope, route_class)
+        rate, burst = limit
+        cost = min(request_cost(route_class, scope["method"], scope["path"], scope.get("query_string", b"")), burst)
+        try:
+            retry_after = await self.backend.acquire(key, rate, burst, cost)
+        except Exception as e:
+            # Fail open: a broken shared backend must not take the API down
+            logger.warning(f"Rate limit backend error, allowing request: {e}")
+            retry_after = 0.0
+
+        if retry_after > 0:
+            logger.info(f"Rate limited {key} ({scope['method']} {scope['path']})")
+            response = JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"detail": f"Rate limit exceeded for {route_class} requests"},
+                headers={
+                    "Retry-After": str(max(1, math.ceil(min(retry_after, 86400)))),
+                    "X-RateLimit-Class": route_class,
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _key(scope: Scope, route_class: str) -> str:
+        """
+        Get the bucket key of a request.
+
+        Requests with a valid bearer token are keyed by tenant; auth
+        requests and requests with a missing or invalid token by client
+        address (they are rejected later, but still cost a token check).
+        """
+        client = scope.get("client")
+        address_key = f"ip:{client[0] if client else 'unknown'}:{route_class}"
+        if route_class == "auth":
+            return address_key
+
+        for name, value in scope.get("headers", ()):
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() != "bearer" or not token:
+                    break
+                try:
+                    principal = resolve_principal(token)
+                except HTTPException:
+                    break
+                return f"tenant:{principal.tenant_id}:{route_class}"
+        return address_key
+
+
+def create_backend():
+    """Create the bucket backend configured in the settings."""
+    if settings.RATE_LIMIT_REDIS_URL:
+        logger.info("Using Redis rate limit buckets")
+        return RedisBuckets(settings.RATE_LIMIT_REDIS_URL)
+    return MemoryBuckets()
+
+
+rate_limiter = create_backend()
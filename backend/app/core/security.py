@@ -1,6 +1,10 @@
 """Security utilities for authentication and authorization."""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import NamedTuple, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -58,32 +62,97 @@ def decode_access_token(token: str) -> dict:
         )
 
 
-async def get_current_user_id(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> int:
-    """Get the current user ID from the JWT token."""
-    token = credentials.credentials
+class Principal(NamedTuple):
+    """Authenticated caller resolved from a verified access token."""
+
+    user_id: int
+    tenant_id: int
+    exp: float  # Token expiry as a UNIX timestamp
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already verified tokens.
+
+    Keys are SHA-256 digests of the tokens (raw tokens are never stored).
+    Entries are dropped once their token expires, so a cached token is
+    never accepted for longer than the token itself is valid.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of cached tokens (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, Principal]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        """Hash a token into a cache key."""
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Principal]:
+        """Get the principal of a cached, unexpired token."""
+        key = self._key(token)
+        with self._lock:
+            principal = self._entries.get(key)
+            if principal is None:
+                return None
+            if principal.exp <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def put(self, token: str, principal: Principal) -> None:
+        """Cache the principal of a verified token."""
+        if self.maxsize <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = principal
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached tokens."""
+        with self._lock:
+            self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache(settings.AUTH_TOKEN_CACHE_SIZE)
+
+
+def resolve_principal(token: str) -> Principal:
+    """
+    Resolve the principal of an access token.
+
+    Verifies the token (signature, expiry, required claims) unless it is
+    already in the verified-token cache.
+
+    Raises:
+        HTTPException: 401 if the token is invalid
+    """
+    principal = verified_tokens.get(token)
+    if principal is not None:
+        return principal
+
     payload = decode_access_token(token)
 
-    user_id: Optional[int] = payload.get("sub")
-    if user_id is None:
+    user_id = payload.get("sub")
+    if user_id is None or payload.get("exp") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return int(user_id)
-
-
-async def get_current_tenant_id(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> int:
-    """Get the current tenant ID from the JWT token."""
-    token = credentials.credentials
-    payload = decode_access_token(token)
-
-    tenant_id: Optional[int] = payload.get("tenant_id")
+    tenant_id = payload.get("tenant_id")
     if tenant_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -91,4 +160,28 @@ async def get_current_tenant_id(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return int(tenant_id)
+    principal = Principal(int(user_id), int(tenant_id), float(payload["exp"]))
+    verified_tokens.put(token, principal)
+    return principal
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Principal:
+    """
+    Get the authenticated principal of the request.
+
+    FastAPI caches dependencies per request, so the token is resolved once
+    no matter how many dependencies need the user or tenant.
+    """
+    return resolve_principal(credentials.credentials)
+
+
+async def get_current_user_id(principal: Principal = Depends(get_current_principal)) -> int:
+    """Get the current user ID from the JWT token."""
+    return principal.user_id
+
+
+async def get_current_tenant_id(principal: Principal = Depends(get_current_principal)) -> int:
+    """Get the current tenant ID from the JWT token."""
+    return principal.tenant_id
@@ -1,24 +1,64 @@
 """Database configuration and session management."""
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.db.pool_metrics import pool_options
 
-# Create database engine
+# Create database engine (scripts, background jobs and streaming exports)
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
     echo=settings.DEBUG,  # Log SQL queries in debug mode
+    **pool_options("sync", settings.DATABASE_URL, QueuePool),
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async database engine (request handlers)
+async_engine = create_async_engine(
+    settings.async_database_url,
+    echo=settings.DEBUG,
+    **pool_options("async", settings.async_database_url, AsyncAdaptedQueuePool),
+)
+
+# Create async session factory. Instances stay loaded after commit because
+# lazy attribute refreshes are not possible outside of an awaited call.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Read replica for read-only endpoints (see app.db.replica); None without one
+replica_async_engine = None
+ReplicaSessionLocal = None
+if settings.async_replica_database_url:
+    replica_async_engine = create_async_engine(
+        settings.async_replica_database_url,
+        echo=settings.DEBUG,
+        **pool_options("replica_async", settings.async_replica_database_url, AsyncAdaptedQueuePool),
+    )
+    ReplicaSessionLocal = async_sessionmaker(
+        bind=replica_async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
 # Base class for models
 Base = declarative_base()
 
 
+def get_session_factory():
+    """Dependency to get the session factory for background jobs."""
+    return SessionLocal
+
+
 def get_db():
     """Dependency to get database session."""
     db = SessionLocal()
@@ -26,3 +66,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency to get async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
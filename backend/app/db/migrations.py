@@ -0,0 +1,120 @@
+"""
+Startup upgrades of existing databases.
+
+``Base.metadata.create_all`` creates missing tables but never changes
+existing ones. ``upgrade_schema`` runs after it and adds the columns that
+were introduced later to tables of older databases, backfills them, and
+creates missing indexes. Every step checks the current schema first, so
+it is safe to run on every start and on new databases.
+
+SQLite cannot add a NOT NULL constraint to an existing column; there the
+upgraded columns stay nullable (the application always fills them).
+"""
+from typing import Dict, List, Set
+
+from sqlalchemy import Column, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+from app.db.database import Base
+from app.models.activity import Activity
+from app.models.deal import Deal, ACTIVITY_COUNT_COLUMNS
+from app.models.outbox import OutboxEvent
+from app.models.user import Tenant
+from app.services.activity_counters import recount_activities
+
+logger = get_logger(__name__)
+
+# Deal columns maintained by app.services.activity_counters
+ACTIVITY_COUNTER_COLUMNS = (
+    "activity_count",
+    *ACTIVITY_COUNT_COLUMNS.values(),
+    "last_activity_type",
+    "last_activity_at",
+)
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """
+    Bring the tables of an existing database up to the current models.
+
+    Args:
+        engine: Engine of the primary database
+    """
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        columns: Dict[str, Set[str]] = {
+            table: {column["name"] for column in inspector.get_columns(table)}
+            for table in inspector.get_table_names()
+        }
+
+        if "tenant_id" not in columns["activities"]:
+            _add_activity_tenant_id(conn)
+
+        missing_counters = [name for name in ACTIVITY_COUNTER_COLUMNS if name not in columns["deals"]]
+        if missing_counters:
+            _add_activity_counters(conn, missing_counters)
+
+        # Change sequences start at 0; the change feed starts before 0
+        for table in (Tenant.__table__, Deal.__table__):
+            if "change_seq" not in columns[table.name]:
+                _add_column(conn, table.c.change_seq)
+
+        # Failure tracking of outbox events (attempts starts at 0)
+        for name in ("attempts", "last_error", "failed_at"):
+            if name not in columns["outbox"]:
+                _add_column(conn, OutboxEvent.__table__.c[name])
+
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
+def _add_column(conn: Connection, column: Column) -> None:
+    """
+    Add a model column to its existing table.
+
+    Columns with a server default get it (and NOT NULL if the model says
+    so); other columns are added nullable and must be backfilled. Foreign
+    keys are kept.
+    """
+    ddl = f"ALTER TABLE {column.table.name} ADD COLUMN {column.name} {column.type.compile(dialect=conn.dialect)}"
+    if column.server_default is not None:
+        ddl += f" DEFAULT {column.server_default.arg}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+    for foreign_key in column.foreign_keys:
+        ddl += f" REFERENCES {foreign_key.column.table.name} ({foreign_key.column.name})"
+    conn.execute(text(ddl))
+    logger.info(f"Added column {column.table.name}.{column.name}")
+
+
+def _set_not_null(conn: Connection, column: Column) -> None:
+    """Make a backfilled column NOT NULL where the database supports it."""
+    if conn.dialect.name == "sqlite":
+        return
+    conn.execute(text(f"ALTER TABLE {column.table.name} ALTER COLUMN {column.name} SET NOT NULL"))
+
+
+def _add_activity_tenant_id(conn: Connection) -> None:
+    """Add activities.tenant_id and copy it from the activities' deals."""
+    _add_column(conn, Activity.__table__.c.tenant_id)
+    backfilled = conn.execute(
+        text(
+            "UPDATE activities SET tenant_id = "
+            "(SELECT deals.tenant_id FROM deals WHERE deals.id = activities.deal_id) "
+            "WHERE tenant_id IS NULL"
+        )
+    ).rowcount
+    _set_not_null(conn, Activity.__table__.c.tenant_id)
+    logger.info(f"Backfilled tenant_id of {backfilled} activities")
+
+
+def _add_activity_counters(conn: Connection, names: List[str]) -> None:
+    """Add the deals' activity counter columns and count existing activities."""
+    for name in names:
+        _add_column(conn, Deal.__table__.c[name])
+    with Session(bind=conn) as db:
+        recounted = recount_activities(db)
+    logger.info(f"Backfilled activity counters of {recounted} deals")
@@ -0,0 +1,209 @@
+"""
+Connection pool configuration and statistics.
+
+Engines are created with pool settings from ``Settings`` and a pool
+subclass that times how long each checkout waits for a free connection.
+Pool event listeners count new connections and invalidations.
+``GET /metrics/db-pool`` reports these counters together with the current
+occupancy of each pool.
+
+Every uvicorn worker process has its own pools, so the numbers are per
+worker. Checkouts that wait or time out mean requests are queueing for
+connections in that worker; a steady non-zero overflow means
+``DB_POOL_SIZE`` is below the worker's typical concurrency.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.core.config import settings
+
+# Checkouts waiting longer than this count as queued
+QUEUED_CHECKOUT_SECONDS = 0.001
+
+
+class PoolMetrics:
+    """Checkout, wait and invalidation counters of one engine's pool."""
+
+    def __init__(self, name: str):
+        """
+        Initialize the counters.
+
+        Args:
+            name: Pool name in the metrics output
+        """
+        self.name = name
+        self.pool: Optional[Pool] = None
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._queued = 0
+        self._timeouts = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._overflow_peak = 0
+        self._connects = 0
+        self._invalidations = 0
+        self._soft_invalidations = 0
+
+    def pool_class(self, base: type) -> type:
+        """
+        Create a pool class reporting to these metrics.
+
+        The subclass survives ``engine.dispose()``, which recreates the
+        pool from its class.
+
+        Args:
+            base: Queue pool class of the engine (sync or async)
+
+        Returns:
+            Pool class to pass as ``poolclass``
+        """
+        metrics = self
+
+        class MonitoredPool(base):
+            def __init__(self, *args: Any, **kwargs: Any):
+                super().__init__(*args, **kwargs)
+                metrics.attach(self)
+
+            def _do_get(self):
+                started = time.perf_counter()
+                try:
+                    connection = super()._do_get()
+                except PoolTimeoutError:
+                    metrics.record_checkout(time.perf_counter() - started, self.overflow(), timed_out=True)
+                    raise
+                metrics.record_checkout(time.perf_counter() - started, self.overflow())
+                return connection
+
+        MonitoredPool.__name__ = f"Monitored{base.__name__}"
+        return MonitoredPool
+
+    def attach(self, pool: Pool) -> None:
+        """
+        Report the occupancy and events of a (re)created pool.
+
+        Args:
+            pool: Pool instance
+        """
+        self.pool = pool
+        for name, listener in (
+            ("connect", self._on_connect),
+            ("invalidate", self._on_invalidate),
+            ("soft_invalidate", self._on_soft_invalidate),
+        ):
+            # A recreated pool inherits the listeners of the disposed one
+            if not event.contains(pool, name, listener):
+                event.listen(pool, name, listener)
+
+    def record_checkout(self, wait_seconds: float, overflow: int, timed_out: bool = False) -> None:
+        """
+        Record one checkout attempt.
+
+        Args:
+            wait_seconds: Time spent getting a connection from the pool
+            overflow: Connections open beyond the pool size (negative while below it)
+            timed_out: Whether the checkout gave up after the pool timeout
+        """
+        with self._lock:
+            if timed_out:
+                self._timeouts += 1
+            else:
+                self._checkouts += 1
+            if wait_seconds > QUEUED_CHECKOUT_SECONDS:
+                self._queued += 1
+            self._wait_seconds += wait_seconds
+            self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+            self._overflow_peak = max(self._overflow_peak, overflow)
+
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        """Count a newly opened connection."""
+        with self._lock:
+            self._connects += 1
+
+    def _on_invalidate(self, dbapi_connection: Any, connection_record: Any, exception: Any) -> None:
+        """Count a connection closed after an error or explicit invalidation."""
+        with self._lock:
+            self._invalidations += 1
+
+    def _on_soft_invalidate(self, dbapi_connection: Any, connection_record: Any, exception: Any) -> None:
+        """Count a connection marked for replacement at its next checkin."""
+        with self._lock:
+            self._soft_invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get configuration, occupancy and counters of the pool."""
+        pool = self.pool
+        with self._lock:
+            attempts = self._checkouts + self._timeouts
+            stats = {
+                "checkouts": self._checkouts,
+                "queued_checkouts": self._queued,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._wait_seconds / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self._max_wait_seconds * 1000, 3),
+                "overflow_peak": self._overflow_peak,
+                "connections_opened": self._connects,
+                "invalidations": self._invalidations,
+                "soft_invalidations": self._soft_invalidations,
+            }
+        if pool is not None:
+            stats.update(
+                pool_size=pool.size(),
+                max_overflow=pool._max_overflow,
+                checked_out=pool.checkedout(),
+                idle=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                timeout_seconds=pool.timeout(),
+                recycle_seconds=pool._recycle,
+                pre_ping=pool._pre_ping,
+            )
+        return stats
+
+
+# Metrics of all monitored pools by name
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def pool_options(name: str, url: str, base: type = QueuePool) -> Dict[str, Any]:
+    """
+    Build the pool arguments of ``create_engine`` from settings.
+
+    In-memory SQLite keeps SQLAlchemy's single-connection pool (a queue
+    pool would give every connection its own empty database) and is not
+    monitored.
+
+    Args:
+        name: Pool name in the metrics output
+        url: Database URL of the engine
+        base: Queue pool class (``AsyncAdaptedQueuePool`` for async engines)
+
+    Returns:
+        Keyword arguments for ``create_engine`` / ``create_async_engine``
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+    metrics = pool_metrics[name] = PoolMetrics(name)
+    return {
+        "poolclass": metrics.pool_class(base),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Get the statistics of all monitored pools of this worker."""
+    return {
+        "worker_pid": os.getpid(),
+        "pools": {name: metrics.stats() for name, metrics in pool_metrics.items()},
+    }
@@ -0,0 +1,211 @@
+"""
+Per-request SQL statistics.
+
+Engine event hooks count every statement sent to the database and time
+it. The request's ``QueryStats`` are found through a context variable,
+which also reaches ``run_sync`` calls and sync endpoints running in the
+threadpool. An executemany counts as one statement.
+
+``QueryStatsMiddleware`` logs the query count, total DB time and repeated
+statements once per request (as ``extra.sql`` of the JSON log line). It
+warns when one statement shape runs more than
+``SQL_REPEATED_STATEMENT_THRESHOLD`` times in one request, which usually
+means a per-row query (N+1) in a loop. In debug mode the response also
+gets a ``Server-Timing`` header, shown by the browser's network panel.
+"""
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bound parameter placeholders of the supported drivers (sqlite, psycopg2, asyncpg)
+_PLACEHOLDER = r"(?:\?|%\(\w+\)s|\$\d+(?:::\w+)?)"
+# Expanded IN lists and multi-row VALUES differ only in their number of placeholders
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_REPEATED_GROUPS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Characters of a statement included in log lines
+MAX_STATEMENT_LENGTH = 500
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a statement so executions differing only in list lengths match.
+
+    Args:
+        statement: SQL as sent to the driver
+
+    Returns:
+        Statement with placeholder lists collapsed and whitespace normalized
+    """
+    shape = _PLACEHOLDER_LIST.sub("(...)", statement)
+    shape = _REPEATED_GROUPS.sub("(...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Statements executed while handling one request."""
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        """
+        Record one executed statement.
+
+        Args:
+            statement: SQL as sent to the driver
+            seconds: Execution time
+        """
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Get statement shapes executed more than ``threshold`` times.
+
+        Args:
+            threshold: Maximum executions of one shape considered normal
+
+        Returns:
+            (shape, executions) pairs, most executed first
+        """
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def summary(self, threshold: int) -> Dict[str, Any]:
+        """Get the statistics as structured log fields."""
+        return {
+            "queries": self.count,
+            "db_ms": round(self.seconds * 1000, 2),
+            "distinct_statements": len(self.shapes),
+            "repeated": [
+                {"statement": shape[:MAX_STATEMENT_LENGTH], "count": count}
+                for shape, count in self.repeated(threshold)
+            ],
+        }
+
+    def server_timing(self) -> str:
+        """Get the statistics as a ``Server-Timing`` header value."""
+        return f'db;dur={self.seconds * 1000:.2f};desc="{self.count} queries"'
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Get the statistics of the current request (None outside of requests)."""
+    return _current_stats.get()
+
+
+def detach_query_stats() -> None:
+    """
+    Stop recording into the current request's statistics.
+
+    Call at the start of background work launched by a request (which
+    inherits the request's context), so its statements are not counted
+    as part of the request.
+    """
+    _current_stats.set(None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Remember when a statement started."""
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Record a finished statement in the current request's statistics."""
+    stats = _current_stats.get()
+    started = conn.info.get("query_started")
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_timer(context) -> None:
+    """Drop the start time of a failed statement (no after_cursor_execute follows)."""
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if _current_stats.get() is not None and started:
+        started.pop()
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware collecting and reporting SQL statistics per request."""
+
+    def __init__(self, app: ASGIApp, threshold: Optional[int] = None):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            threshold: Executions of one statement per request before warning
+                (defaults to SQL_REPEATED_STATEMENT_THRESHOLD)
+        """
+        self.app = app
+        self.threshold = threshold if threshold is not None else settings.SQL_REPEATED_STATEMENT_THRESHOLD
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Collect the statistics of a request and report them."""
+        if scope["type"] != "http" or not settings.SQL_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        status_code = None
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.DEBUG:
+                    MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            self._report(scope, status_code, stats)
+
+    def _report(self, scope: Scope, status_code: Optional[int], stats: QueryStats) -> None:
+        """Log the statistics of a finished request."""
+        if not stats.count:
+            return
+
+        request = f"{scope['method']} {scope['path']}"
+        fields = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "sql": stats.summary(self.threshold),
+        }
+        logger.info(
+            f"{request}: {stats.count} queries in {fields['sql']['db_ms']} ms",
+            extra={"extra": fields},
+        )
+        for shape, count in stats.repeated(self.threshold):
+            logger.warning(
+                f"{request}: statement executed {count} times (possible N+1): "
+                f"{shape[:MAX_STATEMENT_LENGTH]}",
+                extra={"extra": {**fields, "statement_count": count}},
+            )
@@ -0,0 +1,238 @@
+"""
+Routing of read-only endpoints to a read replica.
+
+With ``REPLICA_DATABASE_URL`` set, the deal list, insights and activity
+reads use a replica session; writes always use the primary. A read falls
+back to the primary when:
+
+- the replica lags more than ``REPLICA_MAX_LAG_SECONDS`` or is unreachable.
+  A background task stamps a heartbeat row on the primary every
+  ``REPLICA_HEARTBEAT_INTERVAL_SECONDS`` and reads it back from the replica.
+  The lag is the age of the replica's heartbeat relative to the newest one
+  this worker wrote.
+- this worker committed a deal or activity write for the tenant that the
+  replica has not applied yet (read-your-writes). Writes take the tenant's
+  change sequence (see ``app.services.change_feed``). The replica is used
+  again once its ``tenants.change_seq`` has reached the value written.
+
+Read-your-writes is tracked per worker process. A client whose requests
+are balanced across workers is still protected by the lag bound.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from sqlalchemy import event, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.database import ReplicaSessionLocal
+from app.models.replication import ReplicationHeartbeat
+from app.models.user import Tenant
+from app.services.change_feed import WRITTEN_CHANGE_SEQS
+
+logger = get_logger(__name__)
+
+HEARTBEAT_ID = 1
+
+
+class ReplicaRouter:
+    """Chooses between the read replica and the primary for read-only requests."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]],
+        max_lag_seconds: float,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            session_factory: Replica session factory (None without a replica)
+            max_lag_seconds: Lag above which reads go to the primary
+        """
+        self.session_factory = session_factory
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_seconds: Optional[float] = None  # None until measured or while unreachable
+        self._last_beat: Optional[datetime] = None
+        self._written: Dict[int, int] = {}  # Tenant ID -> change sequence not yet seen on the replica
+        self._counts = {"replica": 0, "primary_lag": 0, "primary_read_your_writes": 0, "primary_error": 0}
+        self._task: Optional[asyncio.Task] = None
+
+    def configure(self, session_factory: Optional[Callable[[], AsyncSession]]) -> None:
+        """Set (or remove) the replica, resetting lag, pending writes and counters."""
+        self.session_factory = session_factory
+        self.lag_seconds = None
+        self._last_beat = None
+        self._written.clear()
+        self._counts = dict.fromkeys(self._counts, 0)
+
+    def note_writes(self, change_seqs: Dict[int, int]) -> None:
+        """
+        Remember committed change sequence values per tenant.
+
+        Args:
+            change_seqs: Last committed value per tenant ID
+        """
+        for tenant_id, seq in change_seqs.items():
+            if seq > self._written.get(tenant_id, 0):
+                self._written[tenant_id] = seq
+
+    @asynccontextmanager
+    async def read_session(self, tenant_id: int, primary: AsyncSession) -> AsyncIterator[AsyncSession]:
+        """
+        Get the session for a read-only request.
+
+        Args:
+            tenant_id: Tenant of the request
+            primary: Primary session of the request (used as fallback)
+
+        Yields:
+            Replica session if fresh enough for the tenant, else ``primary``
+        """
+        replica = await self._replica_session(tenant_id)
+        if replica is None:
+            yield primary
+            return
+        try:
+            yield replica
+        finally:
+            await replica.close()
+
+    async def _replica_session(self, tenant_id: int) -> Optional[AsyncSession]:
+        """Open a replica session, or return None if the primary must be used."""
+        if self.session_factory is None:
+            return None
+        if self.lag_seconds is None or self.lag_seconds > self.max_lag_seconds:
+            self._counts["primary_lag"] += 1
+            return None
+
+        replica = self.session_factory()
+        written = self._written.get(tenant_id)
+        if written is not None:
+            try:
+                applied = await replica.scalar(select(Tenant.change_seq).where(Tenant.id == tenant_id))
+            except Exception as e:
+                await replica.close()
+                self._counts["primary_error"] += 1
+                logger.warning(f"Replica read failed, using primary: {e}")
+                return None
+            if applied is None or applied < written:
+                await replica.close()
+                self._counts["primary_read_your_writes"] += 1
+                return None
+            # Caught up; later writes re-add the tenant
+            if self._written.get(tenant_id) == written:
+                del self._written[tenant_id]
+
+        self._counts["replica"] += 1
+        return replica
+
+    async def check_lag(self, primary_factory: Callable[[], AsyncSession]) -> Optional[float]:
+        """
+        Measure the replica lag and stamp the next heartbeat on the primary.
+
+        Args:
+            primary_factory: Primary session factory
+
+        Returns:
+            Lag in seconds (None if the replica is unreachable or has no heartbeat yet)
+        """
+        if self.session_factory is None:
+            return None
+
+        try:
+            async with self.session_factory() as replica:
+                replica_beat = await replica.scalar(
+                    select(ReplicationHeartbeat.beat_at).where(ReplicationHeartbeat.id == HEARTBEAT_ID)
+                )
+        except Exception as e:
+            logger.warning(f"Replica heartbeat read failed: {e}")
+            replica_beat = None
+
+        if replica_beat is None:
+            self.lag_seconds = None
+        else:
+            reference = self._last_beat or datetime.utcnow()
+            self.lag_seconds = max((reference - replica_beat).total_seconds(), 0.0)
+
+        beat = datetime.utcnow()
+        async with primary_factory() as db:
+            stamped = await db.execute(
+                update(ReplicationHeartbeat)
+                .where(ReplicationHeartbeat.id == HEARTBEAT_ID)
+                .values(beat_at=beat)
+            )
+            if not stamped.rowcount:
+                db.add(ReplicationHeartbeat(id=HEARTBEAT_ID, beat_at=beat))
+            try:
+                await db.commit()
+            except IntegrityError:
+                # Another worker created the row first; stamp it next round
+                await db.rollback()
+                return self.lag_seconds
+        self._last_beat = beat
+        return self.lag_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the replica state and read routing counters."""
+        return {
+            "configured": self.session_factory is not None,
+            "lag_seconds": None if self.lag_seconds is None else round(self.lag_seconds, 3),
+            "max_lag_seconds": self.max_lag_seconds,
+            "tenants_awaiting_replication": len(self._written),
+            "reads": dict(self._counts),
+        }
+
+    def start(self, primary_factory: Callable[[], AsyncSession], interval: float) -> None:
+        """
+        Start the background heartbeat loop.
+
+        Args:
+            primary_factory: Primary session factory
+            interval: Seconds between heartbeats
+        """
+        if self._task is None and self.session_factory is not None:
+            self._task = asyncio.create_task(self._run(primary_factory, interval))
+
+    async def stop(self) -> None:
+        """Stop the heartbeat loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, primary_factory: Callable[[], AsyncSession], interval: float) -> None:
+        """Measure the lag every interval."""
+        while True:
+            try:
+                await self.check_lag(primary_factory)
+            except Exception as e:
+                self.lag_seconds = None
+                logger.error(f"Replica heartbeat failed: {e}")
+            await asyncio.sleep(interval)
+
+
+# Process-wide router used by the read dependencies
+replica_router = ReplicaRouter(ReplicaSessionLocal, settings.REPLICA_MAX_LAG_SECONDS)
+
+
+@event.listens_for(Session, "after_commit")
+def _note_committed_writes(session: Session) -> None:
+    """Hand change sequence values of a committed transaction to the router."""
+    written = session.info.pop(WRITTEN_CHANGE_SEQS, None)
+    if written and replica_router.session_factory is not None:
+        replica_router.note_writes(written)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_writes(session: Session) -> None:
+    """Drop change sequence values of a rolled back transaction."""
+    session.info.pop(WRITTEN_CHANGE_SEQS, None)
@@ -5,8 +5,18 @@ from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.logging import setup_logging, get_logger
-from app.db.database import engine, Base
-from app.api.routes import auth, deals, activities, webhooks
+from app.db.database import engine, async_engine, replica_async_engine, AsyncSessionLocal, Base
+from app.db.migrations import upgrade_schema
+from app.db.replica import replica_router
+from app.api.routes import auth, deals, activities, webhooks, metrics
+from app.api.serializers import FastJSONResponse
+from app.services.contact_buffer import contact_buffer
+from app.services.outbox import outbox_relay
+from app.services.webhook_service import webhook_dispatcher
+from app.services.idempotency_service import idempotency_purger
+from app.core.hashing import password_hasher
+from app.core.rate_limit import RateLimitMiddleware
+from app.db.query_stats import QueryStatsMiddleware
 
 # Setup logging
 setup_logging("INFO" if not settings.DEBUG else "DEBUG")
@@ -21,12 +31,29 @@ async def lifespan(app: FastAPI):
 
     # Create database tables
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
     logger.info("Database tables created")
 
+    contact_buffer.start(AsyncSessionLocal, settings.CONTACT_FLUSH_INTERVAL_SECONDS)
+    if settings.OUTBOX_RELAY_IN_PROCESS:
+        outbox_relay.start(AsyncSessionLocal, settings.OUTBOX_RELAY_INTERVAL_SECONDS)
+    webhook_dispatcher.start(AsyncSessionLocal, settings.WEBHOOK_DISPATCH_INTERVAL_SECONDS)
+    replica_router.start(AsyncSessionLocal, settings.REPLICA_HEARTBEAT_INTERVAL_SECONDS)
+    idempotency_purger.start(AsyncSessionLocal, settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS)
+
     yield
 
     # Shutdown
     logger.info("Shutting down DealFlow application...")
+    await contact_buffer.stop(AsyncSessionLocal)
+    await outbox_relay.stop()
+    await webhook_dispatcher.stop()
+    await replica_router.stop()
+    await idempotency_purger.stop()
+    password_hasher.shutdown()
+    await async_engine.dispose()
+    if replica_async_engine is not None:
+        await replica_async_engine.dispose()
 
 
 # Create FastAPI app
@@ -35,8 +62,15 @@ app = FastAPI(
     version=settings.VERSION,
     description="Intelligenter CRM-Assistent für den deutschen B2B-Vertrieb",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+# Per-request SQL statistics (innermost, so rejected requests are not reported)
+app.add_middleware(QueryStatsMiddleware)
+
+# Per-tenant rate limiting (added before CORS so 429 responses get CORS headers)
+app.add_middleware(RateLimitMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -74,6 +108,7 @@ app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(deals.router, prefix="/api/deals", tags=["Deals"])
 app.include_router(activities.router, prefix="/api/activities", tags=["Activities"])
 app.include_router(webhooks.router, prefix="/api/webhooks", tags=["Webhooks"])
+app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
 
 
 if __name__ == "__main__":
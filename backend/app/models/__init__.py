@@ -2,5 +2,32 @@
 from app.models.user import User, Tenant
 from app.models.deal import Deal, DealStage
 from app.models.activity import Activity, ActivityType
+from app.models.import_job import ImportJob, ImportStatus, ImportFormat
+from app.models.idempotency import IdempotencyKey
+from app.models.archive import ArchivedDeal
+from app.models.tombstone import DealTombstone
+from app.models.outbox import OutboxEvent, OutboxEventType
+from app.models.replication import ReplicationHeartbeat
+from app.models.webhook import WebhookSubscription, WebhookDelivery, WebhookEvent, DeliveryStatus
 
-__all__ = ["User", "Tenant", "Deal", "DealStage", "Activity", "ActivityType"]
+__all__ = [
+    "User",
+    "Tenant",
+    "Deal",
+    "DealStage",
+    "Activity",
+    "ActivityType",
+    "ImportJob",
+    "ImportStatus",
+    "ImportFormat",
+    "IdempotencyKey",
+    "ArchivedDeal",
+    "DealTombstone",
+    "OutboxEvent",
+    "OutboxEventType",
+    "ReplicationHeartbeat",
+    "WebhookSubscription",
+    "WebhookDelivery",
+    "WebhookEvent",
+    "DeliveryStatus",
+]
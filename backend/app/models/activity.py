@@ -1,7 +1,7 @@
 """Activity model for deal timeline."""
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from enum import Enum
 from app.db.database import Base
 
@@ -21,9 +21,24 @@ class Activity(Base):
     """Activity model for tracking deal history."""
 
     __tablename__ = "activities"
+    __table_args__ = (
+        # Backs the newest-first keyset pagination of deal timelines
+        Index("ix_activities_deal_created_at", "deal_id", text("created_at DESC"), text("id DESC")),
+        # Back the tenant-wide activity feed (optionally per user)
+        Index("ix_activities_tenant_created_at", "tenant_id", text("created_at DESC"), text("id DESC")),
+        Index(
+            "ix_activities_tenant_user_created_at",
+            "tenant_id",
+            "user_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    deal_id = Column(Integer, ForeignKey("deals.id"), nullable=False, index=True)
+    # Denormalized from the deal so the tenant feed needs no join
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+    deal_id = Column(Integer, ForeignKey("deals.id"), nullable=False)  # Indexed via ix_activities_deal_created_at
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
 
     # Activity details
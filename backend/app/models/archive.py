@@ -0,0 +1,47 @@
+"""Archive model for closed deals moved out of the hot tables."""
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Numeric,
+    DateTime,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    Enum as SQLEnum,
+)
+from sqlalchemy.sql import func
+from app.db.database import Base
+from app.models.deal import DealStage
+
+
+class ArchivedDeal(Base):
+    """
+    Closed deal archived together with its activities.
+
+    Summary columns support listing; the full deal and its activities are
+    kept as a zlib-compressed JSON document in ``payload``.
+    """
+
+    __tablename__ = "archived_deals"
+    __table_args__ = (
+        Index("ix_archived_deals_tenant_deal", "tenant_id", "deal_id"),
+        Index("ix_archived_deals_tenant_closed_at", "tenant_id", "closed_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+    deal_id = Column(Integer, nullable=False)  # ID the deal had in the deals table
+
+    # Summary
+    title = Column(String(255), nullable=False)
+    company_name = Column(String(255), nullable=False)
+    value = Column(Numeric(precision=12, scale=2), nullable=False)
+    stage = Column(SQLEnum(DealStage), nullable=False)
+    activity_count = Column(Integer, nullable=False)
+    closed_at = Column(DateTime(timezone=True), nullable=False)  # Last update of the deal
+
+    # Compressed JSON: {"deal": {...}, "activities": [...]}
+    payload = Column(LargeBinary, nullable=False)
+
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,9 +1,11 @@
 """Deal model."""
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from enum import Enum
+from typing import Dict
 from app.db.database import Base
+from app.models.activity import ActivityType
 
 
 class DealStage(str, Enum):
@@ -21,6 +23,24 @@ class Deal(Base):
     """Deal model representing a sales opportunity."""
 
     __tablename__ = "deals"
+    __table_args__ = (
+        # Composite indexes backing the server-side filters and sort keys
+        # of the deal query planner (every query is scoped by tenant first).
+        Index("ix_deals_tenant_stage", "tenant_id", "stage"),
+        Index("ix_deals_tenant_value", "tenant_id", "value"),
+        Index("ix_deals_tenant_health_score", "tenant_id", "health_score"),
+        Index("ix_deals_tenant_expected_close", "tenant_id", "expected_close_date"),
+        Index("ix_deals_tenant_last_contact", "tenant_id", "last_contact_at"),
+        Index("ix_deals_tenant_updated_at", "tenant_id", "updated_at"),
+        # Backs the change feed's keyset pagination
+        Index("ix_deals_tenant_change_seq", "tenant_id", "change_seq", "id"),
+        Index(
+            "ix_deals_tenant_company_name",
+            "tenant_id",
+            "company_name",
+            postgresql_ops={"company_name": "text_pattern_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
@@ -42,6 +62,21 @@ class Deal(Base):
     expected_close_date = Column(DateTime(timezone=True))
     notes = Column(String(2000))
 
+    # Activity summary, maintained with every activity write
+    # (see app.services.activity_counters)
+    activity_count = Column(Integer, default=0, server_default="0", nullable=False)
+    note_count = Column(Integer, default=0, server_default="0", nullable=False)
+    call_count = Column(Integer, default=0, server_default="0", nullable=False)
+    email_count = Column(Integer, default=0, server_default="0", nullable=False)
+    meeting_count = Column(Integer, default=0, server_default="0", nullable=False)
+    stage_change_count = Column(Integer, default=0, server_default="0", nullable=False)
+    system_count = Column(Integer, default=0, server_default="0", nullable=False)
+    last_activity_type = Column(SQLEnum(ActivityType))
+    last_activity_at = Column(DateTime(timezone=True))
+
+    # Tenant change sequence value of the last write (see app.services.change_feed)
+    change_seq = Column(Integer, default=0, server_default="0", nullable=False)
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -49,3 +84,15 @@ class Deal(Base):
     # Relationships
     tenant = relationship("Tenant", back_populates="deals")
     activities = relationship("Activity", back_populates="deal", cascade="all, delete-orphan")
+
+    @property
+    def activity_counts(self) -> Dict[ActivityType, int]:
+        """Number of activities per activity type."""
+        return {
+            activity_type: getattr(self, column) or 0
+            for activity_type, column in ACTIVITY_COUNT_COLUMNS.items()
+        }
+
+
+# Deal counter column per activity type
+ACTIVITY_COUNT_COLUMNS = {activity_type: f"{activity_type.value}_count" for activity_type in ActivityType}
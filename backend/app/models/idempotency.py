@@ -0,0 +1,28 @@
+"""Idempotency key model for replaying write responses."""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class IdempotencyKey(Base):
+    """Stored result of a write request made with an Idempotency-Key header."""
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "key", name="uq_idempotency_keys_tenant_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+    key = Column(String(255), nullable=False)
+
+    # Request fingerprint (method, path and body hash)
+    request_hash = Column(String(64), nullable=False)
+
+    # Stored response (status_code is NULL while the request is in progress)
+    status_code = Column(Integer)
+    response_body = Column(JSON)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,47 @@
+"""Import job model for streaming deal imports."""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Enum as SQLEnum
+from sqlalchemy.sql import func
+from enum import Enum
+from app.db.database import Base
+
+
+class ImportStatus(str, Enum):
+    """Lifecycle states of an import job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ImportFormat(str, Enum):
+    """Supported import file formats."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ImportJob(Base):
+    """Import job model tracking progress of a deal import."""
+
+    __tablename__ = "import_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    # Job details
+    file_format = Column(SQLEnum(ImportFormat), nullable=False)
+    filename = Column(String(255))
+    status = Column(SQLEnum(ImportStatus), default=ImportStatus.PENDING, nullable=False)
+
+    # Progress counters
+    processed_rows = Column(Integer, default=0, nullable=False)
+    imported_rows = Column(Integer, default=0, nullable=False)
+    failed_rows = Column(Integer, default=0, nullable=False)
+    errors = Column(JSON, default=list, nullable=False)  # Capped sample of row errors
+    error_message = Column(String(2000))
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime(timezone=True))
@@ -0,0 +1,44 @@
+"""Transactional outbox model for domain events."""
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from enum import Enum
+from app.db.database import Base
+
+
+class OutboxEventType(str, Enum):
+    """Domain events recorded in the outbox."""
+
+    DEAL_CREATED = "deal.created"
+    DEAL_UPDATED = "deal.updated"
+    DEAL_WON = "deal.won"
+    DEAL_HEALTH_ALERT = "deal.health_alert"
+    DEAL_DELETED = "deal.deleted"
+    ACTIVITY_CREATED = "activity.created"
+
+
+class OutboxEvent(Base):
+    """
+    Domain event written in the same transaction as the change it records.
+
+    Rows are drained in id order by the outbox relay and deleted once
+    handled. Events whose handlers keep failing are set aside with
+    ``failed_at`` after ``OUTBOX_MAX_ATTEMPTS`` attempts.
+    """
+
+    __tablename__ = "outbox"
+
+    id = Column(Integer, primary_key=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+
+    # OutboxEventType value (a string column, so new types need no migration)
+    event_type = Column(String(50), nullable=False)
+    aggregate_id = Column(Integer, nullable=False)  # ID of the deal or activity
+    payload = Column(JSON, default=dict, nullable=False)  # Compact change summary
+
+    # Handler failures of this event on its own
+    attempts = Column(Integer, default=0, server_default="0", nullable=False)
+    last_error = Column(Text)
+    failed_at = Column(DateTime(timezone=True))  # Set aside, no longer relayed
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,12 @@
+"""Replication heartbeat used to measure read replica lag."""
+from sqlalchemy import Column, Integer, DateTime
+from app.db.database import Base
+
+
+class ReplicationHeartbeat(Base):
+    """Single row periodically stamped on the primary and read back from the replica."""
+
+    __tablename__ = "replication_heartbeat"
+
+    id = Column(Integer, primary_key=True)
+    beat_at = Column(DateTime, nullable=False)  # Naive UTC
@@ -0,0 +1,23 @@
+"""Tombstones of deals removed from the deals table, for the change feed."""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class DealTombstone(Base):
+    """Marks a deleted or archived deal at a point of the tenant change sequence."""
+
+    __tablename__ = "deal_tombstones"
+    __table_args__ = (
+        # Backs the change feed's keyset pagination
+        Index("ix_deal_tombstones_tenant_change_seq", "tenant_id", "change_seq", "deal_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+    deal_id = Column(Integer, nullable=False)
+    change_seq = Column(Integer, nullable=False)
+    reason = Column(String(20), nullable=False)  # "deleted" or "archived"
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -14,6 +14,8 @@ class Tenant(Base):
     name = Column(String(255), nullable=False)
     subdomain = Column(String(100), unique=True, nullable=False, index=True)
     is_active = Column(Boolean, default=True, nullable=False)
+    # Last value of the tenant's deal change sequence (see services.change_feed)
+    change_seq = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
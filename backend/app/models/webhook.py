@@ -0,0 +1,75 @@
+"""Outbound webhook subscription and delivery models."""
+from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index, Enum as SQLEnum
+from sqlalchemy.sql import func
+from enum import Enum
+from app.db.database import Base
+
+
+class WebhookEvent(str, Enum):
+    """Events pushed to webhook subscriptions."""
+
+    DEAL_UPDATED = "deal.updated"
+    DEAL_WON = "deal.won"
+    DEAL_HEALTH_ALERT = "deal.health_alert"
+    DIGEST = "digest"  # Batched delivery of several events (not subscribable)
+
+
+class DeliveryStatus(str, Enum):
+    """Lifecycle states of a webhook delivery."""
+
+    BATCHING = "batching"  # Open digest collecting events until its window closes
+    PENDING = "pending"
+    DELIVERED = "delivered"
+    DEAD = "dead"  # Gave up after the maximum number of attempts
+
+
+class WebhookSubscription(Base):
+    """Endpoint of a tenant receiving pushed events."""
+
+    __tablename__ = "webhook_subscriptions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
+
+    url = Column(String(2000), nullable=False)
+    events = Column(JSON, default=list, nullable=False)  # WebhookEvent values
+    secret = Column(String(255))  # Signing secret generated at creation (unset on legacy rows)
+    max_concurrency = Column(Integer)  # Parallel requests to the endpoint (default if unset)
+    is_active = Column(Boolean, default=True, nullable=False)
+
+    # Digest batching: events within the window are sent as one digest
+    digest_window_seconds = Column(Integer)  # Max latency (unset: one delivery per event)
+    digest_max_events = Column(Integer)  # Max entries per digest (default if unset)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class WebhookDelivery(Base):
+    """A signed event payload queued for delivery to one subscription."""
+
+    __tablename__ = "webhook_deliveries"
+    __table_args__ = (
+        # Due deliveries are polled by status and attempt time
+        Index("ix_webhook_deliveries_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
+    subscription_id = Column(
+        Integer, ForeignKey("webhook_subscriptions.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+
+    event = Column(SQLEnum(WebhookEvent), nullable=False)
+    body = Column(Text, nullable=False)  # JSON body exactly as signed and sent
+
+    # Retry state
+    status = Column(SQLEnum(DeliveryStatus), default=DeliveryStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, nullable=False)  # Naive UTC (digest window end while batching)
+    last_status_code = Column(Integer)
+    last_error = Column(String(2000))
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    delivered_at = Column(DateTime(timezone=True))
@@ -1,7 +1,8 @@
 """Pydantic schemas for API validation."""
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
 from app.schemas.deal import DealCreate, DealUpdate, DealResponse, DealListResponse
-from app.schemas.activity import ActivityCreate, ActivityResponse
+from app.schemas.activity import ActivityCreate, ActivityResponse, ActivityPage
+from app.schemas.import_job import ImportJobResponse
 
 __all__ = [
     "UserCreate",
@@ -14,4 +15,6 @@ __all__ = [
     "DealListResponse",
     "ActivityCreate",
     "ActivityResponse",
+    "ActivityPage",
+    "ImportJobResponse",
 ]
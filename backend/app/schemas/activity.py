@@ -1,10 +1,13 @@
 """Activity schemas."""
-from pydantic import BaseModel, Field, ConfigDict
-from datetime import datetime
-from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
 
 from app.models.activity import ActivityType
 
+# Tolerated clock difference between integrations and the API
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
 
 class ActivityBase(BaseModel):
     """Base activity schema."""
@@ -29,3 +32,43 @@ class ActivityResponse(ActivityBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ActivityPage(BaseModel):
+    """One page of an activity timeline, newest first."""
+
+    activities: List[ActivityResponse]
+    next_cursor: Optional[str] = None  # Pass as cursor to load the next page
+
+
+class ActivityBatchItem(ActivityCreate):
+    """Schema for one item of a batch activity ingestion."""
+
+    created_at: Optional[datetime] = None  # When the call/email happened (default: now)
+
+    @field_validator("created_at")
+    @classmethod
+    def validate_created_at(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Reject timestamps in the future (they would pin the deal's last contact)."""
+        if value is None:
+            return value
+        now = datetime.now(timezone.utc) if value.tzinfo is not None else datetime.utcnow()
+        if value > now + MAX_CLOCK_SKEW:
+            raise ValueError("created_at must not be in the future")
+        return value
+
+
+class ActivityBatchItemResult(BaseModel):
+    """Result for one item of a batch activity ingestion."""
+
+    index: int  # Position of the item in the request
+    id: Optional[int] = None  # Created activity ID (None if rejected)
+    errors: Optional[List[Dict[str, Any]]] = None
+
+
+class ActivityBatchResponse(BaseModel):
+    """Schema for batch activity ingestion results."""
+
+    results: List[ActivityBatchItemResult]
+    created_count: int
+    error_count: int
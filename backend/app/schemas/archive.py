@@ -0,0 +1,29 @@
+"""Archived deal schemas."""
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import List
+from decimal import Decimal
+
+from app.models.deal import DealStage
+
+
+class ArchivedDealSummary(BaseModel):
+    """Schema for an archived deal in listings."""
+
+    deal_id: int
+    title: str
+    company_name: str
+    value: Decimal
+    stage: DealStage
+    activity_count: int
+    closed_at: datetime
+    archived_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ArchivedDealListResponse(BaseModel):
+    """Schema for list of archived deals."""
+
+    deals: List[ArchivedDealSummary]
+    total: int
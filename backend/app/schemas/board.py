@@ -0,0 +1,23 @@
+"""Pipeline board schemas."""
+from pydantic import BaseModel
+from typing import List, Optional
+from decimal import Decimal
+
+from app.models.deal import DealStage
+from app.schemas.deal import DealResponse
+
+
+class BoardColumn(BaseModel):
+    """One stage column of the pipeline board."""
+
+    stage: DealStage
+    count: int
+    total_value: Decimal
+    deals: List[DealResponse]
+    next_cursor: Optional[str] = None  # Pass to /board/{stage} to load more
+
+
+class BoardResponse(BaseModel):
+    """Pipeline board grouped by stage."""
+
+    columns: List[BoardColumn]
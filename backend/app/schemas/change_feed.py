@@ -0,0 +1,23 @@
+"""Deal change feed schemas."""
+from pydantic import BaseModel
+from typing import List, Optional
+
+from app.schemas.deal import DealResponse
+
+
+class DealChange(BaseModel):
+    """Latest change of one deal."""
+
+    change_seq: int
+    deal_id: int
+    deleted: bool
+    reason: Optional[str] = None  # "deleted" or "archived" for removed deals
+    deal: Optional[DealResponse] = None  # Current state (None for removed deals)
+
+
+class DealChangesResponse(BaseModel):
+    """Schema for a page of the deal change feed."""
+
+    changes: List[DealChange]
+    next_cursor: str  # Resume here (also when the page is empty)
+    has_more: bool
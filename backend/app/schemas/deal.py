@@ -1,10 +1,11 @@
 """Deal schemas."""
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Any, Dict
 from decimal import Decimal
 
 from app.models.deal import DealStage
+from app.models.activity import ActivityType
 
 
 class DealBase(BaseModel):
@@ -41,6 +42,12 @@ class DealUpdate(BaseModel):
     notes: Optional[str] = Field(None, max_length=2000)
 
 
+class BulkDealUpdate(DealUpdate):
+    """Schema for one item of a bulk deal update."""
+
+    id: int
+
+
 class DealResponse(DealBase):
     """Schema for deal response."""
 
@@ -50,6 +57,10 @@ class DealResponse(DealBase):
     last_contact_at: Optional[datetime]
     created_at: datetime
     updated_at: datetime
+    activity_count: Optional[int] = None
+    activity_counts: Optional[Dict[ActivityType, int]] = None  # Per activity type
+    last_activity_type: Optional[ActivityType] = None
+    last_activity_at: Optional[datetime] = None
     next_actions: Optional[List[str]] = None  # AI-generated recommendations
 
     model_config = ConfigDict(from_attributes=True)
@@ -60,3 +71,65 @@ class DealListResponse(BaseModel):
 
     deals: List[DealResponse]
     total: int
+
+
+class BulkItemError(BaseModel):
+    """Validation or processing error for one item of a bulk request."""
+
+    index: int  # Position of the item in the request
+    errors: List[Dict[str, Any]]
+
+
+class BulkCreateResponse(BaseModel):
+    """Schema for bulk deal creation results."""
+
+    created: List[DealResponse]
+    errors: List[BulkItemError]
+    created_count: int
+    error_count: int
+
+
+# Sort keys accepted by the deal list endpoint (prefix with "-" for descending)
+DEAL_SORT_FIELDS = (
+    "value",
+    "health_score",
+    "expected_close_date",
+    "last_contact_at",
+    "created_at",
+    "updated_at",
+    "company_name",
+    "title",
+    "stage",
+)
+
+
+class DealFilterParams(BaseModel):
+    """Server-side filters and sorting for deal lists."""
+
+    stage: Optional[DealStage] = None
+    stages: Optional[List[DealStage]] = None
+    min_value: Optional[Decimal] = Field(None, ge=0)
+    max_value: Optional[Decimal] = Field(None, ge=0)
+    min_health: Optional[int] = Field(None, ge=0, le=100)
+    max_health: Optional[int] = Field(None, ge=0, le=100)
+    close_after: Optional[datetime] = None
+    close_before: Optional[datetime] = None
+    stale_days: Optional[int] = Field(None, ge=0)  # No contact for N+ days
+    company_prefix: Optional[str] = Field(None, min_length=1, max_length=255)
+    sort: str = "-updated_at"
+
+    @field_validator("sort")
+    @classmethod
+    def validate_sort(cls, value: str) -> str:
+        """Only allow whitelisted sort keys."""
+        keys = [key.strip() for key in value.split(",") if key.strip()]
+        if not keys:
+            raise ValueError("At least one sort key is required")
+        if len(keys) > 3:
+            raise ValueError("At most 3 sort keys are allowed")
+        for key in keys:
+            if key.lstrip("-") not in DEAL_SORT_FIELDS:
+                raise ValueError(
+                    f"Invalid sort key '{key}'. Allowed: {', '.join(DEAL_SORT_FIELDS)}"
+                )
+        return ",".join(keys)
@@ -0,0 +1,25 @@
+"""Import job schemas."""
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Optional, List, Any, Dict
+
+from app.models.import_job import ImportStatus, ImportFormat
+
+
+class ImportJobResponse(BaseModel):
+    """Schema for import job status."""
+
+    id: int
+    tenant_id: int
+    file_format: ImportFormat
+    filename: Optional[str]
+    status: ImportStatus
+    processed_rows: int
+    imported_rows: int
+    failed_rows: int
+    errors: List[Dict[str, Any]]
+    error_message: Optional[str]
+    created_at: datetime
+    finished_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
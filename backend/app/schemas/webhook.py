@@ -0,0 +1,62 @@
+"""Outbound webhook schemas."""
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from datetime import datetime
+from typing import List, Optional
+
+from app.models.webhook import WebhookEvent, DeliveryStatus
+
+
+class WebhookSubscriptionCreate(BaseModel):
+    """Schema for subscribing an endpoint to events."""
+
+    url: str = Field(..., max_length=2000, pattern=r"^https?://")
+    events: List[WebhookEvent] = Field(..., min_length=1)
+    max_concurrency: Optional[int] = Field(None, ge=1, le=32)
+    digest_window_seconds: Optional[int] = Field(None, ge=1, le=3600)
+    digest_max_events: Optional[int] = Field(None, ge=1, le=1000)
+
+    @field_validator("events")
+    @classmethod
+    def validate_events(cls, events: List[WebhookEvent]) -> List[WebhookEvent]:
+        """Reject the digest pseudo-event."""
+        if WebhookEvent.DIGEST in events:
+            raise ValueError("Digests are configured with digest_window_seconds")
+        return events
+
+
+class WebhookSubscriptionResponse(BaseModel):
+    """Schema for a subscription (the secret is never returned)."""
+
+    id: int
+    url: str
+    events: List[WebhookEvent]
+    max_concurrency: Optional[int]
+    digest_window_seconds: Optional[int]
+    digest_max_events: Optional[int]
+    is_active: bool
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WebhookSubscriptionCreated(WebhookSubscriptionResponse):
+    """Schema for a new subscription or rotated secret, the only time the secret is returned."""
+
+    secret: str
+
+
+class WebhookDeliveryResponse(BaseModel):
+    """Schema for a queued, delivered or dead-lettered delivery."""
+
+    id: int
+    subscription_id: int
+    event: WebhookEvent
+    status: DeliveryStatus
+    attempts: int
+    next_attempt_at: datetime
+    last_status_code: Optional[int]
+    last_error: Optional[str]
+    created_at: datetime
+    delivered_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,144 @@
+"""
+Batch ingestion service for activities from telephony and mail integrations.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Sequence, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.models.deal import Deal
+from app.models.activity import Activity
+from app.models.outbox import OutboxEventType
+from app.schemas.activity import ActivityBatchItem, ActivityBatchItemResult
+from app.services.activity_counters import record_activities
+from app.services.outbox import append_events, outbox_event
+from app.services.health_scoring import to_naive_utc
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ActivityBatchService:
+    """Service for writing many activities across many deals at once."""
+
+    @staticmethod
+    def validate_items(
+        rows: Sequence[Dict[str, Any]],
+    ) -> Tuple[List[Tuple[int, ActivityBatchItem]], List[ActivityBatchItemResult]]:
+        """
+        Validate raw rows against ActivityBatchItem.
+
+        Args:
+            rows: Raw activity payloads
+
+        Returns:
+            Tuple of (valid (index, item) pairs, rejected item results)
+        """
+        valid: List[Tuple[int, ActivityBatchItem]] = []
+        rejected: List[ActivityBatchItemResult] = []
+
+        for index, row in enumerate(rows):
+            try:
+                valid.append((index, ActivityBatchItem.model_validate(row)))
+            except ValidationError as e:
+                rejected.append(
+                    ActivityBatchItemResult(
+                        index=index,
+                        errors=e.errors(include_url=False, include_context=False),
+                    )
+                )
+
+        return valid, rejected
+
+    @staticmethod
+    def ingest(
+        db: Session,
+        tenant_id: int,
+        user_id: int,
+        items: Sequence[Tuple[int, ActivityBatchItem]],
+    ) -> List[ActivityBatchItemResult]:
+        """
+        Insert validated activities and advance the deals' last contact.
+
+        Checks deal ownership with one query, inserts all activities (and
+        their outbox events) with one multi-row INSERT each and updates
+        each deal once: counters, change sequence and ``last_contact_at``,
+        which moves to the newest activity timestamp (never backwards, and
+        keeping ``updated_at``: a contact is not an edit of the deal).
+        The caller commits.
+
+        Args:
+            db: Database session
+            tenant_id: Tenant ID the deals must belong to
+            user_id: User ID recorded on the activities
+            items: Validated (index, item) pairs
+
+        Returns:
+            Per-item results (created ID or error)
+        """
+        if not items:
+            return []
+
+        deal_ids = {item.deal_id for _, item in items}
+        owned = set(
+            db.scalars(
+                select(Deal.id).where(Deal.tenant_id == tenant_id, Deal.id.in_(deal_ids))
+            ).all()
+        )
+
+        now = datetime.utcnow()
+        results: List[ActivityBatchItemResult] = []
+        accepted: List[Tuple[int, Dict[str, Any]]] = []
+
+        for index, item in items:
+            if item.deal_id not in owned:
+                results.append(
+                    ActivityBatchItemResult(
+                        index=index,
+                        errors=[{"type": "not_found", "loc": ["deal_id"], "msg": "Deal not found"}],
+                    )
+                )
+                continue
+
+            created_at = to_naive_utc(item.created_at) if item.created_at else now
+            accepted.append((index, {"tenant_id": tenant_id, "user_id": user_id, **item.model_dump(), "created_at": created_at}))
+
+        if accepted:
+            activity_ids = db.scalars(
+                insert(Activity).returning(Activity.id, sort_by_parameter_order=True),
+                [row for _, row in accepted],
+            ).all()
+            results.extend(
+                ActivityBatchItemResult(index=index, id=activity_id)
+                for (index, _), activity_id in zip(accepted, activity_ids)
+            )
+            append_events(
+                db,
+                [
+                    outbox_event(
+                        tenant_id,
+                        OutboxEventType.ACTIVITY_CREATED,
+                        activity_id,
+                        deal_id=row["deal_id"],
+                        activity_type=row["activity_type"].value,
+                    )
+                    for (_, row), activity_id in zip(accepted, activity_ids)
+                ],
+            )
+
+            # Last, as it locks the tenant row for the change sequence
+            record_activities(
+                db,
+                [(row["deal_id"], row["activity_type"], row["created_at"]) for _, row in accepted],
+                tenant_id,
+                contact=True,
+            )
+
+        deal_count = len({row["deal_id"] for _, row in accepted})
+        logger.info(
+            f"Ingested {len(accepted)} activities across {deal_count} deals "
+            f"for tenant {tenant_id}"
+        )
+        return results
@@ -0,0 +1,188 @@
+"""
+Denormalized activity counters on deals.
+
+Every activity write updates the deal's total and per-type counters and
+its last activity type/time in the same transaction, so deal lists can
+show them without reading the activities table. Counters are incremented
+in SQL (``count = count + n``), which keeps concurrent writers correct.
+Activity writes stamp the deals' change sequence (and, for batches, their
+last contact) in the same UPDATE, so each deal row is written once.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import DateTime, Update, bindparam, case, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.deal import Deal, ACTIVITY_COUNT_COLUMNS
+from app.models.activity import Activity, ActivityType
+from app.services.change_feed import next_change_seqs
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# (deal_id, activity_type, created_at or None for now)
+ActivityEvent = Tuple[int, ActivityType, Optional[datetime]]
+
+
+def initial_counters(activity_type: ActivityType, created_at: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Get the counter values of a new deal created with one activity.
+
+    Args:
+        activity_type: Type of the deal's first activity
+        created_at: Time of the activity (defaults to now)
+
+    Returns:
+        Deal column values
+    """
+    return {
+        "activity_count": 1,
+        ACTIVITY_COUNT_COLUMNS[activity_type]: 1,
+        "last_activity_type": activity_type,
+        "last_activity_at": created_at or datetime.utcnow(),
+    }
+
+
+def record_activities(
+    db: Session,
+    events: Iterable[ActivityEvent],
+    tenant_id: Optional[int] = None,
+    contact: bool = False,
+) -> None:
+    """
+    Add written activities to their deals' counters.
+
+    Aggregates the events per deal and issues one executemany UPDATE per
+    combination of activity types. ``last_activity_*`` only moves forward
+    and ``updated_at`` is left untouched. The caller commits.
+
+    Args:
+        db: Database session (the one that wrote the activities)
+        events: (deal_id, activity_type, created_at) per written activity
+        tenant_id: Tenant owning the deals, to stamp them with its next
+            change sequence values in the same UPDATE. This locks the
+            tenant row, so call it last before committing. Leave unset
+            when the caller stamps the deals itself.
+        contact: Also move ``last_contact_at`` forward to the newest
+            activity
+    """
+    now = datetime.utcnow()
+    per_deal: Dict[int, Dict[str, Any]] = {}
+
+    for deal_id, activity_type, created_at in events:
+        created_at = created_at or now
+        entry = per_deal.setdefault(
+            deal_id,
+            {"counts": {}, "last_at": created_at, "last_type": activity_type},
+        )
+        column = ACTIVITY_COUNT_COLUMNS[activity_type]
+        entry["counts"][column] = entry["counts"].get(column, 0) + 1
+        if created_at >= entry["last_at"]:
+            entry["last_at"] = created_at
+            entry["last_type"] = activity_type
+
+    if not per_deal:
+        return
+
+    # Values in deal ID order, like every other multi-deal write
+    change_seqs: Dict[int, int] = {}
+    if tenant_id is not None:
+        first = next_change_seqs(db, tenant_id, len(per_deal))
+        change_seqs = {deal_id: first + offset for offset, deal_id in enumerate(sorted(per_deal))}
+
+    batches: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for deal_id, entry in per_deal.items():
+        counts = entry["counts"]
+        row = {
+            "deal_id": deal_id,
+            "total": sum(counts.values()),
+            "last_at": entry["last_at"],
+            "last_type": entry["last_type"],
+            **{f"n_{column}": count for column, count in counts.items()},
+        }
+        if change_seqs:
+            row["n_change_seq"] = change_seqs[deal_id]
+        batches.setdefault(tuple(sorted(counts)), []).append(row)
+
+    for columns, rows in batches.items():
+        db.execute(_counter_update(columns, bool(change_seqs), contact), rows)
+
+
+def _counter_update(columns: Tuple[str, ...], stamp: bool = False, contact: bool = False) -> Update:
+    """Build the counter UPDATE for a set of per-type counter columns."""
+    deals = Deal.__table__
+    last_at = bindparam("last_at", type_=DateTime(timezone=True))
+    is_newer = or_(deals.c.last_activity_at.is_(None), deals.c.last_activity_at <= last_at)
+
+    values: Dict[str, Any] = {
+        "activity_count": deals.c.activity_count + bindparam("total"),
+        "last_activity_at": case((is_newer, last_at), else_=deals.c.last_activity_at),
+        "last_activity_type": case(
+            (is_newer, bindparam("last_type", type_=deals.c.last_activity_type.type)),
+            else_=deals.c.last_activity_type,
+        ),
+        "updated_at": deals.c.updated_at,
+        **{column: deals.c[column] + bindparam(f"n_{column}") for column in columns},
+    }
+    if stamp:
+        values["change_seq"] = bindparam("n_change_seq")
+    if contact:
+        is_later_contact = or_(deals.c.last_contact_at.is_(None), deals.c.last_contact_at < last_at)
+        values["last_contact_at"] = case((is_later_contact, last_at), else_=deals.c.last_contact_at)
+
+    return update(deals).where(deals.c.id == bindparam("deal_id")).values(**values)
+
+
+def recount_activities(db: Session, deal_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute counters from the activities table.
+
+    Used to backfill existing deals and after activities are moved or
+    removed in bulk. The caller commits.
+
+    Args:
+        db: Database session
+        deal_ids: Deals to recount (all deals if None)
+
+    Returns:
+        Number of deals updated
+    """
+    query = select(Deal.id)
+    if deal_ids is not None:
+        query = query.where(Deal.id.in_(list(deal_ids)))
+    ids = db.scalars(query).all()
+    if not ids:
+        return 0
+
+    rows = {
+        deal_id: {
+            "id": deal_id,
+            "activity_count": 0,
+            **{column: 0 for column in ACTIVITY_COUNT_COLUMNS.values()},
+            "last_activity_type": None,
+            "last_activity_at": None,
+        }
+        for deal_id in ids
+    }
+
+    for deal_id, activity_type, count, last_at in db.execute(
+        select(
+            Activity.deal_id,
+            Activity.activity_type,
+            func.count(),
+            func.max(Activity.created_at),
+        )
+        .where(Activity.deal_id.in_(ids))
+        .group_by(Activity.deal_id, Activity.activity_type)
+    ):
+        row = rows[deal_id]
+        row[ACTIVITY_COUNT_COLUMNS[activity_type]] = count
+        row["activity_count"] += count
+        if row["last_activity_at"] is None or last_at > row["last_activity_at"]:
+            row["last_activity_at"] = last_at
+            row["last_activity_type"] = activity_type
+
+    db.execute(update(Deal), list(rows.values()))
+    logger.info(f"Recounted activities for {len(rows)} deals")
+    return len(rows)
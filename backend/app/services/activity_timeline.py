@@ -0,0 +1,124 @@
+"""
+Activity timeline queries with keyset pagination.
+"""
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import Select, select, tuple_
+
+from app.models.activity import Activity, ActivityType
+from app.services.cursor import InvalidCursorError, decode_cursor, encode_cursor
+
+
+class ActivityTimelineService:
+    """Service for paging through activities, newest first."""
+
+    @staticmethod
+    def timeline_query(
+        deal_id: int,
+        activity_type: Optional[ActivityType] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Select:
+        """
+        Build the query for one page of a deal's timeline.
+
+        Orders by (created_at, id) descending so a page is a bounded range
+        scan on the (deal_id, created_at, id) index. Continues after the
+        cursor position instead of using OFFSET.
+
+        Args:
+            deal_id: Deal ID
+            activity_type: Only include activities of this type
+            cursor: Cursor of the last activity already shown (None for the start)
+            limit: Number of activities to return
+
+        Returns:
+            SELECT yielding Activity entities
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        query = select(Activity).where(Activity.deal_id == deal_id)
+
+        if activity_type:
+            query = query.where(Activity.activity_type == activity_type)
+
+        return ActivityTimelineService.paginate(query, cursor, limit)
+
+    @staticmethod
+    def feed_query(
+        tenant_id: int,
+        user_id: Optional[int] = None,
+        activity_type: Optional[ActivityType] = None,
+        since: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Select:
+        """
+        Build the query for one page of the tenant-wide activity feed.
+
+        Filters on the denormalized ``Activity.tenant_id``, so a page is one
+        range scan on the (tenant_id[, user_id], created_at, id) indexes
+        instead of a query per deal.
+
+        Args:
+            tenant_id: Tenant ID
+            user_id: Only include activities logged by this user
+            activity_type: Only include activities of this type
+            since: Only include activities created at or after this time
+            cursor: Cursor of the last activity already shown (None for the start)
+            limit: Number of activities to return
+
+        Returns:
+            SELECT yielding Activity entities
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        query = select(Activity).where(Activity.tenant_id == tenant_id)
+
+        if user_id is not None:
+            query = query.where(Activity.user_id == user_id)
+        if activity_type:
+            query = query.where(Activity.activity_type == activity_type)
+        if since:
+            query = query.where(Activity.created_at >= since)
+
+        return ActivityTimelineService.paginate(query, cursor, limit)
+
+    @staticmethod
+    def paginate(query: Select, cursor: Optional[str], limit: int) -> Select:
+        """
+        Apply newest-first keyset pagination to an activity query.
+
+        Args:
+            query: SELECT over Activity
+            cursor: Cursor of the last activity already shown (None for the start)
+            limit: Number of activities to return
+
+        Returns:
+            Paginated SELECT
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        if cursor:
+            created_at, last_id = ActivityTimelineService.decode_cursor(cursor)
+            query = query.where(tuple_(Activity.created_at, Activity.id) < tuple_(created_at, last_id))
+
+        return query.order_by(Activity.created_at.desc(), Activity.id.desc()).limit(limit)
+
+    @staticmethod
+    def encode_cursor(activity: Activity) -> str:
+        """Encode the timeline position of an activity."""
+        return encode_cursor(activity.created_at, activity.id)
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """Decode a cursor into (created_at, activity id)."""
+        created_at, last_id = decode_cursor(cursor, 2)
+        try:
+            return datetime.fromisoformat(created_at), int(last_id)
+        except (ValueError, TypeError) as e:
+            raise InvalidCursorError(f"Invalid cursor: {e}")
@@ -1,6 +1,6 @@
 """AI service for next-action recommendations using Gemini."""
 import google.generativeai as genai
-from typing import List
+from typing import List, Sequence
 from datetime import datetime
 
 from app.core.config import settings
@@ -84,6 +84,25 @@ Gib nur die Handlungsempfehlungen zurück, keine zusätzlichen Erklärungen. For
             # Return fallback actions based on stage
             return self._get_fallback_actions(deal)
 
+    def generate_next_actions_for(self, deals: Sequence[Deal], max_ai_calls: int) -> List[List[str]]:
+        """
+        Generate next action recommendations for several deals.
+
+        Only the first ``max_ai_calls`` deals are sent to Gemini; the others
+        get the stage-based fallback actions.
+
+        Args:
+            deals: Deals to analyze
+            max_ai_calls: Maximum Gemini calls
+
+        Returns:
+            Recommended next actions per deal
+        """
+        return [
+            self.generate_next_actions(deal) if index < max_ai_calls else self._get_fallback_actions(deal)
+            for index, deal in enumerate(deals)
+        ]
+
     def _get_fallback_actions(self, deal: Deal) -> List[str]:
         """Get fallback actions if AI fails."""
         fallback_actions = {
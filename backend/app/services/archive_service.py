@@ -0,0 +1,216 @@
+"""
+Archiving of old closed deals into cold storage.
+
+Closed-won/lost deals that have not changed for a configurable number of
+days are moved, with all their activities, out of the ``deals`` and
+``activities`` tables into ``archived_deals`` rows holding a compressed
+JSON document. The hot tables and their indexes only keep live data;
+archived deals stay readable through the deal and timeline endpoints.
+"""
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import Select, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.archive import ArchivedDeal
+from app.models.deal import Deal, DealStage
+from app.models.activity import Activity, ActivityType
+from app.schemas.activity import ActivityResponse
+from app.services.serialization import deal_to_dict, dumps
+from app.services.activity_timeline import ActivityTimelineService
+from app.services.change_feed import record_tombstones
+from app.services.cursor import encode_cursor
+from app.services.health_scoring import to_naive_utc
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED_STAGES = (DealStage.CLOSED_WON, DealStage.CLOSED_LOST)
+
+# Activity attributes stored in the archive (ActivityResponse fields)
+ARCHIVED_ACTIVITY_FIELDS = tuple(ActivityResponse.model_fields)
+
+
+def encode_payload(deal: Deal, activities: List[Activity]) -> bytes:
+    """
+    Serialize a deal and its activities into a compressed archive document.
+
+    Args:
+        deal: Deal to archive
+        activities: The deal's activities, newest first
+
+    Returns:
+        zlib-compressed JSON bytes
+    """
+    deal_data = deal_to_dict(deal)
+    deal_data.pop("next_actions")
+    document = {
+        "deal": deal_data,
+        "activities": [
+            {field: getattr(activity, field) for field in ARCHIVED_ACTIVITY_FIELDS}
+            for activity in activities
+        ],
+    }
+    return zlib.compress(dumps(document), 6)
+
+
+def decode_payload(payload: bytes) -> Dict[str, Any]:
+    """Decompress and parse an archive document."""
+    return orjson.loads(zlib.decompress(payload))
+
+
+class ArchiveService:
+    """Service for moving closed deals to the archive and reading them back."""
+
+    @staticmethod
+    def archive_closed_deals(
+        db: Session,
+        older_than_days: int,
+        batch_size: int = 200,
+        tenant_id: Optional[int] = None,
+    ) -> int:
+        """
+        Move closed deals untouched for ``older_than_days`` to the archive.
+
+        Works in batches; each batch loads the deals and their activities,
+        writes the archive rows with one multi-row INSERT, deletes the
+        activities and deals with one DELETE each, and commits.
+
+        Candidate deals are locked until the commit; deals locked by a
+        concurrent write are skipped. An edit or new activity arriving
+        meanwhile waits and then fails on the deleted deal instead of being
+        deleted without reaching the archive.
+
+        Args:
+            db: Database session
+            older_than_days: Minimum days since the deal was last updated
+            batch_size: Deals moved per transaction
+            tenant_id: Restrict archiving to one tenant (all tenants if None)
+
+        Returns:
+            Number of archived deals
+        """
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        query = (
+            select(Deal)
+            .where(Deal.stage.in_(CLOSED_STAGES), Deal.updated_at < cutoff)
+            .order_by(Deal.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        if tenant_id is not None:
+            query = query.where(Deal.tenant_id == tenant_id)
+
+        archived = 0
+        while True:
+            deals = db.scalars(query).all()
+            if not deals:
+                break
+
+            deal_ids = [deal.id for deal in deals]
+            activities: Dict[int, List[Activity]] = {deal_id: [] for deal_id in deal_ids}
+            for activity in db.scalars(
+                select(Activity)
+                .where(Activity.deal_id.in_(deal_ids))
+                .order_by(Activity.created_at.desc(), Activity.id.desc())
+            ):
+                activities[activity.deal_id].append(activity)
+
+            db.execute(
+                insert(ArchivedDeal),
+                [
+                    {
+                        "tenant_id": deal.tenant_id,
+                        "deal_id": deal.id,
+                        "title": deal.title,
+                        "company_name": deal.company_name,
+                        "value": deal.value,
+                        "stage": deal.stage,
+                        "activity_count": len(activities[deal.id]),
+                        "closed_at": deal.updated_at,
+                        "payload": encode_payload(deal, activities[deal.id]),
+                    }
+                    for deal in deals
+                ],
+            )
+            db.execute(delete(Activity).where(Activity.deal_id.in_(deal_ids)))
+            db.execute(delete(Deal).where(Deal.id.in_(deal_ids)))
+
+            by_tenant: Dict[int, List[int]] = {}
+            for deal in deals:
+                by_tenant.setdefault(deal.tenant_id, []).append(deal.id)
+            for owner_id in sorted(by_tenant):
+                record_tombstones(db, owner_id, by_tenant[owner_id], "archived")
+            db.commit()
+            db.expunge_all()
+
+            archived += len(deal_ids)
+            logger.info(f"Archived {len(deal_ids)} closed deals ({archived} so far)")
+
+        return archived
+
+    @staticmethod
+    def archived_deal_query(tenant_id: int, deal_id: int) -> Select:
+        """Build the query loading the payload of an archived deal."""
+        return select(ArchivedDeal.payload).where(
+            ArchivedDeal.tenant_id == tenant_id, ArchivedDeal.deal_id == deal_id
+        )
+
+    @staticmethod
+    def list_query(tenant_id: int, skip: int, limit: int) -> Select:
+        """Build the archived deal listing query, most recently closed first."""
+        return (
+            select(ArchivedDeal)
+            .where(ArchivedDeal.tenant_id == tenant_id)
+            .order_by(ArchivedDeal.closed_at.desc(), ArchivedDeal.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+
+    @staticmethod
+    def count_query(tenant_id: int) -> Select:
+        """Build the archived deal count query."""
+        return select(func.count(ArchivedDeal.id)).where(ArchivedDeal.tenant_id == tenant_id)
+
+    @staticmethod
+    def page_activities(
+        activities: List[Dict[str, Any]],
+        activity_type: Optional[ActivityType] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Page through archived activities like a live timeline.
+
+        Args:
+            activities: Archived activities, newest first
+            activity_type: Only include activities of this type
+            cursor: Timeline cursor of the last activity already shown
+            limit: Number of activities to return
+
+        Returns:
+            Tuple of (page of activities, next cursor or None)
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        if activity_type:
+            activities = [a for a in activities if a["activity_type"] == activity_type.value]
+
+        if cursor:
+            created_at, last_id = ActivityTimelineService.decode_cursor(cursor)
+            position = (to_naive_utc(created_at), last_id)
+            activities = [
+                a for a in activities
+                if (to_naive_utc(datetime.fromisoformat(a["created_at"])), a["id"]) < position
+            ]
+
+        page = activities[:limit]
+        next_cursor = None
+        if len(activities) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor(datetime.fromisoformat(last["created_at"]), last["id"])
+        return page, next_cursor
@@ -0,0 +1,166 @@
+"""
+Pipeline board queries: per-stage aggregates and top-N deals.
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy.orm import aliased
+
+from app.models.deal import Deal, DealStage
+from app.schemas.deal import DealFilterParams
+from app.services.deal_query import DealQueryPlanner
+from app.services.cursor import InvalidCursorError, decode_cursor, encode_cursor
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Non-null columns the board can be ordered by (keyset cursors need them)
+BOARD_SORT_COLUMNS = {
+    "value": Deal.value,
+    "updated_at": Deal.updated_at,
+    "created_at": Deal.created_at,
+}
+
+
+class BoardService:
+    """Service for building the pipeline board."""
+
+    def __init__(self, tenant_id: int, filters: Optional[DealFilterParams] = None):
+        """
+        Initialize the board query builder.
+
+        Args:
+            tenant_id: Tenant ID every query is scoped to
+            filters: Deal filters; the sort must be a single board sort key
+
+        Raises:
+            ValueError: If the sort is not supported on the board
+        """
+        self.planner = DealQueryPlanner(tenant_id, filters)
+        sort = self.planner.filters.sort
+        key = sort.lstrip("-")
+        if "," in sort or key not in BOARD_SORT_COLUMNS:
+            raise ValueError(
+                f"Board sort must be one of: {', '.join(BOARD_SORT_COLUMNS)} (optionally with '-')"
+            )
+        self.sort_key = key
+        self.descending = sort.startswith("-")
+        self.sort_column = BOARD_SORT_COLUMNS[key]
+
+    def stages(self) -> List[DealStage]:
+        """Get the stages shown as columns (filtered stages or all)."""
+        filters = self.planner.filters
+        selected = set(filters.stages or [])
+        if filters.stage:
+            selected.add(filters.stage)
+        return [stage for stage in DealStage if not selected or stage in selected]
+
+    def _ordering(self) -> List:
+        """Ordering within a column, with id as tiebreaker."""
+        if self.descending:
+            return [self.sort_column.desc(), Deal.id.desc()]
+        return [self.sort_column.asc(), Deal.id.asc()]
+
+    def board_query(self, per_stage: int) -> Select:
+        """
+        Build the board query.
+
+        Ranks deals within each stage with ROW_NUMBER() and computes
+        per-stage counts and value sums with window aggregates, so the whole
+        board comes back from one statement.
+
+        Args:
+            per_stage: Number of deals returned per stage
+
+        Returns:
+            SELECT yielding (Deal, stage_count, stage_value) rows, ordered by
+            stage and rank
+        """
+        ranked = (
+            select(
+                Deal,
+                func.row_number()
+                .over(partition_by=Deal.stage, order_by=self._ordering())
+                .label("stage_rank"),
+                func.count().over(partition_by=Deal.stage).label("stage_count"),
+                func.sum(Deal.value).over(partition_by=Deal.stage).label("stage_value"),
+            )
+            .where(*self.planner.where_clauses())
+            .subquery("ranked")
+        )
+        ranked_deal = aliased(Deal, ranked)
+        return (
+            select(ranked_deal, ranked.c.stage_count, ranked.c.stage_value)
+            .where(ranked.c.stage_rank <= per_stage)
+            .order_by(ranked.c.stage, ranked.c.stage_rank)
+        )
+
+    def column_totals_query(self, stage: DealStage) -> Select:
+        """
+        Build the count and value sum query for one stage column.
+
+        Args:
+            stage: Stage of the column
+
+        Returns:
+            SELECT yielding one (count, value sum) row
+        """
+        return select(func.count(Deal.id), func.sum(Deal.value)).where(
+            *self.planner.where_clauses(), Deal.stage == stage
+        )
+
+    def column_query(self, stage: DealStage, cursor: Optional[str], limit: int) -> Select:
+        """
+        Build the keyset page query for one stage column.
+
+        Args:
+            stage: Stage of the column
+            cursor: Cursor of the last deal already shown (None for the start)
+            limit: Number of deals to return
+
+        Returns:
+            SELECT yielding Deal entities
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        query = select(Deal).where(*self.planner.where_clauses(), Deal.stage == stage)
+
+        if cursor:
+            value, last_id = self.decode_cursor(cursor)
+            if self.descending:
+                query = query.where(
+                    or_(
+                        self.sort_column < value,
+                        and_(self.sort_column == value, Deal.id < last_id),
+                    )
+                )
+            else:
+                query = query.where(
+                    or_(
+                        self.sort_column > value,
+                        and_(self.sort_column == value, Deal.id > last_id),
+                    )
+                )
+
+        return query.order_by(*self._ordering()).limit(limit)
+
+    def encode_cursor(self, deal: Deal) -> str:
+        """Encode the position of a deal within its column."""
+        return encode_cursor(self.sort_key, getattr(deal, self.sort_key), deal.id)
+
+    def decode_cursor(self, cursor: str) -> Tuple[Any, int]:
+        """Decode a cursor into (sort value, deal id)."""
+        key, value, last_id = decode_cursor(cursor, 3)
+        if key != self.sort_key:
+            raise InvalidCursorError("Invalid cursor: created for a different sort")
+        try:
+            if key == "value":
+                value = Decimal(value)
+            else:
+                value = datetime.fromisoformat(value)
+            return value, int(last_id)
+        except (ArithmeticError, ValueError, TypeError) as e:
+            raise InvalidCursorError(f"Invalid cursor: {e}")
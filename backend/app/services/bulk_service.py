@@ -0,0 +1,251 @@
+"""
+Set-based bulk write service for deals.
+"""
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Sequence, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.deal import Deal
+from app.models.activity import Activity, ActivityType
+from app.schemas.deal import DealCreate, BulkDealUpdate, BulkItemError
+from app.models.outbox import OutboxEventType
+from app.services.activity_counters import initial_counters, record_activities
+from app.services.outbox import append_events, deal_change_events, outbox_event
+from app.services.change_feed import next_change_seqs
+from app.services.health_scoring import (
+    calculate_deal_health_score,
+    calculate_health_scores,
+    now_utc,
+)
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Deal attributes read by the health score calculation
+DEAL_SCORE_FIELDS = ("id", "stage", "last_contact_at", "expected_close_date", "created_at")
+
+# Columns an explicit null in an update must not overwrite
+NON_NULLABLE_FIELDS = {"title", "company_name", "value", "stage"}
+
+
+class BulkDealService:
+    """Service for high-throughput deal writes."""
+
+    @staticmethod
+    def validate_create_rows(
+        rows: Sequence[Dict[str, Any]], offset: int = 0
+    ) -> Tuple[List[Tuple[int, DealCreate]], List[BulkItemError]]:
+        """
+        Validate raw rows against DealCreate.
+
+        Args:
+            rows: Raw deal payloads
+            offset: Index of the first row (for error reporting)
+
+        Returns:
+            Tuple of (valid (index, deal) pairs, per-row errors)
+        """
+        valid: List[Tuple[int, DealCreate]] = []
+        errors: List[BulkItemError] = []
+
+        for index, row in enumerate(rows, start=offset):
+            try:
+                valid.append((index, DealCreate.model_validate(row)))
+            except ValidationError as e:
+                errors.append(
+                    BulkItemError(
+                        index=index,
+                        errors=e.errors(include_url=False, include_context=False),
+                    )
+                )
+
+        return valid, errors
+
+    @staticmethod
+    def insert_deals(
+        db: Session,
+        tenant_id: int,
+        user_id: int,
+        deals_data: Sequence[DealCreate],
+        activity_description: str = "Deal '{title}' wurde per Bulk-Import angelegt",
+    ) -> List[Deal]:
+        """
+        Insert many deals and their creation activities.
+
+        Issues one multi-row INSERT ... RETURNING for the deals and one
+        multi-row INSERT each for the SYSTEM activities and the
+        ``deal.created`` outbox events. Health scores are
+        calculated in batch before the insert. The caller commits.
+
+        Args:
+            db: Database session
+            tenant_id: Tenant ID owning the deals
+            user_id: User ID recorded on the activities
+            deals_data: Validated deal payloads
+            activity_description: Activity description template ({title})
+
+        Returns:
+            Inserted deals with server-generated columns populated
+        """
+        if not deals_data:
+            return []
+
+        rows = [
+            {"tenant_id": tenant_id, **deal_data.model_dump(), **initial_counters(ActivityType.SYSTEM)}
+            for deal_data in deals_data
+        ]
+
+        # Score transient deals in batch (no ids or timestamps yet)
+        scores = calculate_health_scores(Deal(**row) for row in rows)
+        first_seq = next_change_seqs(db, tenant_id, len(rows))
+        for offset, (row, score) in enumerate(zip(rows, scores)):
+            row["health_score"] = score
+            row["change_seq"] = first_seq + offset
+
+        deals = db.scalars(
+            insert(Deal).returning(Deal, sort_by_parameter_order=True),
+            rows,
+        ).all()
+
+        db.execute(
+            insert(Activity),
+            [
+                {
+                    "tenant_id": tenant_id,
+                    "deal_id": deal.id,
+                    "user_id": user_id,
+                    "activity_type": ActivityType.SYSTEM,
+                    "title": "Deal erstellt",
+                    "description": activity_description.format(title=deal.title),
+                }
+                for deal in deals
+            ],
+        )
+        append_events(
+            db,
+            [
+                outbox_event(tenant_id, OutboxEventType.DEAL_CREATED, deal.id, stage=deal.stage.value)
+                for deal in deals
+            ],
+        )
+
+        logger.info(f"Inserted {len(deals)} deals for tenant {tenant_id}")
+        return list(deals)
+
+    @staticmethod
+    def update_deals(
+        db: Session,
+        tenant_id: int,
+        user_id: int,
+        updates: Sequence[BulkDealUpdate],
+    ) -> List[int]:
+        """
+        Apply many deal updates with batched writes.
+
+        Target deals are fetched with one IN query, changes are written
+        with UPDATE-by-primary-key executemany batches (rows grouped by
+        their set of changed columns); stage-change activities and outbox
+        events are inserted with one multi-row INSERT each. The caller
+        commits.
+
+        Args:
+            db: Database session
+            tenant_id: Tenant ID owning the deals
+            user_id: User ID recorded on the activities
+            updates: Validated updates (later items win for repeated ids)
+
+        Returns:
+            IDs of the updated deals, in request order
+        """
+        changes_by_id: Dict[int, Dict[str, Any]] = {}
+        for item in updates:
+            changes = {
+                field: value
+                for field, value in item.model_dump(exclude_unset=True, exclude={"id"}).items()
+                if value is not None or field not in NON_NULLABLE_FIELDS
+            }
+            changes_by_id.setdefault(item.id, {}).update(changes)
+
+        deals = {
+            deal.id: deal
+            for deal in db.scalars(
+                select(Deal).where(
+                    Deal.id.in_(list(changes_by_id)), Deal.tenant_id == tenant_id
+                )
+            )
+        }
+
+        missing = [deal_id for deal_id in changes_by_id if deal_id not in deals]
+        if missing:
+            logger.warning(f"Deals {missing} not found for tenant {tenant_id}, skipping")
+
+        now = datetime.utcnow()
+        score_now = now_utc()
+        rows: List[Dict[str, Any]] = []
+        activities: List[Dict[str, Any]] = []
+        events: List[Dict[str, Any]] = []
+
+        for deal_id, changes in changes_by_id.items():
+            deal = deals.get(deal_id)
+            if deal is None:
+                continue
+
+            # Score the merged state without mutating the loaded instance
+            state = {column: getattr(deal, column) for column in DEAL_SCORE_FIELDS}
+            state.update(changes)
+            state["last_contact_at"] = now
+            health_score = calculate_deal_health_score(SimpleNamespace(**state), score_now)
+
+            rows.append({"id": deal_id, **changes, "last_contact_at": now, "health_score": health_score})
+            events.extend(
+                deal_change_events(
+                    tenant_id,
+                    deal_id,
+                    changes,
+                    state["stage"],
+                    health_score,
+                    deal.stage,
+                    deal.health_score,
+                )
+            )
+
+            new_stage = changes.get("stage")
+            if new_stage is not None and new_stage != deal.stage:
+                activities.append(
+                    {
+                        "tenant_id": tenant_id,
+                        "deal_id": deal_id,
+                        "user_id": user_id,
+                        "activity_type": ActivityType.STAGE_CHANGE,
+                        "title": "Stage geändert (Bulk)",
+                        "description": (
+                            f"Stage von '{deal.stage.value}' zu '{new_stage.value}' geändert"
+                        ),
+                    }
+                )
+
+        if rows:
+            first_seq = next_change_seqs(db, tenant_id, len(rows))
+            for offset, row in enumerate(rows):
+                row["change_seq"] = first_seq + offset
+
+            # Group rows with the same changed columns into one executemany batch
+            rows.sort(key=lambda row: tuple(sorted(row)))
+            db.execute(update(Deal), rows)
+
+        if activities:
+            db.execute(insert(Activity), activities)
+            record_activities(
+                db, [(row["deal_id"], ActivityType.STAGE_CHANGE, None) for row in activities]
+            )
+
+        append_events(db, events)
+
+        logger.info(
+            f"Updated {len(rows)} deals with {len(activities)} stage changes for tenant {tenant_id}"
+        )
+        return [deal_id for deal_id in changes_by_id if deal_id in deals]
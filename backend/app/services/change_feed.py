@@ -0,0 +1,179 @@
+"""
+Per-tenant change sequence and the deal change feed.
+
+Every deal write stamps the deal with the next value of its tenant's change
+sequence (``tenants.change_seq``). Deletes and archiving leave a tombstone
+carrying a sequence value instead. Values are taken with an
+``UPDATE ... RETURNING`` on the tenant row, so a tenant's writers commit in
+sequence order and a reader paging by sequence never misses a change that
+commits later with a lower value. Writers take values late in their
+transaction to keep that row lock short.
+
+Sync clients page through ``GET /api/deals/changes`` ordered by (sequence,
+deal ID) and resume from the returned cursor. A deal shows up once with its
+latest state, however often it changed since the cursor.
+"""
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import Select, String, insert, literal, select, tuple_, union_all, update
+from sqlalchemy.orm import Session
+
+from app.models.deal import Deal
+from app.models.tombstone import DealTombstone
+from app.models.user import Tenant
+from app.services.cursor import InvalidCursorError, decode_cursor, encode_cursor
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Session.info key of the last change sequence value taken per tenant
+WRITTEN_CHANGE_SEQS = "written_change_seqs"
+
+# Position before the first change (deals written before the feed existed have 0)
+FEED_START = (-1, 0)
+
+
+def next_change_seqs(db: Session, tenant_id: int, count: int = 1) -> int:
+    """
+    Reserve values of a tenant's change sequence.
+
+    Locks the tenant row until the caller's transaction ends. The last
+    value is kept in the session so replica reads can wait for it after
+    the commit (see ``app.db.replica``).
+
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        count: Number of values
+
+    Returns:
+        First reserved value (the values are consecutive)
+    """
+    last = db.execute(
+        update(Tenant)
+        .where(Tenant.id == tenant_id)
+        .values(change_seq=Tenant.change_seq + count)
+        .returning(Tenant.change_seq)
+    ).scalar_one()
+    db.info.setdefault(WRITTEN_CHANGE_SEQS, {})[tenant_id] = last
+    return last - count + 1
+
+
+def change_seqs_by_tenant(db: Session, deal_tenants: Dict[int, int]) -> Dict[int, int]:
+    """
+    Reserve one sequence value per deal for deals of several tenants.
+
+    Args:
+        db: Database session
+        deal_tenants: Tenant ID per changed deal ID
+
+    Returns:
+        Sequence value per deal ID
+    """
+    by_tenant: Dict[int, List[int]] = defaultdict(list)
+    for deal_id, tenant_id in deal_tenants.items():
+        by_tenant[tenant_id].append(deal_id)
+
+    seqs: Dict[int, int] = {}
+    # Fixed tenant order, so concurrent writers lock tenant rows in the same order
+    for tenant_id in sorted(by_tenant):
+        deal_ids = sorted(by_tenant[tenant_id])
+        first = next_change_seqs(db, tenant_id, len(deal_ids))
+        seqs.update((deal_id, first + offset) for offset, deal_id in enumerate(deal_ids))
+    return seqs
+
+
+def record_tombstones(
+    db: Session, tenant_id: int, deal_ids: Sequence[int], reason: str = "deleted"
+) -> None:
+    """
+    Record removed deals in the change feed.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant ID owning the deals
+        deal_ids: Removed deal IDs
+        reason: "deleted" or "archived"
+    """
+    if not deal_ids:
+        return
+
+    first = next_change_seqs(db, tenant_id, len(deal_ids))
+    db.execute(
+        insert(DealTombstone),
+        [
+            {"tenant_id": tenant_id, "deal_id": deal_id, "change_seq": first + offset, "reason": reason}
+            for offset, deal_id in enumerate(deal_ids)
+        ],
+    )
+
+
+class ChangeFeedService:
+    """Service for incremental deal sync."""
+
+    @staticmethod
+    def encode_cursor(change_seq: int, deal_id: int) -> str:
+        """Encode a feed position into a cursor."""
+        return encode_cursor(change_seq, deal_id)
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[int, int]:
+        """
+        Decode a feed cursor.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        change_seq, deal_id = decode_cursor(cursor, 2)
+        if not isinstance(change_seq, int) or not isinstance(deal_id, int):
+            raise InvalidCursorError("Invalid cursor: unexpected format")
+        return change_seq, deal_id
+
+    @staticmethod
+    def changes_query(tenant_id: int, after: Tuple[int, int], limit: int) -> Select:
+        """
+        Build the query for changes after a feed position.
+
+        Live deals and tombstones are read through their (tenant, sequence)
+        indexes, each limited, and merged in sequence order.
+
+        Args:
+            tenant_id: Tenant ID
+            after: (sequence, deal ID) of the last change already seen
+            limit: Maximum number of rows
+
+        Returns:
+            Query yielding (change_seq, deal_id, reason) with reason NULL
+            for live deals
+        """
+        position = tuple_(literal(after[0]), literal(after[1]))
+
+        live = (
+            select(
+                Deal.change_seq.label("change_seq"),
+                Deal.id.label("deal_id"),
+                literal(None, String).label("reason"),
+            )
+            .where(Deal.tenant_id == tenant_id, tuple_(Deal.change_seq, Deal.id) > position)
+            .order_by(Deal.change_seq, Deal.id)
+            .limit(limit)
+            .subquery()
+        )
+        removed = (
+            select(
+                DealTombstone.change_seq.label("change_seq"),
+                DealTombstone.deal_id.label("deal_id"),
+                DealTombstone.reason.label("reason"),
+            )
+            .where(
+                DealTombstone.tenant_id == tenant_id,
+                tuple_(DealTombstone.change_seq, DealTombstone.deal_id) > position,
+            )
+            .order_by(DealTombstone.change_seq, DealTombstone.deal_id)
+            .limit(limit)
+            .subquery()
+        )
+
+        changes = union_all(select(live), select(removed)).subquery()
+        return select(changes).order_by(changes.c.change_seq, changes.c.deal_id).limit(limit)
@@ -0,0 +1,209 @@
+"""
+Write-behind buffer for deal last-contact timestamps.
+
+Logging an activity used to write ``deals.last_contact_at`` (and bump
+``updated_at``) on every request, turning busy deals into row-lock
+hotspots. Activity writes now record the contact time here instead. The
+buffer keeps the newest pending timestamp per deal and a background task
+flushes all pending deals in one batched UPDATE per interval, rescoring
+their health once per flush.
+
+Reads merge pending timestamps into loaded deals, so responses of the
+same process stay consistent before the flush. Pending bumps of a process
+that dies before its next flush are lost (at most one interval).
+"""
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, Optional
+
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.deal import Deal
+from app.services.bulk_service import DEAL_SCORE_FIELDS
+from app.services.change_feed import change_seqs_by_tenant
+from app.services.health_scoring import calculate_health_scores, to_naive_utc
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ContactBuffer:
+    """Coalesces last-contact bumps per deal and flushes them in batches."""
+
+    def __init__(self):
+        """Initialize an empty buffer."""
+        self._pending: Dict[int, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def bump(self, deal_id: int, contacted_at: Optional[datetime] = None) -> None:
+        """
+        Record a contact with a deal.
+
+        Args:
+            deal_id: Deal ID
+            contacted_at: Contact time (defaults to now)
+        """
+        contacted_at = to_naive_utc(contacted_at) if contacted_at else datetime.utcnow()
+        current = self._pending.get(deal_id)
+        if current is None or contacted_at > current:
+            self._pending[deal_id] = contacted_at
+
+    def pending(self, deal_id: int) -> Optional[datetime]:
+        """Get the unflushed contact time of a deal."""
+        return self._pending.get(deal_id)
+
+    def discard(self, deal_id: int) -> None:
+        """Drop the pending bump of a deal whose row was written directly."""
+        self._pending.pop(deal_id, None)
+
+    def clear(self) -> None:
+        """Drop all pending bumps without writing them."""
+        self._pending.clear()
+
+    def merge(self, deals: Iterable[Deal]) -> None:
+        """
+        Apply pending contact times to loaded deals.
+
+        The value is set as committed state, so merging never marks the
+        deals dirty or causes a write on commit.
+
+        Args:
+            deals: Loaded deals
+        """
+        if not self._pending:
+            return
+
+        for deal in deals:
+            pending = self._pending.get(deal.id)
+            if pending is None:
+                continue
+            if deal.last_contact_at is None or to_naive_utc(deal.last_contact_at) < pending:
+                set_committed_value(deal, "last_contact_at", pending)
+
+    async def flush(self, session_factory: Callable[[], AsyncSession]) -> int:
+        """
+        Write all pending contact times.
+
+        Pending bumps are taken out of the buffer first; if the write fails
+        they are put back and retried on the next flush.
+
+        Args:
+            session_factory: Async session factory
+
+        Returns:
+            Number of deals written
+        """
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+
+        try:
+            async with session_factory() as db:
+                written = await db.run_sync(self.write_contacts, pending)
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Failed to flush {len(pending)} last-contact updates: {e}")
+            for deal_id, contacted_at in pending.items():
+                self.bump(deal_id, contacted_at)
+            return 0
+
+        logger.debug(f"Flushed last-contact updates for {written} deals")
+        return written
+
+    @staticmethod
+    def write_contacts(db: Session, pending: Dict[int, datetime]) -> int:
+        """
+        Write contact times and rescored health in one batched UPDATE.
+
+        Only moves ``last_contact_at`` forward and leaves ``updated_at``
+        untouched, since a logged contact is not an edit of the deal.
+
+        Args:
+            db: Database session
+            pending: Contact time per deal ID
+
+        Returns:
+            Number of deals in the batch
+        """
+        states = [
+            SimpleNamespace(**row._mapping)
+            for row in db.execute(
+                select(Deal.tenant_id, *(getattr(Deal, field) for field in DEAL_SCORE_FIELDS)).where(
+                    Deal.id.in_(list(pending))
+                )
+            )
+        ]
+        if not states:
+            return 0
+
+        for state in states:
+            if state.last_contact_at is None or to_naive_utc(state.last_contact_at) < pending[state.id]:
+                state.last_contact_at = pending[state.id]
+
+        scores = calculate_health_scores(states)
+        seqs = change_seqs_by_tenant(db, {state.id: state.tenant_id for state in states})
+
+        deals = Deal.__table__
+        db.execute(
+            update(deals)
+            .where(
+                deals.c.id == bindparam("deal_id"),
+                or_(
+                    deals.c.last_contact_at.is_(None),
+                    deals.c.last_contact_at < bindparam("contact_at"),
+                ),
+            )
+            .values(
+                last_contact_at=bindparam("contact_at"),
+                health_score=bindparam("score"),
+                change_seq=bindparam("n_change_seq"),
+                updated_at=deals.c.updated_at,
+            ),
+            [
+                {
+                    "deal_id": state.id,
+                    "contact_at": pending[state.id],
+                    "score": score,
+                    "n_change_seq": seqs[state.id],
+                }
+                for state, score in zip(states, scores)
+            ],
+        )
+        return len(states)
+
+    def start(self, session_factory: Callable[[], AsyncSession], interval: float) -> None:
+        """
+        Start the background flush loop.
+
+        Args:
+            session_factory: Async session factory
+            interval: Seconds between flushes
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(session_factory, interval))
+
+    async def stop(self, session_factory: Callable[[], AsyncSession]) -> None:
+        """Stop the flush loop and write what is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush(session_factory)
+
+    async def _run(self, session_factory: Callable[[], AsyncSession], interval: float) -> None:
+        """Flush pending contacts every interval."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush(session_factory)
+
+
+# Process-wide buffer used by the routes
+contact_buffer = ContactBuffer()
@@ -0,0 +1,64 @@
+"""
+Opaque keyset pagination cursors.
+
+A cursor is the URL-safe base64 encoding of a JSON list holding the sort
+key values of the last row of a page. Datetimes are stored as ISO 8601
+strings and Decimals as strings; callers convert them back when decoding.
+"""
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def _encode_value(value: Any) -> Any:
+    """Convert a sort value to a JSON-compatible value."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode sort key values into a cursor.
+
+    Args:
+        values: Sort key values of the last row of a page
+
+    Returns:
+        Opaque cursor string
+    """
+    raw = json.dumps([_encode_value(value) for value in values]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decode a cursor into its raw JSON values.
+
+    Args:
+        cursor: Cursor string
+        size: Expected number of values
+
+    Returns:
+        List of decoded values
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError("Invalid cursor: unexpected format")
+    return values
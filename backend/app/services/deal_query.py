@@ -0,0 +1,142 @@
+"""
+Query planner for server-side deal filtering and sorting.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import Select, func, or_, select
+
+from app.models.deal import Deal
+from app.schemas.deal import DealFilterParams
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Whitelisted sort keys mapped to (indexed) columns
+SORT_COLUMNS = {
+    "value": Deal.value,
+    "health_score": Deal.health_score,
+    "expected_close_date": Deal.expected_close_date,
+    "last_contact_at": Deal.last_contact_at,
+    "created_at": Deal.created_at,
+    "updated_at": Deal.updated_at,
+    "company_name": Deal.company_name,
+    "title": Deal.title,
+    "stage": Deal.stage,
+}
+
+
+class DealQueryPlanner:
+    """Translate deal filter parameters into a single SQL statement."""
+
+    def __init__(self, tenant_id: int, filters: Optional[DealFilterParams] = None):
+        """
+        Initialize the planner.
+
+        Args:
+            tenant_id: Tenant ID every query is scoped to
+            filters: Filter and sort parameters (defaults to no filters)
+        """
+        self.tenant_id = tenant_id
+        self.filters = filters or DealFilterParams()
+
+    def where_clauses(self) -> List:
+        """
+        Build the WHERE clauses for the filters.
+
+        Returns:
+            List of SQLAlchemy boolean expressions
+        """
+        f = self.filters
+        clauses = [Deal.tenant_id == self.tenant_id]
+
+        stages = set(f.stages or [])
+        if f.stage:
+            stages.add(f.stage)
+        if len(stages) == 1:
+            clauses.append(Deal.stage == next(iter(stages)))
+        elif stages:
+            clauses.append(Deal.stage.in_(sorted(stages, key=lambda s: s.value)))
+
+        if f.min_value is not None:
+            clauses.append(Deal.value >= f.min_value)
+        if f.max_value is not None:
+            clauses.append(Deal.value <= f.max_value)
+
+        if f.min_health is not None:
+            clauses.append(Deal.health_score >= f.min_health)
+        if f.max_health is not None:
+            clauses.append(Deal.health_score <= f.max_health)
+
+        if f.close_after is not None:
+            clauses.append(Deal.expected_close_date >= f.close_after)
+        if f.close_before is not None:
+            clauses.append(Deal.expected_close_date <= f.close_before)
+
+        if f.stale_days is not None:
+            # Deals never contacted count as stale
+            cutoff = datetime.utcnow() - timedelta(days=f.stale_days)
+            clauses.append(
+                or_(Deal.last_contact_at < cutoff, Deal.last_contact_at.is_(None))
+            )
+
+        if f.company_prefix:
+            clauses.append(Deal.company_name.startswith(f.company_prefix, autoescape=True))
+
+        return clauses
+
+    def order_by(self) -> List:
+        """
+        Build the ORDER BY clauses for the sort keys.
+
+        Deal.id is always appended as a tiebreaker so pagination is stable.
+
+        Returns:
+            List of SQLAlchemy ordering expressions
+        """
+        ordering = []
+        for key in self.filters.sort.split(","):
+            column = SORT_COLUMNS[key.lstrip("-")]
+            ordering.append(column.desc() if key.startswith("-") else column.asc())
+        ordering.append(Deal.id.desc())
+        return ordering
+
+    def select(self) -> Select:
+        """
+        Build the filtered and sorted SELECT for deals.
+
+        Returns:
+            SELECT statement yielding Deal entities
+        """
+        return select(Deal).where(*self.where_clauses()).order_by(*self.order_by())
+
+    def paginated(self, skip: int, limit: int) -> Select:
+        """
+        Build a page query that also carries the total match count.
+
+        The total is computed with a window function so the page and its
+        count come back in one statement.
+
+        Args:
+            skip: Number of rows to skip
+            limit: Maximum number of rows to return
+
+        Returns:
+            SELECT statement yielding (Deal, total) rows
+        """
+        return (
+            select(Deal, func.count().over().label("total"))
+            .where(*self.where_clauses())
+            .order_by(*self.order_by())
+            .offset(skip)
+            .limit(limit)
+        )
+
+    def count(self) -> Select:
+        """
+        Build a COUNT query for the filters.
+
+        Returns:
+            SELECT statement yielding the number of matching deals
+        """
+        return select(func.count(Deal.id)).where(*self.where_clauses())
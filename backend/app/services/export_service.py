@@ -0,0 +1,259 @@
+"""
+Streaming export service for deals and activities.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.models.deal import Deal
+from app.models.activity import Activity, ActivityType
+from app.schemas.deal import DealFilterParams
+from app.services.deal_query import DealQueryPlanner
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+# Approximate size of each chunk handed to the response
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+DEAL_EXPORT_COLUMNS = (
+    Deal.id,
+    Deal.title,
+    Deal.company_name,
+    Deal.contact_person,
+    Deal.contact_email,
+    Deal.contact_phone,
+    Deal.value,
+    Deal.stage,
+    Deal.health_score,
+    Deal.last_contact_at,
+    Deal.expected_close_date,
+    Deal.notes,
+    Deal.created_at,
+    Deal.updated_at,
+)
+
+ACTIVITY_EXPORT_COLUMNS = (
+    Activity.id,
+    Activity.deal_id,
+    Activity.user_id,
+    Activity.activity_type,
+    Activity.title,
+    Activity.description,
+    Activity.created_at,
+)
+
+
+def _export_value(value: Any) -> Any:
+    """Convert a column value to a plain export value."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_csv(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    """
+    Encode rows as CSV text, buffered into chunks.
+
+    Args:
+        fields: Header field names
+        rows: Row value tuples
+
+    Yields:
+        CSV text chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for row in rows:
+        writer.writerow([_export_value(value) for value in row])
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def encode_ndjson(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    """
+    Encode rows as newline-delimited JSON objects, buffered into chunks.
+
+    Args:
+        fields: Object keys
+        rows: Row value tuples
+
+    Yields:
+        NDJSON text chunks
+    """
+    lines = []
+    size = 0
+    for row in rows:
+        line = json.dumps(
+            {field: _export_value(value) for field, value in zip(fields, row)},
+            ensure_ascii=False,
+        )
+        lines.append(line)
+        size += len(line) + 1
+        if size >= EXPORT_CHUNK_BYTES:
+            yield "\n".join(lines) + "\n"
+            lines = []
+            size = 0
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Compress a byte stream incrementally into gzip format.
+
+    Args:
+        chunks: Uncompressed byte chunks
+
+    Yields:
+        Gzip-compressed byte chunks
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+ENCODERS = {
+    "csv": encode_csv,
+    "ndjson": encode_ndjson,
+}
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class ExportService:
+    """Service for constant-memory streaming exports."""
+
+    @staticmethod
+    def deal_export_query(tenant_id: int, filters: Optional[DealFilterParams] = None) -> Select:
+        """
+        Build the deal export query using the deal list filters.
+
+        Args:
+            tenant_id: Tenant ID to export
+            filters: Deal filter and sort parameters
+
+        Returns:
+            SELECT statement yielding export column tuples
+        """
+        planner = DealQueryPlanner(tenant_id, filters)
+        return (
+            select(*DEAL_EXPORT_COLUMNS)
+            .where(*planner.where_clauses())
+            .order_by(*planner.order_by())
+        )
+
+    @staticmethod
+    def activity_export_query(
+        tenant_id: int,
+        deal_id: Optional[int] = None,
+        activity_type: Optional[ActivityType] = None,
+    ) -> Select:
+        """
+        Build the activity export query scoped to the tenant.
+
+        Args:
+            tenant_id: Tenant ID to export
+            deal_id: Optional deal to restrict the export to
+            activity_type: Optional activity type filter
+
+        Returns:
+            SELECT statement yielding export column tuples
+        """
+        query = select(*ACTIVITY_EXPORT_COLUMNS).where(Activity.tenant_id == tenant_id)
+        if deal_id is not None:
+            query = query.where(Activity.deal_id == deal_id)
+        if activity_type is not None:
+            query = query.where(Activity.activity_type == activity_type)
+        return query.order_by(Activity.id.asc())
+
+    @staticmethod
+    def stream(
+        session_factory: Callable[[], Session],
+        query: Select,
+        export_format: str,
+        compress: bool = False,
+    ) -> Iterator[bytes]:
+        """
+        Stream query results as encoded bytes from a server-side cursor.
+
+        The generator owns its session so it outlives the request scope.
+
+        Args:
+            session_factory: Factory creating a new database session
+            query: Export SELECT statement
+            export_format: "csv" or "ndjson"
+            compress: Gzip-compress the output
+
+        Yields:
+            Encoded (and optionally compressed) byte chunks
+        """
+        fields = [column.key for column in query.selected_columns]
+        encode = ENCODERS[export_format]
+
+        def encoded() -> Iterator[bytes]:
+            db = session_factory()
+            try:
+                result = db.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+                for text in encode(fields, result):
+                    yield text.encode("utf-8")
+            finally:
+                db.close()
+            logger.info(f"Finished {export_format} export (gzip={compress})")
+
+        chunks = encoded()
+        return gzip_chunks(chunks) if compress else chunks
+
+
+def export_response(
+    chunks: Iterator[bytes], name: str, export_format: str, compress: bool
+) -> StreamingResponse:
+    """
+    Wrap an export stream in a file download response.
+
+    Args:
+        chunks: Encoded byte chunks
+        name: Base file name
+        export_format: "csv" or "ndjson"
+        compress: Whether the chunks are gzip-compressed
+
+    Returns:
+        Streaming response with download headers
+    """
+    filename = f"{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{export_format}"
+    media_type = MEDIA_TYPES[export_format]
+    if compress:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,5 +1,6 @@
 """Health scoring logic for deals."""
 from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
 from app.models.deal import Deal, DealStage
 from app.core.logging import get_logger
 
@@ -11,7 +12,14 @@ def now_utc():
     return datetime.now(timezone.utc)
 
 
-def calculate_deal_health_score(deal: Deal) -> int:
+def to_naive_utc(value: datetime) -> datetime:
+    """Normalize a datetime to naive UTC (the timestamps the API writes)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def calculate_deal_health_score(deal: Deal, now: Optional[datetime] = None) -> int:
     """
     Calculate health score for a deal (0-100).
 
@@ -22,11 +30,13 @@ def calculate_deal_health_score(deal: Deal) -> int:
     - Deal age (10 points)
 
     Args:
-        deal: The deal to score
+        deal: The deal to score (any object with the Deal attributes)
+        now: Reference time (defaults to the current UTC time)
 
     Returns:
         Health score from 0-100
     """
+    now = now or now_utc()
     score = 0
 
     # Factor 1: Last contact (40 points max)
@@ -36,7 +46,7 @@ def calculate_deal_health_score(deal: Deal) -> int:
         if last_contact.tzinfo is None:
             from datetime import timezone
             last_contact = last_contact.replace(tzinfo=timezone.utc)
-        days_since_contact = (now_utc() - last_contact).days
+        days_since_contact = (now - last_contact).days
 
         if days_since_contact <= 3:
             score += 40
@@ -58,7 +68,7 @@ def calculate_deal_health_score(deal: Deal) -> int:
         if close_date.tzinfo is None:
             from datetime import timezone
             close_date = close_date.replace(tzinfo=timezone.utc)
-        days_until_close = (close_date - now_utc()).days
+        days_until_close = (close_date - now).days
 
         if days_until_close < 0:
             # Overdue - bad sign
@@ -97,7 +107,7 @@ def calculate_deal_health_score(deal: Deal) -> int:
         if created_at.tzinfo is None:
             from datetime import timezone
             created_at = created_at.replace(tzinfo=timezone.utc)
-        deal_age_days = (now_utc() - created_at).days
+        deal_age_days = (now - created_at).days
     else:
         # New deal with no created_at timestamp, treat as very fresh
         deal_age_days = 0
@@ -120,3 +130,17 @@ def calculate_deal_health_score(deal: Deal) -> int:
 
     logger.debug(f"Calculated health score for deal {deal.id}: {score}")
     return score
+
+
+def calculate_health_scores(deals: Iterable[Deal]) -> List[int]:
+    """
+    Calculate health scores for many deals against one reference time.
+
+    Args:
+        deals: Deals to score (any objects with the Deal attributes)
+
+    Returns:
+        Health scores in the same order as the deals
+    """
+    now = now_utc()
+    return [calculate_deal_health_score(deal, now) for deal in deals]
@@ -0,0 +1,234 @@
+"""
+Idempotency key handling for write endpoints.
+"""
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.idempotency import IdempotencyKey
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Header returned on replayed responses
+REPLAY_HEADER = "Idempotent-Replayed"
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Normalize a datetime to naive UTC for comparisons."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def request_fingerprint(method: str, path: str, body: bytes) -> str:
+    """
+    Hash the parts of a request that must match on replay.
+
+    Args:
+        method: HTTP method
+        path: Request path
+        body: Raw request body
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{method} {path}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+class IdempotencyContext:
+    """
+    Per-request idempotency state.
+
+    Without a key the context is inactive and all methods are no-ops.
+    With a key, ``reserve`` either claims the key for this request or
+    loads the stored response of the original request into ``replay``.
+    """
+
+    def __init__(self, tenant_id: int, key: Optional[str], fingerprint: str):
+        """
+        Initialize the context.
+
+        Args:
+            tenant_id: Tenant ID the key is scoped to
+            key: Idempotency-Key header value (None if absent)
+            fingerprint: Request fingerprint
+        """
+        self.tenant_id = tenant_id
+        self.key = key
+        self.fingerprint = fingerprint
+        self.replay: Optional[JSONResponse] = None
+        self.record_id: Optional[int] = None
+
+    @property
+    def active(self) -> bool:
+        """Whether the request carries an idempotency key."""
+        return self.key is not None
+
+    async def reserve(self, db: AsyncSession) -> None:
+        """
+        Claim the key or load the stored response for a replay.
+
+        Raises:
+            HTTPException: 409 if the original request is still in progress,
+                422 if the key was used with a different request
+        """
+        if not self.active:
+            return
+
+        now = datetime.utcnow()
+        record = await self._lookup(db)
+
+        if record is not None and _naive_utc(record.expires_at) <= now:
+            await db.execute(delete(IdempotencyKey).where(IdempotencyKey.id == record.id))
+            await db.commit()
+            record = None
+
+        if record is None:
+            record = IdempotencyKey(
+                tenant_id=self.tenant_id,
+                key=self.key,
+                request_hash=self.fingerprint,
+                expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+            )
+            db.add(record)
+            try:
+                await db.commit()
+                self.record_id = record.id
+                return
+            except IntegrityError:
+                # A concurrent request claimed the key first
+                await db.rollback()
+                record = await self._lookup(db)
+
+        if record.request_hash != self.fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request",
+            )
+
+        if record.status_code is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+
+        logger.info(f"Replaying idempotent response for key {self.key} (tenant {self.tenant_id})")
+        self.replay = JSONResponse(
+            content=record.response_body,
+            status_code=record.status_code,
+            headers={REPLAY_HEADER: "true"},
+        )
+
+    async def complete(self, db: AsyncSession, response: Response) -> None:
+        """
+        Store the response of the original request.
+
+        Call before committing the write, so the response is stored in the
+        same transaction. A crash can then never leave a committed write
+        with a key that stays "in progress".
+
+        Args:
+            db: Database session (the caller commits)
+            response: Rendered JSON response
+        """
+        if self.record_id is None:
+            return
+
+        await db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.id == self.record_id)
+            .values(status_code=response.status_code, response_body=json.loads(response.body))
+        )
+
+    async def release(self, db: AsyncSession) -> None:
+        """Drop the reservation after a failed request so it can be retried."""
+        if self.record_id is None:
+            return
+
+        await db.rollback()
+        await db.execute(delete(IdempotencyKey).where(IdempotencyKey.id == self.record_id))
+        await db.commit()
+        self.record_id = None
+
+    async def _lookup(self, db: AsyncSession) -> Optional[IdempotencyKey]:
+        """Load the stored record for this tenant and key."""
+        return await db.scalar(
+            select(IdempotencyKey).where(
+                IdempotencyKey.tenant_id == self.tenant_id,
+                IdempotencyKey.key == self.key,
+            )
+        )
+
+
+async def purge_expired_keys(db: AsyncSession) -> int:
+    """
+    Delete expired idempotency records.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Number of deleted records
+    """
+    result = await db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow())
+    )
+    await db.commit()
+    return result.rowcount
+
+
+class IdempotencyKeyPurger:
+    """Background task deleting expired idempotency records."""
+
+    def __init__(self):
+        """Initialize the purger."""
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, session_factory: Callable[[], AsyncSession], interval: float) -> None:
+        """
+        Start the background purge loop.
+
+        Args:
+            session_factory: Async session factory
+            interval: Seconds between purges
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(session_factory, interval))
+
+    async def stop(self) -> None:
+        """Stop the purge loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, session_factory: Callable[[], AsyncSession], interval: float) -> None:
+        """Purge expired records every interval."""
+        while True:
+            try:
+                async with session_factory() as db:
+                    purged = await purge_expired_keys(db)
+                if purged:
+                    logger.info(f"Purged {purged} expired idempotency keys")
+            except Exception as e:
+                logger.error(f"Idempotency key purge failed: {e}")
+            await asyncio.sleep(interval)
+
+
+idempotency_purger = IdempotencyKeyPurger()
@@ -0,0 +1,277 @@
+"""
+Streaming deal import service for CSV and NDJSON files.
+"""
+import csv
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, IO, Iterator, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db.query_stats import detach_query_stats
+from app.models.import_job import ImportJob, ImportStatus, ImportFormat
+from app.schemas.deal import BulkItemError
+from app.services.bulk_service import BulkDealService
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Block size used when spooling uploads to disk
+IMPORT_COPY_BUFFER_SIZE = 1024 * 1024
+
+# Bytes that were not valid UTF-8, as decoded with surrogateescape
+UNDECODABLE = re.compile("[\udc80-\udcff]")
+
+# Marker for rows that could not be parsed at all
+ParsedRow = Tuple[Dict[str, Any], str]
+
+
+def iter_csv_rows(stream: IO[bytes]) -> Iterator[ParsedRow]:
+    """
+    Parse a CSV file row by row.
+
+    Empty cells are treated as missing values. Malformed rows and rows
+    with invalid UTF-8 are reported as parse errors without stopping the
+    import.
+
+    Args:
+        stream: Binary file object positioned at the start
+
+    Yields:
+        Tuples of (row dict, parse error message or "")
+    """
+    # Undecodable bytes become lone surrogates so they can be reported per row
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="surrogateescape", newline="")
+    reader = csv.DictReader(text)
+    try:
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                yield {}, f"Invalid CSV: {e}"
+                continue
+
+            row = {
+                key.strip(): value
+                for key, value in row.items()
+                if key and value not in (None, "")
+            }
+            if any(
+                isinstance(value, str) and UNDECODABLE.search(value)
+                for item in row.items()
+                for value in item
+            ):
+                yield {}, "Invalid UTF-8"
+                continue
+            yield row, ""
+    finally:
+        text.detach()
+
+
+def iter_ndjson_rows(stream: IO[bytes]) -> Iterator[ParsedRow]:
+    """
+    Parse a newline-delimited JSON file line by line.
+
+    Args:
+        stream: Binary file object positioned at the start
+
+    Yields:
+        Tuples of (row dict, parse error message or "")
+    """
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield {}, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield {}, "Each line must be a JSON object"
+            continue
+        yield row, ""
+
+
+ROW_PARSERS: Dict[ImportFormat, Callable[[IO[bytes]], Iterator[ParsedRow]]] = {
+    ImportFormat.CSV: iter_csv_rows,
+    ImportFormat.NDJSON: iter_ndjson_rows,
+}
+
+
+class ImportService:
+    """Service for chunked deal imports tracked by import jobs."""
+
+    @staticmethod
+    def detect_format(filename: str, content_type: str) -> ImportFormat:
+        """
+        Detect the import format from filename or content type.
+
+        Args:
+            filename: Uploaded file name
+            content_type: Uploaded file content type
+
+        Returns:
+            Detected import format (CSV if unknown)
+        """
+        name = (filename or "").lower()
+        if name.endswith((".ndjson", ".jsonl")) or "ndjson" in (content_type or ""):
+            return ImportFormat.NDJSON
+        return ImportFormat.CSV
+
+    @staticmethod
+    def spool_upload(source: IO[bytes]) -> str:
+        """
+        Copy an upload to a temporary file (blocking; run in a thread).
+
+        Copies in fixed-size blocks so memory stays flat for large files.
+
+        Args:
+            source: Uploaded file object
+
+        Returns:
+            Path of the copy (the caller removes it)
+        """
+        with tempfile.NamedTemporaryFile(prefix="dealflow-import-", delete=False) as spool:
+            try:
+                shutil.copyfileobj(source, spool, IMPORT_COPY_BUFFER_SIZE)
+            except BaseException:
+                spool.close()
+                os.unlink(spool.name)
+                raise
+        return spool.name
+
+    @staticmethod
+    def import_stream(
+        db: Session,
+        job: ImportJob,
+        stream: IO[bytes],
+        chunk_size: int,
+    ) -> ImportJob:
+        """
+        Import deals from a stream, committing one chunk at a time.
+
+        Only one chunk of rows is held in memory. Job progress is committed
+        together with each chunk so it can be polled while the import runs.
+
+        Args:
+            db: Database session
+            job: Import job to run and update
+            stream: Binary file object with the rows
+            chunk_size: Rows per chunk (and per commit)
+
+        Returns:
+            The finished import job
+        """
+        job.status = ImportStatus.RUNNING
+        db.commit()
+
+        rows = ROW_PARSERS[job.file_format](stream)
+        offset = 0
+        errors: List[Dict[str, Any]] = []
+
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+
+            parse_errors = [
+                BulkItemError(index=offset + i, errors=[{"type": "parse_error", "msg": message}])
+                for i, (_, message) in enumerate(chunk)
+                if message
+            ]
+            parsed = [(offset + i, row) for i, (row, message) in enumerate(chunk) if not message]
+
+            valid, validation_errors = BulkDealService.validate_create_rows(
+                [row for _, row in parsed]
+            )
+            # Map positions within the parsed rows back to file row numbers
+            for error in validation_errors:
+                error.index = parsed[error.index][0]
+
+            BulkDealService.insert_deals(
+                db,
+                job.tenant_id,
+                job.user_id,
+                [deal_data for _, deal_data in valid],
+                activity_description="Deal '{title}' wurde per Datei-Import angelegt",
+            )
+
+            chunk_errors = sorted(parse_errors + validation_errors, key=lambda e: e.index)
+            remaining = settings.IMPORT_MAX_REPORTED_ERRORS - len(errors)
+            errors.extend(error.model_dump() for error in chunk_errors[:max(remaining, 0)])
+
+            job.processed_rows += len(chunk)
+            job.imported_rows += len(valid)
+            job.failed_rows += len(chunk_errors)
+            job.errors = list(errors)
+            db.commit()
+
+            # Keep memory flat: drop the chunk's deals from the identity map
+            db.expunge_all()
+            db.add(job)
+            offset += len(chunk)
+
+        job.status = ImportStatus.COMPLETED
+        job.finished_at = datetime.utcnow()
+        db.commit()
+
+        logger.info(
+            f"Import job {job.id} finished: {job.imported_rows} imported, "
+            f"{job.failed_rows} failed for tenant {job.tenant_id}"
+        )
+        return job
+
+    @staticmethod
+    def run_import_file(
+        session_factory: Callable[[], Session],
+        job_id: int,
+        path: str,
+        chunk_size: int,
+    ) -> None:
+        """
+        Run an import job from a spooled file (background task entry point).
+
+        The file is removed once the job has finished.
+
+        Args:
+            session_factory: Factory creating a new database session
+            job_id: Import job ID
+            path: Path of the uploaded file copy
+            chunk_size: Rows per chunk (and per commit)
+        """
+        detach_query_stats()
+        db = session_factory()
+        try:
+            job = db.get(ImportJob, job_id)
+            if job is None:
+                logger.error(f"Import job {job_id} not found")
+                return
+
+            try:
+                with open(path, "rb") as stream:
+                    ImportService.import_stream(db, job, stream, chunk_size)
+            except Exception as e:
+                logger.error(f"Import job {job_id} failed: {str(e)}")
+                db.rollback()
+                job = db.get(ImportJob, job_id)
+                job.status = ImportStatus.FAILED
+                # Chunks before the failing one stay committed
+                job.error_message = (
+                    f"Failed after {job.processed_rows} rows "
+                    f"({job.imported_rows} imported and kept): {e}"
+                )[:2000]
+                job.finished_at = datetime.utcnow()
+                db.commit()
+        finally:
+            db.close()
+            os.unlink(path)
@@ -0,0 +1,304 @@
+"""
+Transactional outbox for deal and activity domain events.
+
+Deal and activity writes append compact event rows to the ``outbox`` table
+inside their own transaction (``append_events``), so an event exists if and
+only if its change committed: no dual writes, and no integration work on
+the request path. The ``OutboxRelay`` drains the table in id order with
+``SELECT ... FOR UPDATE SKIP LOCKED`` batches, hands each batch to its
+handlers (the webhook fan-out) and deletes the rows in the same
+transaction. Concurrent relays skip each other's locked rows, and a relay
+that dies before committing leaves its batch to the next one, which gives
+at-least-once handling.
+
+A handler failure rolls the batch back, and its events are then retried
+one by one, so a single bad event cannot block the outbox: the others are
+handled, and the failing one has its attempt counted and is retried with
+later batches. After ``OUTBOX_MAX_ATTEMPTS`` failures it is set aside
+(``failed_at``) and no longer relayed.
+"""
+import asyncio
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.deal import DealStage
+from app.models.outbox import OutboxEvent, OutboxEventType
+from app.services.webhook_service import WebhookService
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Stored length of handler errors
+MAX_ERROR_LENGTH = 2000
+
+
+class OutboxHandlerError(Exception):
+    """Raised when a handler fails for a batch; the cause is the handler's error."""
+
+    def __init__(self, event_ids: List[int]):
+        super().__init__(f"Outbox handler failed for events {event_ids}")
+        self.event_ids = event_ids
+
+
+def outbox_event(
+    tenant_id: int, event_type: OutboxEventType, aggregate_id: int, **payload: Any
+) -> Dict[str, Any]:
+    """
+    Build an outbox row.
+
+    Args:
+        tenant_id: Tenant ID owning the aggregate
+        event_type: Event type
+        aggregate_id: ID of the deal or activity
+        **payload: JSON-encodable change summary
+
+    Returns:
+        Row for ``append_events``
+    """
+    return {
+        "tenant_id": tenant_id,
+        "event_type": event_type.value,
+        "aggregate_id": aggregate_id,
+        "payload": payload,
+    }
+
+
+def deal_change_events(
+    tenant_id: int,
+    deal_id: int,
+    changes: Iterable[str],
+    stage: DealStage,
+    health_score: Optional[int],
+    old_stage: DealStage,
+    old_health_score: Optional[int],
+) -> List[Dict[str, Any]]:
+    """
+    Build the outbox rows of a deal update.
+
+    Every update records ``deal.updated``. Moving into closed-won also
+    records ``deal.won``; a health score dropping below
+    ``WEBHOOK_HEALTH_ALERT_THRESHOLD`` records ``deal.health_alert`` (once
+    per drop, not on every update of an unhealthy deal).
+
+    Args:
+        tenant_id: Tenant ID owning the deal
+        deal_id: Deal ID
+        changes: Names of the changed fields
+        stage: Stage after the update
+        health_score: Health score after the update
+        old_stage: Stage before the update
+        old_health_score: Health score before the update
+
+    Returns:
+        Rows for ``append_events``
+    """
+    payload: Dict[str, Any] = {"changes": sorted(changes), "stage": stage.value}
+    if stage != old_stage:
+        payload["old_stage"] = old_stage.value
+    events = [outbox_event(tenant_id, OutboxEventType.DEAL_UPDATED, deal_id, **payload)]
+
+    if stage == DealStage.CLOSED_WON and old_stage != DealStage.CLOSED_WON:
+        events.append(outbox_event(tenant_id, OutboxEventType.DEAL_WON, deal_id))
+
+    threshold = settings.WEBHOOK_HEALTH_ALERT_THRESHOLD
+    if (
+        health_score is not None
+        and health_score < threshold
+        and (old_health_score is None or old_health_score >= threshold)
+    ):
+        events.append(
+            outbox_event(
+                tenant_id, OutboxEventType.DEAL_HEALTH_ALERT, deal_id, health_score=health_score
+            )
+        )
+
+    return events
+
+
+def append_events(db: Session, events: Sequence[Dict[str, Any]]) -> None:
+    """
+    Append events to the outbox with one multi-row INSERT.
+
+    Runs in the caller's transaction; the caller commits.
+
+    Args:
+        db: Database session
+        events: Rows built with ``outbox_event``
+    """
+    if events:
+        db.execute(insert(OutboxEvent), list(events))
+
+
+class OutboxRelay:
+    """Drains the outbox in batches and hands events to handlers."""
+
+    def __init__(
+        self,
+        batch_size: int,
+        handlers: Sequence[Callable[[Session, Sequence[OutboxEvent]], Any]],
+        max_attempts: int,
+    ):
+        """
+        Initialize the relay.
+
+        Args:
+            batch_size: Events locked and handled per transaction
+            handlers: Called with the session and each batch, in order
+            max_attempts: Failures of an event before it is set aside
+        """
+        self.batch_size = batch_size
+        self.handlers = handlers
+        self.max_attempts = max_attempts
+        self._task: Optional[asyncio.Task] = None
+
+    def drain_batch(self, db: Session, event_ids: Optional[Sequence[int]] = None) -> int:
+        """
+        Handle and delete one batch of events.
+
+        Rows locked by another relay are skipped instead of waited on
+        (``FOR UPDATE SKIP LOCKED``; SQLite has no row locks and ignores
+        the clause), as are events set aside after failing. The caller
+        commits, or rolls back on ``OutboxHandlerError``.
+
+        Args:
+            db: Database session
+            event_ids: Handle only these events (default: the oldest ones)
+
+        Returns:
+            Number of handled events
+
+        Raises:
+            OutboxHandlerError: If a handler raised
+        """
+        query = select(OutboxEvent).where(OutboxEvent.failed_at.is_(None))
+        if event_ids is not None:
+            query = query.where(OutboxEvent.id.in_(event_ids))
+        events = db.scalars(
+            query.order_by(OutboxEvent.id).limit(self.batch_size).with_for_update(skip_locked=True)
+        ).all()
+        if not events:
+            return 0
+
+        handled_ids = [event.id for event in events]
+        try:
+            for handler in self.handlers:
+                handler(db, events)
+        except Exception as e:
+            raise OutboxHandlerError(handled_ids) from e
+
+        db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(handled_ids)))
+        return len(events)
+
+    def relay(self, db: Session) -> int:
+        """
+        Handle one batch and commit, isolating events whose handlers fail.
+
+        When a handler fails, the batch is rolled back and its events are
+        handled one by one, each in its own transaction. Events failing on
+        their own get the failure recorded (``_record_failure``).
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of handled events
+        """
+        try:
+            handled = self.drain_batch(db)
+            db.commit()
+            return handled
+        except OutboxHandlerError as e:
+            db.rollback()
+            logger.warning(f"{e}: {e.__cause__}; retrying them one by one")
+            event_ids = e.event_ids
+
+        handled = 0
+        for event_id in event_ids:
+            try:
+                handled += self.drain_batch(db, [event_id])
+                db.commit()
+            except OutboxHandlerError as e:
+                db.rollback()
+                self._record_failure(db, event_id, e.__cause__)
+                db.commit()
+        return handled
+
+    def _record_failure(self, db: Session, event_id: int, error: BaseException) -> None:
+        """Count a failed attempt of an event and set it aside after the last one."""
+        attempts = db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == event_id)
+            .values(
+                attempts=OutboxEvent.attempts + 1,
+                last_error=f"{type(error).__name__}: {error}"[:MAX_ERROR_LENGTH],
+            )
+            .returning(OutboxEvent.attempts)
+        ).scalar_one_or_none()
+        if attempts is None:  # Handled by another relay in the meantime
+            return
+
+        if attempts < self.max_attempts:
+            logger.warning(f"Outbox event {event_id} failed (attempt {attempts}): {error}")
+            return
+
+        db.execute(update(OutboxEvent).where(OutboxEvent.id == event_id).values(failed_at=func.now()))
+        logger.error(f"Outbox event {event_id} set aside after {attempts} failed attempts: {error}")
+
+    async def drain(self, session_factory: Callable[[], AsyncSession]) -> int:
+        """
+        Handle one batch (see ``relay``) in its own transactions.
+
+        Args:
+            session_factory: Async session factory
+
+        Returns:
+            Number of handled events
+        """
+        async with session_factory() as db:
+            handled = await db.run_sync(self.relay)
+
+        if handled:
+            logger.debug(f"Relayed {handled} outbox events")
+        return handled
+
+    def start(self, session_factory: Callable[[], AsyncSession], interval: float) -> None:
+        """
+        Start the background relay loop.
+
+        Args:
+            session_factory: Async session factory
+            interval: Seconds between polls when the outbox is drained
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(session_factory, interval))
+
+    async def stop(self) -> None:
+        """Stop the relay loop (unhandled events stay in the outbox)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, session_factory: Callable[[], AsyncSession], interval: float) -> None:
+        """Drain the outbox, polling again right away while batches are full."""
+        while True:
+            try:
+                handled = await self.drain(session_factory)
+            except Exception as e:
+                logger.error(f"Outbox relay failed: {e}")
+                handled = 0
+            if handled < self.batch_size:
+                await asyncio.sleep(interval)
+
+
+# Process-wide relay; events fan out to webhook subscriptions
+outbox_relay = OutboxRelay(
+    settings.OUTBOX_BATCH_SIZE, [WebhookService.fan_out], settings.OUTBOX_MAX_ATTEMPTS
+)
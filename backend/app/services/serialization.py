@@ -0,0 +1,67 @@
+"""
+Fast JSON serialization of deals.
+
+Deal responses, archive documents and webhook payloads encode ORM rows
+straight to JSON with orjson instead of validating a DealResponse per row.
+The output matches the response models (Decimal values as strings, ISO
+8601 datetimes with "Z" for UTC).
+"""
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.models.deal import Deal
+from app.schemas.deal import DealResponse
+
+# Column attributes of DealResponse in response field order
+DEAL_RESPONSE_COLUMNS = tuple(field for field in DealResponse.model_fields if field != "next_actions")
+
+# Cached adapter for list payloads that still need validation
+DEAL_LIST_ADAPTER = TypeAdapter(List[DealResponse])
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Encode types orjson does not support natively."""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content to JSON bytes."""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+def deal_to_dict(deal: Deal, next_actions: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Convert a deal row to a DealResponse-shaped dict without validation.
+
+    Args:
+        deal: Loaded deal
+        next_actions: AI recommendations to include
+
+    Returns:
+        Dict ready for JSON encoding
+    """
+    data = {field: getattr(deal, field) for field in DEAL_RESPONSE_COLUMNS}
+    data["next_actions"] = next_actions
+    return data
+
+
+def deal_list_json(deals: Iterable[Deal]) -> bytes:
+    """
+    Validate and encode deal rows as a JSON list in one pass.
+
+    Args:
+        deals: Loaded deals
+
+    Returns:
+        JSON bytes of the DealResponse list
+    """
+    return DEAL_LIST_ADAPTER.dump_json(
+        DEAL_LIST_ADAPTER.validate_python(list(deals), from_attributes=True)
+    )
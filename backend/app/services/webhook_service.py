@@ -0,0 +1,673 @@
+"""
+Outbound webhook delivery.
+
+The outbox relay fans deal events out into one delivery row per matching
+subscription (``WebhookService.fan_out``), or into the subscription's open
+digest when it batches events. The ``WebhookDispatcher`` background task
+polls due deliveries (including digests whose window closed), posts them
+through one pooled ``httpx.AsyncClient`` and records the outcome:
+delivered, retried with exponential backoff, or dead-lettered after
+``WEBHOOK_MAX_ATTEMPTS``. Requests to the same endpoint are capped by a
+per-endpoint semaphore, so one slow receiver cannot tie up the connection
+pool.
+
+Bodies are signed like incoming webhooks: ``X-Webhook-Signature`` is the
+hex HMAC-SHA256 of the body, keyed with the subscription's own secret
+(generated at creation). Subscriptions without one are never sent
+unsigned or signed with the global ``WEBHOOK_SECRET``; their deliveries
+fail until the secret is rotated.
+
+Subscription URLs must resolve to public addresses only
+(``check_target``), both when the subscription is created and again
+before every request, so a webhook cannot be pointed at internal
+services or cloud metadata endpoints. Redirects are not followed.
+"""
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import random
+import socket
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import orjson
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.deal import Deal
+from app.models.outbox import OutboxEvent
+from app.models.webhook import DeliveryStatus, WebhookDelivery, WebhookEvent, WebhookSubscription
+from app.services.serialization import deal_to_dict, dumps
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Claimed deliveries are hidden from other dispatchers for this long. A
+# dispatcher that dies mid-batch has its deliveries retried afterwards.
+DELIVERY_LEASE_SECONDS = 300
+
+# Outbox event types pushed to subscriptions
+WEBHOOK_EVENT_TYPES = {event.value for event in WebhookEvent}
+
+# Deliveries the dispatcher sends once next_attempt_at has passed
+DUE_STATUSES = (DeliveryStatus.PENDING, DeliveryStatus.BATCHING)
+
+# Stored length of receiver errors
+MAX_ERROR_LENGTH = 2000
+
+
+class UnsafeTargetError(ValueError):
+    """Raised when a webhook URL does not resolve to public addresses only."""
+
+
+async def check_target(url: str) -> None:
+    """
+    Resolve a webhook URL and reject private, loopback and link-local targets.
+
+    Every address the host resolves to must be globally routable, which
+    also excludes reserved, shared (CGNAT) and multicast ranges. Skipped
+    when ``WEBHOOK_ALLOW_PRIVATE_TARGETS`` is set (local development).
+
+    Args:
+        url: Subscription URL
+
+    Raises:
+        UnsafeTargetError: If the host is missing, unresolvable or not public
+    """
+    if settings.WEBHOOK_ALLOW_PRIVATE_TARGETS:
+        return
+
+    try:
+        parts = urlsplit(url)
+        host = parts.hostname
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+    except ValueError as e:
+        raise UnsafeTargetError(f"Invalid webhook URL: {e}") from e
+    if not host:
+        raise UnsafeTargetError("Webhook URL has no host")
+
+    try:
+        addresses = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        raise UnsafeTargetError(f"Cannot resolve webhook host {host}") from e
+
+    for *_, sockaddr in addresses:
+        address = ipaddress.ip_address(sockaddr[0])
+        if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not address.is_global or address.is_multicast:
+            raise UnsafeTargetError(f"Webhook host {host} resolves to non-public address {address}")
+
+
+def sign_payload(payload: str, secret: str) -> str:
+    """
+    Sign a webhook body with HMAC SHA256.
+
+    Args:
+        payload: Body as string
+        secret: Shared secret
+
+    Returns:
+        Hex digest sent as X-Webhook-Signature
+    """
+    return hmac.new(secret.encode(), payload.encode(), hashlib.sha256).hexdigest()
+
+
+def deal_event_payload(event: WebhookEvent, deal: Deal) -> Dict[str, Any]:
+    """
+    Build the payload of a deal event.
+
+    Pushed deliveries and the pull endpoints in ``app.api.routes.webhooks``
+    share this shape.
+
+    Args:
+        event: Event type
+        deal: Loaded deal
+
+    Returns:
+        JSON-encodable payload
+    """
+    payload: Dict[str, Any] = {
+        "event": event.value,
+        "deal": deal_to_dict(deal),
+        "tenant_id": deal.tenant_id,
+    }
+
+    if event == WebhookEvent.DEAL_WON:
+        payload.update(
+            value=float(deal.value),
+            company=deal.company_name,
+            contact={
+                "name": deal.contact_person,
+                "email": deal.contact_email,
+                "phone": deal.contact_phone,
+            },
+        )
+    elif event == WebhookEvent.DEAL_HEALTH_ALERT:
+        payload.update(
+            health_score=deal.health_score,
+            alert_level="critical" if deal.health_score < 30 else "warning",
+            recommended_actions=[
+                "Schedule immediate follow-up call",
+                "Review deal status with team",
+                "Update deal notes with current situation",
+            ],
+        )
+
+    payload["timestamp"] = (deal.updated_at or deal.created_at).isoformat()
+    return payload
+
+
+class WebhookService:
+    """Service queueing webhook deliveries."""
+
+    @staticmethod
+    def enqueue(
+        db: Session,
+        tenant_id: int,
+        events: Sequence[Tuple[WebhookEvent, Dict[str, Any]]],
+    ) -> int:
+        """
+        Queue deliveries of events to the tenant's subscriptions.
+
+        Subscriptions without a digest window get one delivery per event.
+        Bodies are encoded once per event and inserted with one multi-row
+        INSERT. Events for digest subscriptions are added to their open
+        digests instead (see ``add_to_digest``). The caller commits.
+
+        Args:
+            db: Database session
+            tenant_id: Tenant ID raising the events
+            events: (event, payload) pairs
+
+        Returns:
+            Number of queued deliveries and digest entries
+        """
+        if not events:
+            return 0
+
+        subscriptions = db.scalars(
+            select(WebhookSubscription).where(
+                WebhookSubscription.tenant_id == tenant_id,
+                WebhookSubscription.is_active.is_(True),
+            )
+        ).all()
+        if not subscriptions:
+            return 0
+
+        now = datetime.utcnow()
+        rows = []
+        digested = 0
+        for subscription in subscriptions:
+            subscribed = [(event, payload) for event, payload in events if event.value in subscription.events]
+            if subscribed and subscription.digest_window_seconds:
+                WebhookService.add_to_digest(db, subscription, subscribed, now)
+                digested += len(subscribed)
+
+        bodies: Dict[int, str] = {}
+        for index, (event, payload) in enumerate(events):
+            for subscription in subscriptions:
+                if subscription.digest_window_seconds or event.value not in subscription.events:
+                    continue
+                if index not in bodies:
+                    bodies[index] = dumps(payload).decode()
+                rows.append(
+                    {
+                        "tenant_id": tenant_id,
+                        "subscription_id": subscription.id,
+                        "event": event,
+                        "body": bodies[index],
+                        "status": DeliveryStatus.PENDING,
+                        "attempts": 0,
+                        "next_attempt_at": now,
+                    }
+                )
+
+        if rows:
+            db.execute(insert(WebhookDelivery), rows)
+            logger.debug(f"Queued {len(rows)} webhook deliveries for tenant {tenant_id}")
+        return len(rows) + digested
+
+    @staticmethod
+    def add_to_digest(
+        db: Session,
+        subscription: WebhookSubscription,
+        events: Sequence[Tuple[WebhookEvent, Dict[str, Any]]],
+        now: datetime,
+    ) -> None:
+        """
+        Add events to the subscription's open digest.
+
+        A digest collects events until its window closes (it is then due
+        for the dispatcher) or it holds ``digest_max_events`` entries (it is
+        then closed right away and a new one is opened). A repeated event of
+        the same deal replaces its earlier entry, so receivers get one entry
+        with the latest state per deal and event type. The open digest is
+        row-locked, so a dispatcher cannot claim it while entries are added.
+
+        Args:
+            db: Database session
+            subscription: Digest subscription
+            events: Subscribed (event, payload) pairs
+            now: Current time (naive UTC)
+        """
+        max_events = subscription.digest_max_events or settings.WEBHOOK_DIGEST_MAX_EVENTS
+        digest = db.scalars(
+            select(WebhookDelivery)
+            .where(
+                WebhookDelivery.subscription_id == subscription.id,
+                WebhookDelivery.status == DeliveryStatus.BATCHING,
+                WebhookDelivery.next_attempt_at > now,
+            )
+            .order_by(WebhookDelivery.id.desc())
+            .limit(1)
+            .with_for_update()
+        ).first()
+        entries: List[Dict[str, Any]] = orjson.loads(digest.body)["events"] if digest else []
+        positions = {(entry["event"], entry["deal"]["id"]): i for i, entry in enumerate(entries)}
+
+        for event, payload in events:
+            key = (event.value, payload["deal"]["id"])
+            if key in positions:
+                entries[positions[key]] = orjson.loads(dumps(payload))
+                continue
+
+            if len(entries) >= max_events:
+                # Full: close it for immediate delivery and start a new one
+                digest = WebhookService._write_digest(db, subscription, digest, entries, now)
+                digest.status = DeliveryStatus.PENDING
+                digest.next_attempt_at = now
+                digest, entries, positions = None, [], {}
+
+            positions[key] = len(entries)
+            entries.append(orjson.loads(dumps(payload)))
+
+        if entries:
+            WebhookService._write_digest(db, subscription, digest, entries, now)
+
+    @staticmethod
+    def _write_digest(
+        db: Session,
+        subscription: WebhookSubscription,
+        digest: Optional[WebhookDelivery],
+        entries: List[Dict[str, Any]],
+        now: datetime,
+    ) -> WebhookDelivery:
+        """Store digest entries, opening a new digest if needed."""
+        body = dumps(
+            {
+                "event": WebhookEvent.DIGEST.value,
+                "tenant_id": subscription.tenant_id,
+                "count": len(entries),
+                "events": entries,
+                "timestamp": now,
+            }
+        ).decode()
+
+        if digest is None:
+            digest = WebhookDelivery(
+                tenant_id=subscription.tenant_id,
+                subscription_id=subscription.id,
+                event=WebhookEvent.DIGEST,
+                status=DeliveryStatus.BATCHING,
+                attempts=0,
+                next_attempt_at=now + timedelta(seconds=subscription.digest_window_seconds),
+            )
+            db.add(digest)
+        digest.body = body
+        return digest
+
+    @staticmethod
+    def fan_out(db: Session, events: Sequence[OutboxEvent]) -> int:
+        """
+        Queue deliveries for a batch of outbox events (outbox relay handler).
+
+        Payloads carry the deal as it is when the batch is relayed; events
+        of deals deleted in the meantime are dropped.
+
+        Args:
+            db: Database session (the relay's transaction)
+            events: Outbox events in id order
+
+        Returns:
+            Number of queued deliveries
+        """
+        pushed = [
+            (event, WebhookEvent(event.event_type))
+            for event in events
+            if event.event_type in WEBHOOK_EVENT_TYPES
+        ]
+        if not pushed:
+            return 0
+
+        deals = {
+            deal.id: deal
+            for deal in db.scalars(
+                select(Deal).where(Deal.id.in_({event.aggregate_id for event, _ in pushed}))
+            )
+        }
+
+        by_tenant: Dict[int, List[Tuple[WebhookEvent, Dict[str, Any]]]] = defaultdict(list)
+        for event, webhook_event in pushed:
+            deal = deals.get(event.aggregate_id)
+            if deal is not None:
+                by_tenant[event.tenant_id].append((webhook_event, deal_event_payload(webhook_event, deal)))
+
+        return sum(
+            WebhookService.enqueue(db, tenant_id, tenant_events)
+            for tenant_id, tenant_events in by_tenant.items()
+        )
+
+
+class WebhookDispatcher:
+    """Background worker delivering queued webhooks."""
+
+    def __init__(
+        self,
+        batch_size: int,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        endpoint_concurrency: int,
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            batch_size: Deliveries claimed per poll
+            max_attempts: Attempts before a delivery is dead-lettered
+            backoff_base: Delay before the first retry in seconds
+            backoff_max: Upper bound of the retry delay in seconds
+            endpoint_concurrency: Parallel requests per endpoint unless the
+                subscription sets its own limit
+        """
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.endpoint_concurrency = endpoint_concurrency
+        self._client: Optional[httpx.AsyncClient] = None
+        self._owns_client = False
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def create_client() -> httpx.AsyncClient:
+        """Create the pooled HTTP client shared by all deliveries."""
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.WEBHOOK_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=settings.WEBHOOK_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.WEBHOOK_MAX_CONNECTIONS,
+            ),
+            headers={"User-Agent": f"{settings.PROJECT_NAME}-Webhooks/{settings.VERSION}"},
+        )
+
+    def use_client(self, client: Optional[httpx.AsyncClient] = None) -> None:
+        """
+        Set the HTTP client used for deliveries.
+
+        Args:
+            client: Client to use (e.g. one bound to a stub receiver);
+                creates a pooled client if None
+        """
+        self._owns_client = client is None
+        self._client = client or self.create_client()
+        self._semaphores.clear()
+
+    def backoff(self, attempts: int) -> float:
+        """
+        Get the delay before the next attempt.
+
+        Exponential in the number of failed attempts with jitter, so
+        deliveries failing together do not retry in lockstep.
+
+        Args:
+            attempts: Attempts made so far
+
+        Returns:
+            Delay in seconds
+        """
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def dispatch(self, session_factory: Callable[[], AsyncSession]) -> int:
+        """
+        Deliver one batch of due deliveries.
+
+        Args:
+            session_factory: Async session factory
+
+        Returns:
+            Number of attempted deliveries
+        """
+        if self._client is None:
+            self.use_client()
+
+        async with session_factory() as db:
+            deliveries = await self._claim(db)
+        if not deliveries:
+            return 0
+
+        # No connection is held while waiting on receivers
+        outcomes = await asyncio.gather(*(self._send(delivery) for delivery in deliveries))
+
+        async with session_factory() as db:
+            await db.run_sync(self._record, deliveries, outcomes)
+            await db.commit()
+
+        return len(deliveries)
+
+    async def _claim(self, db: AsyncSession) -> List[Any]:
+        """
+        Claim due deliveries of active subscriptions.
+
+        Claiming pushes ``next_attempt_at`` past a lease, so overlapping
+        dispatchers (other workers) skip the batch. Digests whose window
+        closed are claimed too, which also closes them for new entries.
+
+        Bodies are read only after the claim: a fan-out holding the open
+        digest's row lock may still add entries until the claiming UPDATE
+        gets the row, and those entries must be part of the sent body.
+        """
+        now = datetime.utcnow()
+        candidates = (
+            await db.scalars(
+                select(WebhookDelivery.id)
+                .join(WebhookSubscription, WebhookSubscription.id == WebhookDelivery.subscription_id)
+                .where(
+                    WebhookDelivery.status.in_(DUE_STATUSES),
+                    WebhookDelivery.next_attempt_at <= now,
+                    WebhookSubscription.is_active.is_(True),
+                )
+                .order_by(WebhookDelivery.next_attempt_at, WebhookDelivery.id)
+                .limit(self.batch_size)
+            )
+        ).all()
+        if not candidates:
+            return []
+
+        claimed = (
+            await db.scalars(
+                update(WebhookDelivery)
+                .where(
+                    WebhookDelivery.id.in_(candidates),
+                    WebhookDelivery.status.in_(DUE_STATUSES),
+                    WebhookDelivery.next_attempt_at <= now,
+                )
+                .values(
+                    status=DeliveryStatus.PENDING,
+                    next_attempt_at=now + timedelta(seconds=DELIVERY_LEASE_SECONDS),
+                )
+                .returning(WebhookDelivery.id)
+            )
+        ).all()
+        if not claimed:
+            await db.commit()
+            return []
+
+        # Claimed rows are PENDING now, so no more digest entries are added
+        deliveries = (
+            await db.execute(
+                select(
+                    WebhookDelivery.id,
+                    WebhookDelivery.event,
+                    WebhookDelivery.body,
+                    WebhookDelivery.attempts,
+                    WebhookSubscription.url,
+                    WebhookSubscription.secret,
+                    WebhookSubscription.max_concurrency,
+                )
+                .join(WebhookSubscription, WebhookSubscription.id == WebhookDelivery.subscription_id)
+                .where(WebhookDelivery.id.in_(claimed))
+                .order_by(WebhookDelivery.id)
+            )
+        ).all()
+        await db.commit()
+        return deliveries
+
+    def _semaphore(self, url: str, limit: Optional[int]) -> asyncio.Semaphore:
+        """Get the semaphore capping parallel requests to an endpoint."""
+        semaphore = self._semaphores.get(url)
+        if semaphore is None:
+            semaphore = self._semaphores[url] = asyncio.Semaphore(limit or self.endpoint_concurrency)
+        return semaphore
+
+    async def _send(self, delivery: Any) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Post one delivery.
+
+        Returns:
+            (response status code, error) with error None on success
+        """
+        if not delivery.secret:
+            return None, "Subscription has no signing secret; rotate it to resume deliveries"
+
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Event": delivery.event.value,
+            "X-Webhook-Delivery": str(delivery.id),
+            "X-Webhook-Signature": sign_payload(delivery.body, delivery.secret),
+        }
+
+        async with self._semaphore(delivery.url, delivery.max_concurrency):
+            try:
+                # Checked again per request: DNS may have changed since
+                # the subscription was created
+                await check_target(delivery.url)
+                response = await self._client.post(
+                    delivery.url, content=delivery.body.encode(), headers=headers
+                )
+            except UnsafeTargetError as e:
+                return None, str(e)[:MAX_ERROR_LENGTH]
+            except httpx.HTTPError as e:
+                return None, f"{type(e).__name__}: {e}"[:MAX_ERROR_LENGTH]
+
+        # The response body is not stored: it is the receiver's content,
+        # not ours, and must not be readable through the deliveries API
+        if response.is_success:
+            return response.status_code, None
+        return response.status_code, f"HTTP {response.status_code}"
+
+    def _record(
+        self,
+        db: Session,
+        deliveries: Sequence[Any],
+        outcomes: Sequence[Tuple[Optional[int], Optional[str]]],
+    ) -> None:
+        """Write delivery outcomes with one executemany UPDATE."""
+        now = datetime.utcnow()
+        rows = []
+        for delivery, (status_code, error) in zip(deliveries, outcomes):
+            attempts = delivery.attempts + 1
+            if error is None:
+                status, next_attempt_at, delivered_at = DeliveryStatus.DELIVERED, now, now
+            elif attempts >= self.max_attempts:
+                status, next_attempt_at, delivered_at = DeliveryStatus.DEAD, now, None
+                logger.warning(
+                    f"Webhook delivery {delivery.id} to {delivery.url} dead-lettered "
+                    f"after {attempts} attempts: {error}"
+                )
+            else:
+                status, delivered_at = DeliveryStatus.PENDING, None
+                next_attempt_at = now + timedelta(seconds=self.backoff(attempts))
+            rows.append(
+                {
+                    "delivery_id": delivery.id,
+                    "n_status": status,
+                    "n_attempts": attempts,
+                    "n_next_attempt_at": next_attempt_at,
+                    "n_last_status_code": status_code,
+                    "n_last_error": error,
+                    "n_delivered_at": delivered_at,
+                }
+            )
+
+        deliveries_table = WebhookDelivery.__table__
+        db.execute(
+            update(deliveries_table)
+            .where(deliveries_table.c.id == bindparam("delivery_id"))
+            .values(
+                status=bindparam("n_status"),
+                attempts=bindparam("n_attempts"),
+                next_attempt_at=bindparam("n_next_attempt_at"),
+                last_status_code=bindparam("n_last_status_code"),
+                last_error=bindparam("n_last_error"),
+                delivered_at=bindparam("n_delivered_at"),
+            ),
+            rows,
+        )
+
+    def start(self, session_factory: Callable[[], AsyncSession], interval: float) -> None:
+        """
+        Start the background delivery loop.
+
+        Args:
+            session_factory: Async session factory
+            interval: Seconds between polls when the queue is drained
+        """
+        if self._task is None:
+            if self._client is None:
+                self.use_client()
+            self._task = asyncio.create_task(self._run(session_factory, interval))
+
+    async def stop(self) -> None:
+        """Stop the delivery loop and close the HTTP client."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+        self._client = None
+        self._semaphores.clear()
+
+    async def _run(self, session_factory: Callable[[], AsyncSession], interval: float) -> None:
+        """Deliver due webhooks, polling again right away while batches are full."""
+        while True:
+            try:
+                delivered = await self.dispatch(session_factory)
+            except Exception as e:
+                logger.error(f"Webhook dispatch failed: {e}")
+                delivered = 0
+            if delivered < self.batch_size:
+                await asyncio.sleep(interval)
+
+
+# Process-wide dispatcher started by the application
+webhook_dispatcher = WebhookDispatcher(
+    batch_size=settings.WEBHOOK_BATCH_SIZE,
+    max_attempts=settings.WEBHOOK_MAX_ATTEMPTS,
+    backoff_base=settings.WEBHOOK_BACKOFF_BASE_SECONDS,
+    backoff_max=settings.WEBHOOK_BACKOFF_MAX_SECONDS,
+    endpoint_concurrency=settings.WEBHOOK_ENDPOINT_CONCURRENCY,
+)
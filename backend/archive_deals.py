@@ -0,0 +1,40 @@
+"""
+Archive old closed deals and their activities.
+
+Moves closed-won/lost deals not updated for ARCHIVE_CLOSED_DEALS_AFTER_DAYS
+days into the archived_deals table. Meant to run periodically (e.g. a
+nightly cron job).
+
+Usage:
+    python archive_deals.py [--days 365] [--batch-size 200] [--tenant-id 1]
+"""
+import argparse
+
+from app.core.config import settings
+from app.db.database import SessionLocal, Base, engine
+from app.db.migrations import upgrade_schema
+from app.services.archive_service import ArchiveService
+
+
+def main() -> None:
+    """Run the archiving job."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=settings.ARCHIVE_CLOSED_DEALS_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--tenant-id", type=int, default=None)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+    db = SessionLocal()
+    try:
+        archived = ArchiveService.archive_closed_deals(db, args.days, args.batch_size, args.tenant_id)
+    finally:
+        db.close()
+
+    print(f"Archived {archived} closed deals older than {args.days} days")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: blocking Session vs AsyncSession inside async route handlers.
+
+Runs the same slow query through two handlers of a throwaway FastAPI app:
+
+- ``/sync``: ``async def`` handler calling a blocking SQLAlchemy ``Session``
+  (the pattern the routes used before the async database layer)
+- ``/async``: ``async def`` handler awaiting an ``AsyncSession`` (aiosqlite)
+
+While the slow requests are in flight, a fast ``/ping`` endpoint is polled
+to show how long other requests on the same worker have to wait.
+
+Usage:
+    python benchmarks/bench_async_db.py [--requests 20] [--rows 300000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+SLOW_QUERY = text(
+    "WITH RECURSIVE cnt(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM cnt WHERE x < :n) "
+    "SELECT count(*) FROM cnt"
+)
+
+
+def build_app(path: str, rows: int) -> FastAPI:
+    """Build the benchmark app against a SQLite file."""
+    sync_engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    SyncSession = sessionmaker(bind=sync_engine)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine)
+
+    app = FastAPI()
+
+    @app.get("/sync")
+    async def sync_handler():
+        with SyncSession() as db:
+            return {"count": db.execute(SLOW_QUERY, {"n": rows}).scalar()}
+
+    @app.get("/async")
+    async def async_handler():
+        async with AsyncSessionLocal() as db:
+            return {"count": (await db.execute(SLOW_QUERY, {"n": rows})).scalar()}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def run_scenario(app: FastAPI, path: str, requests: int) -> dict:
+    """Fire concurrent slow requests and measure ping latency meanwhile."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)  # Warm up connections
+
+        ping_latencies = []
+        done = asyncio.Event()
+
+        async def pinger():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/ping")
+                ping_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.005)
+
+        ping_task = asyncio.create_task(pinger())
+        started = time.perf_counter()
+        await asyncio.gather(*(client.get(path) for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await ping_task
+
+    return {
+        "elapsed": elapsed,
+        "throughput": requests / elapsed,
+        "ping_p50_ms": statistics.median(ping_latencies) * 1000,
+        "ping_max_ms": max(ping_latencies) * 1000,
+        "pings": len(ping_latencies),
+    }
+
+
+def main() -> None:
+    """Run both scenarios and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=300_000)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        app = build_app(path, args.rows)
+        print(f"{args.requests} concurrent slow queries ({args.rows} rows each)\n")
+        print(f"{'handler':<8} {'total s':>8} {'req/s':>8} {'ping p50 ms':>12} {'ping max ms':>12} {'pings':>6}")
+        for route in ("/sync", "/async"):
+            result = asyncio.run(run_scenario(app, route, args.requests))
+            print(
+                f"{route[1:]:<8} {result['elapsed']:>8.2f} {result['throughput']:>8.1f} "
+                f"{result['ping_p50_ms']:>12.1f} {result['ping_max_ms']:>12.1f} {result['pings']:>6}"
+            )
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
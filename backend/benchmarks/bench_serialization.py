@@ -0,0 +1,109 @@
+"""
+Benchmark: per-deal JSON serialization cost of deal list responses.
+
+Compares the previous response path with the orjson fast path:
+
+- ``pydantic``: ``DealResponse.model_validate`` per deal, ``next_actions``
+  assignment, then FastAPI-style re-validation of ``DealListResponse`` and
+  JSON encoding of the dumped model (``JSONResponse``)
+- ``fast``: ``deal_to_dict`` per deal encoded by ``FastJSONResponse``
+- ``adapter``: cached ``TypeAdapter(List[DealResponse])`` validate + dump_json
+
+Usage:
+    python benchmarks/bench_serialization.py [--deals 100] [--rounds 200]
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("DEBUG", "false")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.api.serializers import FastJSONResponse, deal_list_json, deal_to_dict  # noqa: E402
+from app.models.deal import Deal, DealStage  # noqa: E402
+from app.schemas.deal import DealListResponse, DealResponse  # noqa: E402
+
+NEXT_ACTIONS = ["Erstgespräch vereinbaren", "Bedarfsanalyse durchführen", "Entscheidungsträger identifizieren"]
+LIST_RESPONSE_ADAPTER = TypeAdapter(DealListResponse)
+
+
+def make_deals(count: int) -> list:
+    """Build loaded-looking transient deals."""
+    now = datetime.utcnow()
+    return [
+        Deal(
+            id=i,
+            tenant_id=1,
+            title=f"Deal {i}",
+            company_name="Siemens AG",
+            contact_person="Anna Schmidt",
+            contact_email="a.schmidt@example.com",
+            contact_phone="+49 89 123456",
+            value=Decimal("125000.00"),
+            stage=DealStage.PROPOSAL,
+            health_score=72,
+            last_contact_at=now - timedelta(days=2),
+            expected_close_date=now + timedelta(days=21),
+            notes="Budget freigegeben, Entscheidung im Q4",
+            created_at=now - timedelta(days=30),
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def pydantic_path(deals: list) -> bytes:
+    """Previous path: validate per deal, re-validate the model, encode."""
+    responses = []
+    for deal in deals:
+        response = DealResponse.model_validate(deal)
+        response.next_actions = NEXT_ACTIONS
+        responses.append(response)
+    content = DealListResponse(deals=responses, total=len(deals))
+    validated = LIST_RESPONSE_ADAPTER.validate_python(content)
+    return JSONResponse(LIST_RESPONSE_ADAPTER.dump_python(validated, mode="json")).body
+
+
+def fast_path(deals: list) -> bytes:
+    """Fast path: row dicts encoded by orjson."""
+    payload = {"deals": [deal_to_dict(deal, NEXT_ACTIONS) for deal in deals], "total": len(deals)}
+    return FastJSONResponse(payload).body
+
+
+def adapter_path(deals: list) -> bytes:
+    """Cached TypeAdapter: one validate + dump_json pass for the list."""
+    return deal_list_json(deals)
+
+
+def main() -> None:
+    """Time each path and print the per-deal cost."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--deals", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    deals = make_deals(args.deals)
+    print(f"{args.deals} deals per response, {args.rounds} rounds\n")
+    print(f"{'path':<10} {'µs/deal':>10} {'ms/response':>12} {'speedup':>8}")
+
+    baseline = None
+    for name, func in (("pydantic", pydantic_path), ("fast", fast_path), ("adapter", adapter_path)):
+        seconds = min(timeit.repeat(lambda: func(deals), number=args.rounds, repeat=3)) / args.rounds
+        baseline = baseline or seconds
+        print(
+            f"{name:<10} {seconds / args.deals * 1e6:>10.2f} {seconds * 1e3:>12.3f} "
+            f"{baseline / seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
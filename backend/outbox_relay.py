@@ -0,0 +1,54 @@
+"""
+Drain the transactional outbox.
+
+Hands deal and activity events to the outbox handlers (webhook fan-out)
+and deletes them. Run one or more of these next to the API when
+OUTBOX_RELAY_IN_PROCESS is disabled; concurrent relays skip each other's
+locked rows.
+
+Usage:
+    python outbox_relay.py [--batch-size 500] [--interval 0.5] [--once]
+"""
+import argparse
+import time
+
+from app.core.config import settings
+from app.db.database import SessionLocal, Base, engine
+from app.db.migrations import upgrade_schema
+from app.services.outbox import outbox_relay
+
+
+def main() -> None:
+    """Run the outbox relay."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+    parser.add_argument("--interval", type=float, default=settings.OUTBOX_RELAY_INTERVAL_SECONDS)
+    parser.add_argument("--once", action="store_true", help="Drain the outbox once and exit")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    outbox_relay.batch_size = args.batch_size
+
+    total = 0
+    try:
+        while True:
+            db = SessionLocal()
+            try:
+                handled = outbox_relay.relay(db)
+            finally:
+                db.close()
+
+            total += handled
+            if handled < args.batch_size:
+                if args.once:
+                    break
+                time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+    print(f"Relayed {total} outbox events")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,20 +7,21 @@ from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from random import randint, choice, uniform
 
-
-def now_utc():
-    """Get current UTC time with timezone awareness."""
-    return datetime.now(timezone.utc)
-
-
 from app.db.database import SessionLocal, Base, engine
+from app.db.migrations import upgrade_schema
 from app.models.user import User, Tenant
 from app.models.deal import Deal, DealStage
 from app.models.activity import Activity, ActivityType
 from app.core.security import get_password_hash
+from app.services.activity_counters import recount_activities
 from app.services.health_scoring import calculate_deal_health_score
 
 
+def now_utc():
+    """Get current UTC time with timezone awareness."""
+    return datetime.now(timezone.utc)
+
+
 # Realistic German B2B companies
 COMPANIES = [
     "Siemens AG",
@@ -114,8 +115,9 @@ def create_email(name, company):
     return f"{first.lower()}.{last.lower()}@{domain}.de"
 
 
-# Create tables
+# Create tables and upgrade older databases
 Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
 
 db = SessionLocal()
 
@@ -239,6 +241,7 @@ try:
 
             # System activity first
             db.add(Activity(
+                tenant_id=tenant.id,
                 deal_id=deal.id,
                 user_id=user.id,
                 activity_type=ActivityType.SYSTEM,
@@ -259,6 +262,7 @@ try:
                 description = template.format(contact=contact_name)
 
                 db.add(Activity(
+                    tenant_id=tenant.id,
                     deal_id=deal.id,
                     user_id=user.id,
                     activity_type=activity_type,
@@ -270,6 +274,8 @@ try:
 
             deals_created += 1
 
+    db.flush()
+    recount_activities(db, [deal_id for (deal_id,) in db.query(Deal.id).filter(Deal.tenant_id == tenant.id)])
     db.commit()
 
     print(f"\n✅ {deals_created} Deals erfolgreich erstellt")
@@ -2,11 +2,15 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.main import app
-from app.db.database import Base, get_db
+from app.db.database import Base, get_db, get_async_db, get_session_factory
 from app.core.security import create_access_token
+from app.services.contact_buffer import contact_buffer
+from app.core.rate_limit import rate_limiter
 
 # Test database
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
@@ -16,6 +20,15 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on the same database file. NullPool because the test client
+# may run each request on a different event loop.
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///./test.db", poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 
 def override_get_db():
     """Override database dependency for tests."""
@@ -26,7 +39,15 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    """Override async database dependency for tests."""
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
 
 
 @pytest.fixture(scope="function")
@@ -34,6 +55,8 @@ def db():
     """Create test database."""
     Base.metadata.create_all(bind=engine)
     yield TestingSessionLocal()
+    contact_buffer.clear()
+    rate_limiter.reset()
     Base.metadata.drop_all(bind=engine)
 
 
@@ -0,0 +1,217 @@
+"""Tests for activity timeline pagination."""
+from datetime import datetime, timedelta
+
+from app.models.activity import Activity, ActivityType
+
+
+def _create_timeline(client, headers, db, user):
+    """Create a deal with calls and emails at distinct times."""
+    deal = client.post(
+        "/api/deals",
+        json={"title": "Timeline", "company_name": "Siemens AG", "value": 10000.0},
+        headers=headers,
+    ).json()
+
+    start = datetime(2024, 1, 1, 9, 0)
+    for i in range(5):
+        db.add(
+            Activity(
+                tenant_id=user.tenant_id,
+                deal_id=deal["id"],
+                user_id=user.id,
+                activity_type=ActivityType.CALL if i % 2 == 0 else ActivityType.EMAIL,
+                title=f"Activity {i}",
+                created_at=start + timedelta(hours=i),
+            )
+        )
+    db.commit()
+    return deal["id"]
+
+
+def test_timeline_pages_newest_first(client, test_user_token, db):
+    """Test cursor pagination walks the timeline without gaps."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    deal_id = _create_timeline(client, headers, db, test_user_token["user"])
+
+    titles, cursor = [], None
+    while True:
+        params = {"limit": 2, "activity_type": "call"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(f"/api/activities/deal/{deal_id}", params=params, headers=headers)
+        assert response.status_code == 200
+        titles += [activity["title"] for activity in response.json()["activities"]]
+        cursor = response.json()["next_cursor"]
+        if not cursor:
+            break
+
+    assert titles == ["Activity 4", "Activity 2", "Activity 0"]
+
+
+def test_timeline_rejects_invalid_cursor(client, test_user_token, db):
+    """Test malformed cursors are rejected."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    deal_id = _create_timeline(client, headers, db, test_user_token["user"])
+
+    response = client.get(f"/api/activities/deal/{deal_id}", params={"cursor": "garbage"}, headers=headers)
+
+    assert response.status_code == 400
+
+
+def test_batch_ingestion_reports_per_item_results(client, test_user_token, db):
+    """Test batch ingestion writes valid items and advances last contact."""
+    from app.models.deal import Deal
+
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    deal = client.post(
+        "/api/deals",
+        json={"title": "Batch", "company_name": "SAP SE", "value": 5000.0},
+        headers=headers,
+    ).json()
+
+    updated_at = datetime(2024, 1, 1)
+    db.get(Deal, deal["id"]).updated_at = updated_at
+    db.commit()
+    latest = datetime.utcnow() - timedelta(minutes=1)
+    items = [
+        {"deal_id": deal["id"], "activity_type": "call", "title": "Call 1",
+         "created_at": (latest - timedelta(hours=2)).isoformat()},
+        {"deal_id": deal["id"], "activity_type": "email", "title": "Mail", "created_at": latest.isoformat()},
+        {"deal_id": 999999, "activity_type": "call", "title": "Unknown deal"},
+        {"deal_id": deal["id"], "activity_type": "fax", "title": "Invalid type"},
+        {"deal_id": deal["id"], "activity_type": "call", "title": "Future",
+         "created_at": (datetime.utcnow() + timedelta(days=1)).isoformat()},
+    ]
+
+    response = client.post("/api/activities/batch", json=items, headers=headers)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["created_count"] == 2
+    assert data["error_count"] == 3
+    assert [result["index"] for result in data["results"]] == [0, 1, 2, 3, 4]
+    assert data["results"][0]["id"] and data["results"][1]["id"]
+    assert data["results"][2]["errors"][0]["type"] == "not_found"
+    assert data["results"][3]["errors"][0]["loc"] == ["activity_type"]
+    assert data["results"][4]["errors"][0]["loc"] == ["created_at"]
+
+    db.expire_all()
+    stored = db.get(Deal, deal["id"])
+    assert stored.last_contact_at.replace(tzinfo=None) == latest
+    assert stored.updated_at.replace(tzinfo=None) == updated_at
+
+
+def test_activity_contact_is_buffered_and_flushed(client, test_user_token, db):
+    """Test last-contact bumps are merged into reads and flushed in one batch."""
+    import asyncio
+
+    from app.models.deal import Deal
+    from app.services.contact_buffer import contact_buffer
+    from tests.conftest import TestingAsyncSessionLocal
+
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    deal = client.post(
+        "/api/deals",
+        json={"title": "Hot deal", "company_name": "Bosch GmbH", "value": 20000.0},
+        headers=headers,
+    ).json()
+    stored = db.get(Deal, deal["id"])
+    stored.last_contact_at = None
+    db.commit()
+    updated_at = stored.updated_at
+
+    for i in range(3):
+        response = client.post(
+            "/api/activities",
+            json={"deal_id": deal["id"], "activity_type": "call", "title": f"Call {i}"},
+            headers=headers,
+        )
+        assert response.status_code == 201
+
+    # Not written yet, but visible to reads
+    db.expire_all()
+    assert db.get(Deal, deal["id"]).last_contact_at is None
+    assert client.get(f"/api/deals/{deal['id']}", headers=headers).json()["last_contact_at"]
+
+    assert asyncio.run(contact_buffer.flush(TestingAsyncSessionLocal)) == 1
+
+    db.expire_all()
+    stored = db.get(Deal, deal["id"])
+    assert stored.last_contact_at is not None
+    assert stored.updated_at.replace(tzinfo=None) == updated_at
+    assert contact_buffer.pending(deal["id"]) is None
+
+
+def test_feed_lists_tenant_activities_across_deals(client, test_user_token, db):
+    """Test the tenant feed merges deals, filters and pages."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    _create_timeline(client, headers, db, test_user_token["user"])
+    second = client.post(
+        "/api/deals",
+        json={"title": "Second", "company_name": "SAP SE", "value": 1000.0},
+        headers=headers,
+    ).json()
+    client.post(
+        "/api/activities",
+        json={"deal_id": second["id"], "activity_type": "email", "title": "Latest mail"},
+        headers=headers,
+    )
+
+    response = client.get("/api/activities/feed", params={"activity_type": "email"}, headers=headers)
+    assert response.status_code == 200
+    titles = [activity["title"] for activity in response.json()["activities"]]
+    assert titles == ["Latest mail", "Activity 3", "Activity 1"]
+
+    response = client.get(
+        "/api/activities/feed",
+        params={"since": "2024-01-01T11:00:00", "limit": 2, "user_id": test_user_token["user"].id},
+        headers=headers,
+    )
+    page = response.json()
+    assert len(page["activities"]) == 2
+    assert page["next_cursor"]
+
+    response = client.get("/api/activities/feed", params={"user_id": 999999}, headers=headers)
+    assert response.json() == {"activities": [], "next_cursor": None}
+
+
+def test_deal_activity_counters(client, test_user_token, db):
+    """Test counters follow single, batch and stage-change activities."""
+    from app.services.activity_counters import recount_activities
+
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    deal = client.post(
+        "/api/deals",
+        json={"title": "Counted", "company_name": "Bosch GmbH", "value": 7000.0},
+        headers=headers,
+    ).json()
+    assert deal["activity_count"] == 1
+    assert deal["last_activity_type"] == "system"
+
+    client.post(
+        "/api/activities",
+        json={"deal_id": deal["id"], "activity_type": "call", "title": "Call"},
+        headers=headers,
+    )
+    client.post(
+        "/api/activities/batch",
+        json=[
+            {"deal_id": deal["id"], "activity_type": "email", "title": "Mail 1"},
+            {"deal_id": deal["id"], "activity_type": "email", "title": "Mail 2"},
+        ],
+        headers=headers,
+    )
+    client.patch(f"/api/deals/{deal['id']}", json={"stage": "qualified"}, headers=headers)
+
+    data = client.get("/api/deals", headers=headers).json()["deals"][0]
+    assert data["activity_count"] == 5
+    assert data["activity_counts"] == {
+        "note": 0, "call": 1, "email": 2, "meeting": 0, "stage_change": 1, "system": 1,
+    }
+    assert data["last_activity_type"] == "stage_change"
+
+    # A recount from the activities table agrees with the maintained counters
+    recount_activities(db, [deal["id"]])
+    db.commit()
+    response = client.get(f"/api/deals/{deal['id']}", headers=headers)
+    assert response.json()["activity_counts"] == data["activity_counts"]
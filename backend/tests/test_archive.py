@@ -0,0 +1,64 @@
+"""Tests for archiving closed deals."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app.models.activity import Activity
+from app.models.deal import Deal
+from app.services.archive_service import ArchiveService
+
+
+def _create_closed_deal(client, headers, db, title, days_ago):
+    """Create a closed deal last updated ``days_ago`` days ago."""
+    deal = client.post(
+        "/api/deals",
+        json={"title": title, "company_name": "Siemens AG", "value": 9000.0, "stage": "closed_won"},
+        headers=headers,
+    ).json()
+    client.post(
+        "/api/activities",
+        json={"deal_id": deal["id"], "activity_type": "call", "title": f"Call {title}"},
+        headers=headers,
+    )
+    db.execute(
+        update(Deal)
+        .where(Deal.id == deal["id"])
+        .values(updated_at=datetime.utcnow() - timedelta(days=days_ago))
+    )
+    db.commit()
+    return deal["id"]
+
+
+def test_archive_moves_old_closed_deals(client, test_user_token, db):
+    """Test old closed deals leave the hot tables but stay readable."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    old_id = _create_closed_deal(client, headers, db, "Old", days_ago=400)
+    recent_id = _create_closed_deal(client, headers, db, "Recent", days_ago=10)
+
+    assert ArchiveService.archive_closed_deals(db, older_than_days=365) == 1
+
+    assert db.get(Deal, old_id) is None
+    assert db.query(Activity).filter(Activity.deal_id == old_id).count() == 0
+    assert db.get(Deal, recent_id) is not None
+
+    # Read-through
+    response = client.get(f"/api/deals/{old_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["Deal-Archived"] == "true"
+    assert response.json()["title"] == "Old"
+
+    response = client.get(f"/api/activities/deal/{old_id}", params={"limit": 1}, headers=headers)
+    page = response.json()
+    assert [activity["title"] for activity in page["activities"]] == ["Call Old"]
+    response = client.get(
+        f"/api/activities/deal/{old_id}",
+        params={"limit": 1, "cursor": page["next_cursor"]},
+        headers=headers,
+    )
+    assert [activity["title"] for activity in response.json()["activities"]] == ["Deal erstellt"]
+    assert response.json()["next_cursor"] is None
+
+    listing = client.get("/api/deals/archive", headers=headers).json()
+    assert listing["total"] == 1
+    assert listing["deals"][0]["deal_id"] == old_id
+    assert listing["deals"][0]["activity_count"] == 2
@@ -76,3 +76,168 @@ def test_login_nonexistent_user(client):
     )
 
     assert response.status_code == 401
+
+
+def test_token_decoded_once_per_request(client, test_user_token, monkeypatch):
+    """Test user and tenant dependencies share one token verification."""
+    from app.core import security
+
+    calls = []
+    original = security.decode_access_token
+
+    def counting_decode(token):
+        calls.append(token)
+        return original(token)
+
+    monkeypatch.setattr(security, "decode_access_token", counting_decode)
+    security.verified_tokens.clear()
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+
+    # create_deal depends on both the user and the tenant ID
+    response = client.post(
+        "/api/deals", json={"title": "Auth", "company_name": "SAP SE", "value": 100.0}, headers=headers
+    )
+    assert response.status_code == 201
+    assert len(calls) == 1
+
+    # Served from the verified-token cache
+    client.get("/api/deals", headers=headers)
+    assert len(calls) == 1
+
+
+def test_verified_token_cache_respects_expiry_and_size():
+    """Test expired entries are dropped and the cache stays bounded."""
+    import time
+
+    from app.core.security import Principal, VerifiedTokenCache
+
+    cache = VerifiedTokenCache(maxsize=2)
+    cache.put("expired", Principal(1, 1, time.time() - 1))
+    assert cache.get("expired") is None
+
+    valid_until = time.time() + 60
+    for token in ("a", "b", "c"):
+        cache.put(token, Principal(1, 1, valid_until))
+    assert cache.get("a") is None
+    assert cache.get("c") == Principal(1, 1, valid_until)
+
+
+def test_password_hashing_admission_control():
+    """Test the hasher rejects work beyond its pending limit."""
+    import asyncio
+
+    from fastapi import HTTPException
+
+    from app.core.hashing import PasswordHasher
+
+    hasher = PasswordHasher(workers=1, max_pending=1)
+
+    async def burst():
+        return await asyncio.gather(
+            hasher.hash("first-password"), hasher.hash("second-password"), return_exceptions=True
+        )
+
+    try:
+        hashed, rejected = asyncio.run(burst())
+        assert isinstance(rejected, HTTPException) and rejected.status_code == 503
+        assert asyncio.run(hasher.verify("first-password", hashed))
+
+        stats = hasher.stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        assert stats["pending"] == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_password_hashing_counts_cancelled_calls_until_done():
+    """Test a cancelled request keeps its slot while its hash still runs."""
+    import asyncio
+    import threading
+
+    from app.core.hashing import PasswordHasher
+
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    release = threading.Event()
+
+    async def cancel_running_call():
+        call = asyncio.ensure_future(hasher._submit(release.wait))
+        await asyncio.sleep(0.05)
+        call.cancel()
+        await asyncio.sleep(0.05)
+        return hasher.stats()["pending"]
+
+    try:
+        assert asyncio.run(cancel_running_call()) == 1
+        release.set()
+        hasher._executor.submit(lambda: None).result()
+        assert hasher.stats()["pending"] == 0
+    finally:
+        release.set()
+        hasher.shutdown()
+
+
+def test_metrics_require_admin(client, test_user_token, db):
+    """Test operational metrics are only served to admins."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+
+    assert client.get("/metrics/password-hashing").status_code in (401, 403)
+    assert client.get("/metrics/password-hashing", headers=headers).status_code == 403
+
+    test_user_token["user"].is_admin = True
+    db.commit()
+    response = client.get("/metrics/password-hashing", headers=headers)
+    assert response.status_code == 200
+    assert "pending" in response.json()
+
+
+def test_rate_limit_per_tenant_and_route_class(test_user_token):
+    """Test a tenant over budget gets 429 with Retry-After."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.core.rate_limit import MemoryBuckets, RateLimitMiddleware, classify
+
+    assert classify("POST", "/api/deals/bulk") == "bulk"
+    assert classify("GET", "/api/deals/12") == "ai"
+    assert classify("GET", "/api/deals/board") == "read"
+    assert classify("GET", "/health") is None
+
+    limited = FastAPI()
+    limited.add_middleware(
+        RateLimitMiddleware, backend=MemoryBuckets(), limits={"read": (0.001, 2), "write": (0.001, 1)}
+    )
+
+    @limited.get("/api/things")
+    @limited.post("/api/things")
+    async def things():
+        return {"ok": True}
+
+    client = TestClient(limited)
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+
+    statuses = [client.get("/api/things", headers=headers).status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+
+    response = client.get("/api/things", headers=headers)
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.headers["X-RateLimit-Class"] == "read"
+
+    # Writes have their own budget; requests without a valid token are keyed by address
+    assert client.post("/api/things", headers=headers).status_code == 200
+    statuses = [client.get("/api/things").status_code for _ in range(2)]
+    statuses.append(client.get("/api/things", headers={"Authorization": "Bearer invalid"}).status_code)
+    assert statuses == [200, 200, 429]
+
+
+def test_rate_limit_charges_ai_calls():
+    """Test AI-backed list requests cost one token per Gemini call they can make."""
+    from app.core.config import settings
+    from app.core.rate_limit import request_cost
+
+    cap = settings.AI_SUGGESTIONS_PER_REQUEST
+    assert request_cost("ai", "GET", "/api/deals", b"") == cap
+    assert request_cost("ai", "GET", "/api/deals", b"limit=1") == 1
+    assert request_cost("ai", "GET", "/api/deals/insights/summary", b"") == cap
+    assert request_cost("ai", "GET", "/api/deals/12", b"") == 1
+    assert request_cost("read", "GET", "/api/deals/board", b"") == 1
@@ -0,0 +1,68 @@
+"""Tests for the pipeline board endpoints."""
+
+
+def _create_deals(client, headers):
+    """Create deals across two stages."""
+    deals = [
+        {"title": f"Lead {i}", "company_name": "Siemens AG", "value": 1000.0 * (i + 1), "stage": "lead"}
+        for i in range(5)
+    ] + [{"title": "Proposal", "company_name": "SAP SE", "value": 50000.0, "stage": "proposal"}]
+    response = client.post("/api/deals/bulk", json=deals, headers=headers)
+    assert response.status_code == 201
+
+
+def test_board_returns_top_deals_and_aggregates_per_stage(client, test_user_token):
+    """Test per-stage counts, sums and top-N ordering."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    _create_deals(client, headers)
+
+    response = client.get("/api/deals/board", params={"per_stage": 2, "sort": "-value"}, headers=headers)
+
+    assert response.status_code == 200
+    columns = {column["stage"]: column for column in response.json()["columns"]}
+    assert set(columns) == {"lead", "qualified", "proposal", "negotiation", "closed_won", "closed_lost"}
+
+    lead = columns["lead"]
+    assert lead["count"] == 5
+    assert float(lead["total_value"]) == 15000.0
+    assert [deal["title"] for deal in lead["deals"]] == ["Lead 4", "Lead 3"]
+    assert lead["next_cursor"]
+
+    assert columns["proposal"]["count"] == 1
+    assert columns["proposal"]["next_cursor"] is None
+    assert columns["qualified"] == {
+        "stage": "qualified", "count": 0, "total_value": "0", "deals": [], "next_cursor": None,
+    }
+
+
+def test_board_column_pages_with_cursor(client, test_user_token):
+    """Test loading the rest of a column with keyset cursors."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    _create_deals(client, headers)
+
+    board = client.get("/api/deals/board", params={"per_stage": 2, "sort": "-value"}, headers=headers)
+    cursor = next(c for c in board.json()["columns"] if c["stage"] == "lead")["next_cursor"]
+
+    titles = []
+    while cursor:
+        response = client.get(
+            "/api/deals/board/lead",
+            params={"cursor": cursor, "limit": 2, "sort": "-value"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        titles += [deal["title"] for deal in response.json()["deals"]]
+        cursor = response.json()["next_cursor"]
+
+    assert titles == ["Lead 2", "Lead 1", "Lead 0"]
+
+
+def test_board_rejects_bad_cursor_and_sort(client, test_user_token):
+    """Test invalid cursors and unsupported sorts."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+
+    response = client.get("/api/deals/board/lead", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400
+
+    response = client.get("/api/deals/board", params={"sort": "title"}, headers=headers)
+    assert response.status_code == 422
@@ -0,0 +1,104 @@
+"""Tests for bulk deal endpoints."""
+from app.models.activity import Activity, ActivityType
+
+
+def test_bulk_create_deals(client, test_user_token, db):
+    """Test bulk creation writes deals and their system activities."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    deals = [
+        {"title": f"Bulk Deal {i}", "company_name": f"Company {i}", "value": 1000.0 + i}
+        for i in range(250)
+    ]
+
+    response = client.post("/api/deals/bulk", json=deals, headers=headers)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["created_count"] == 250
+    assert data["error_count"] == 0
+    assert [deal["title"] for deal in data["created"]] == [deal["title"] for deal in deals]
+    assert all(deal["health_score"] > 0 for deal in data["created"])
+
+    activity_count = (
+        db.query(Activity).filter(Activity.activity_type == ActivityType.SYSTEM).count()
+    )
+    assert activity_count == 250
+
+
+def test_bulk_create_reports_row_errors(client, test_user_token):
+    """Test invalid rows are reported without aborting the batch."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    deals = [
+        {"title": "Valid", "company_name": "Valid GmbH", "value": 5000.0},
+        {"title": "", "company_name": "Invalid GmbH", "value": 5000.0},
+        {"title": "Negative", "company_name": "Invalid AG", "value": -1},
+        {"title": "Also valid", "company_name": "Valid AG", "value": 100.0},
+    ]
+
+    response = client.post("/api/deals/bulk", json=deals, headers=headers)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["created_count"] == 2
+    assert [error["index"] for error in data["errors"]] == [1, 2]
+    assert data["errors"][1]["errors"][0]["loc"] == ["value"]
+
+
+def test_bulk_create_empty_rejected(client, test_user_token):
+    """Test that an empty bulk request is rejected."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+
+    response = client.post("/api/deals/bulk", json=[], headers=headers)
+
+    assert response.status_code == 400
+
+
+def test_bulk_update_deals(client, test_user_token, db):
+    """Test bulk update applies typed changes and logs stage changes."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    created = client.post(
+        "/api/deals/bulk",
+        json=[
+            {"title": f"Deal {i}", "company_name": "Update AG", "value": 1000.0}
+            for i in range(3)
+        ],
+        headers=headers,
+    ).json()["created"]
+    ids = [deal["id"] for deal in created]
+
+    response = client.patch(
+        "/api/deals/bulk-update",
+        json=[
+            {"id": ids[0], "stage": "negotiation"},
+            {"id": ids[1], "value": 50000},
+            {"id": ids[2], "stage": "proposal", "notes": "Pipeline review"},
+            {"id": 999999, "stage": "qualified"},
+        ],
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [deal["id"] for deal in data] == ids
+    assert data[0]["stage"] == "negotiation"
+    assert float(data[1]["value"]) == 50000.0
+    assert data[2]["notes"] == "Pipeline review"
+    assert all(deal["last_contact_at"] for deal in data)
+
+    stage_changes = (
+        db.query(Activity).filter(Activity.activity_type == ActivityType.STAGE_CHANGE).count()
+    )
+    assert stage_changes == 2
+
+
+def test_bulk_update_validates_fields(client, test_user_token):
+    """Test bulk update items are validated against DealUpdate."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+
+    response = client.patch(
+        "/api/deals/bulk-update",
+        json=[{"id": 1, "stage": "not-a-stage"}],
+        headers=headers,
+    )
+
+    assert response.status_code == 422
@@ -0,0 +1,151 @@
+"""Tests for the deal change feed."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, update
+
+from app.core.security import create_access_token
+from app.models.deal import Deal
+from app.models.user import Tenant
+from app.services.archive_service import ArchiveService
+from tests.conftest import async_engine
+
+
+def _changes(client, headers, since=None, limit=100):
+    """Get one page of the change feed."""
+    params = {"limit": limit}
+    if since:
+        params["since"] = since
+    response = client.get("/api/deals/changes", params=params, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _create(client, headers, title, **extra):
+    """Create a deal and return its ID."""
+    return client.post(
+        "/api/deals",
+        json={"title": title, "company_name": "Bosch", "value": 1000.0, **extra},
+        headers=headers,
+    ).json()["id"]
+
+
+def test_feed_pages_through_changes_and_resumes(client, test_user_token, db):
+    """Test creates, updates and deletes are paged in order and resumable."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    first, second, third = (_create(client, headers, f"Deal {index}") for index in range(3))
+
+    page = _changes(client, headers, limit=2)
+    assert [change["deal_id"] for change in page["changes"]] == [first, second]
+    assert page["has_more"]
+    page = _changes(client, headers, page["next_cursor"], limit=2)
+    assert [change["deal_id"] for change in page["changes"]] == [third]
+    assert not page["has_more"]
+
+    # Nothing new: empty page, same position
+    cursor = page["next_cursor"]
+    page = _changes(client, headers, cursor)
+    assert page["changes"] == [] and page["next_cursor"] == cursor
+
+    client.patch(f"/api/deals/{first}", json={"notes": "Call back"}, headers=headers)
+    client.patch(f"/api/deals/{first}", json={"value": 2000.0}, headers=headers)
+    client.post(
+        "/api/activities",
+        json={"deal_id": second, "activity_type": "call", "title": "Kickoff"},
+        headers=headers,
+    )
+    client.delete(f"/api/deals/{third}", headers=headers)
+
+    page = _changes(client, headers, cursor)
+    changes = page["changes"]
+    # Two updates of one deal show up once, with the latest state
+    assert [(change["deal_id"], change["deleted"]) for change in changes] == [
+        (first, False),
+        (second, False),
+        (third, True),
+    ]
+    assert changes[0]["deal"]["notes"] == "Call back"
+    assert changes[0]["deal"]["value"] == "2000.00"
+    assert changes[2]["reason"] == "deleted" and changes[2]["deal"] is None
+    assert [change["change_seq"] for change in changes] == sorted(
+        change["change_seq"] for change in changes
+    )
+
+
+def test_feed_covers_bulk_writes_and_archiving(client, test_user_token, db):
+    """Test bulk writes and archiving advance the feed."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    closed = _create(client, headers, "Closed", stage="closed_won")
+    cursor = _changes(client, headers)["next_cursor"]
+
+    created = client.post(
+        "/api/deals/bulk",
+        json=[{"title": f"Bulk {index}", "company_name": "SAP", "value": 500.0} for index in range(2)],
+        headers=headers,
+    ).json()["created"]
+    bulk_ids = [deal["id"] for deal in created]
+    client.patch("/api/deals/bulk-update", json=[{"id": bulk_ids[0], "value": 800.0}], headers=headers)
+
+    db.execute(
+        update(Deal).where(Deal.id == closed).values(updated_at=datetime.utcnow() - timedelta(days=400))
+    )
+    db.commit()
+    assert ArchiveService.archive_closed_deals(db, older_than_days=365) == 1
+
+    changes = _changes(client, headers, cursor)["changes"]
+    assert [(change["deal_id"], change["reason"]) for change in changes] == [
+        (bulk_ids[1], None),
+        (bulk_ids[0], None),
+        (closed, "archived"),
+    ]
+    assert changes[1]["deal"]["value"] == "800.00"
+
+
+def test_feed_is_tenant_scoped_and_rejects_bad_cursors(client, test_user_token, db):
+    """Test other tenants' changes are not visible and bad cursors are rejected."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    _create(client, headers, "Mine")
+
+    tenant = Tenant(name="Other Tenant", subdomain="other")
+    db.add(tenant)
+    db.commit()
+    token = create_access_token(data={"sub": str(test_user_token["user"].id), "tenant_id": str(tenant.id)})
+    other = {"Authorization": f"Bearer {token}"}
+    assert _changes(client, other)["changes"] == []
+
+    response = client.get("/api/deals/changes", params={"since": "garbage"}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_activity_writes_update_each_deal_once(client, test_user_token, db):
+    """Test activity writes stamp the change sequence in the counter UPDATE."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    first, second = (_create(client, headers, f"Deal {index}") for index in range(2))
+    cursor = _changes(client, headers)["next_cursor"]
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split(None, 2)[:2])
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        client.post(
+            "/api/activities",
+            json={"deal_id": first, "activity_type": "call", "title": "Kickoff"},
+            headers=headers,
+        )
+        client.post(
+            "/api/activities/batch",
+            json=[
+                {"deal_id": deal_id, "activity_type": "email", "title": f"Mail {index}"}
+                for index, deal_id in enumerate([second, second, first])
+            ],
+            headers=headers,
+        )
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    assert statements.count(["UPDATE", "deals"]) == 2
+    changes = _changes(client, headers, cursor)["changes"]
+    assert [change["deal_id"] for change in changes] == [first, second]
+    assert changes[1]["deal"]["activity_count"] == 3
+    assert changes[1]["deal"]["last_contact_at"] is not None
@@ -0,0 +1,55 @@
+"""Tests for connection pool settings and statistics."""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from app.db.pool_metrics import pool_metrics, pool_options
+
+
+@pytest.fixture
+def small_pool(tmp_path, monkeypatch):
+    """Create an engine with a one-connection monitored pool."""
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", False)
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **pool_options("test", url))
+    yield engine
+    engine.dispose()
+    pool_metrics.pop("test")
+
+
+def test_pool_reports_checkouts_waits_and_invalidations(small_pool, client, test_user_token, db):
+    """Test pool settings apply and checkouts, timeouts and invalidations are counted."""
+    connection = small_pool.connect()
+    connection.execute(text("SELECT 1"))
+
+    # The only connection is checked out
+    with pytest.raises(PoolTimeoutError):
+        small_pool.connect()
+
+    connection.invalidate()
+    connection.close()
+    with small_pool.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert client.get("/metrics/db-pool").status_code in (401, 403)
+
+    test_user_token["user"].is_admin = True
+    db.commit()
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    response = client.get("/metrics/db-pool", headers=headers)
+    assert response.status_code == 200
+    stats = response.json()["pools"]["test"]
+    assert stats["pool_size"] == 1
+    assert stats["max_overflow"] == 0
+    assert stats["pre_ping"] is False
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["queued_checkouts"] >= 1
+    assert stats["max_wait_ms"] >= 50
+    assert stats["invalidations"] == 1
+    assert stats["connections_opened"] == 2
+    assert stats["checked_out"] == 0 and stats["idle"] == 1
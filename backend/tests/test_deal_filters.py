@@ -0,0 +1,77 @@
+"""Tests for server-side deal filtering and sorting."""
+from datetime import datetime, timedelta
+
+
+def _create_deals(client, headers):
+    """Create a small pipeline to filter."""
+    deals = [
+        {"title": "Alpha", "company_name": "Siemens AG", "value": 5000.0, "stage": "lead"},
+        {"title": "Beta", "company_name": "SAP Deutschland", "value": 25000.0, "stage": "qualified"},
+        {"title": "Gamma", "company_name": "Bosch GmbH", "value": 150000.0, "stage": "negotiation",
+         "expected_close_date": (datetime.utcnow() + timedelta(days=10)).isoformat()},
+        {"title": "Delta", "company_name": "Siemens Energy", "value": 80000.0, "stage": "proposal"},
+    ]
+    for deal in deals:
+        response = client.post("/api/deals", json=deal, headers=headers)
+        assert response.status_code == 201
+
+
+def test_filter_by_value_range_and_stages(client, test_user_token):
+    """Test value range combined with a multi-stage set."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    _create_deals(client, headers)
+
+    response = client.get(
+        "/api/deals",
+        params={"min_value": 10000, "stages": ["qualified", "proposal", "lead"]},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert {deal["title"] for deal in data["deals"]} == {"Beta", "Delta"}
+
+
+def test_filter_by_company_prefix_and_close_window(client, test_user_token):
+    """Test company prefix and expected-close window filters."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    _create_deals(client, headers)
+
+    response = client.get("/api/deals", params={"company_prefix": "Siemens"}, headers=headers)
+    assert {deal["title"] for deal in response.json()["deals"]} == {"Alpha", "Delta"}
+
+    response = client.get(
+        "/api/deals",
+        params={"close_before": (datetime.utcnow() + timedelta(days=30)).isoformat()},
+        headers=headers,
+    )
+    assert [deal["title"] for deal in response.json()["deals"]] == ["Gamma"]
+
+
+def test_multi_key_sort_and_pagination_total(client, test_user_token):
+    """Test sorting by multiple keys keeps the total across pages."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    _create_deals(client, headers)
+
+    response = client.get(
+        "/api/deals",
+        params={"sort": "-value,title", "limit": 2},
+        headers=headers,
+    )
+
+    data = response.json()
+    assert data["total"] == 4
+    assert [deal["title"] for deal in data["deals"]] == ["Gamma", "Delta"]
+
+    response = client.get("/api/deals", params={"skip": 10}, headers=headers)
+    assert response.json() == {"deals": [], "total": 4}
+
+
+def test_invalid_sort_key_rejected(client, test_user_token):
+    """Test that only whitelisted sort keys are accepted."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+
+    response = client.get("/api/deals", params={"sort": "hashed_password"}, headers=headers)
+
+    assert response.status_code == 422
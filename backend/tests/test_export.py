@@ -0,0 +1,80 @@
+"""Tests for streaming deal and activity exports."""
+import csv
+import gzip
+import io
+import json
+
+
+def _create_deals(client, headers, count=3):
+    """Create deals to export."""
+    return client.post(
+        "/api/deals/bulk",
+        json=[
+            {"title": f"Export {i}", "company_name": "Export GmbH", "value": 1000 + i}
+            for i in range(count)
+        ],
+        headers=headers,
+    ).json()["created"]
+
+
+def test_export_deals_csv(client, test_user_token):
+    """Test CSV export honours the deal list filters."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    _create_deals(client, headers)
+
+    response = client.get(
+        "/api/deals/export",
+        params={"format": "csv", "min_value": 1001, "sort": "value"},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == ["Export 1", "Export 2"]
+    assert rows[0]["stage"] == "lead"
+
+
+def test_export_deals_ndjson_gzip(client, test_user_token):
+    """Test gzip-compressed NDJSON export."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    _create_deals(client, headers, count=5)
+
+    response = client.get(
+        "/api/deals/export",
+        params={"format": "ndjson", "gzip": True},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    lines = gzip.decompress(response.content).decode().splitlines()
+    deals = [json.loads(line) for line in lines]
+    assert len(deals) == 5
+    assert deals[0]["company_name"] == "Export GmbH"
+
+
+def test_export_activities(client, test_user_token):
+    """Test activity export is scoped to the tenant's deals."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    deals = _create_deals(client, headers, count=2)
+
+    response = client.get(
+        "/api/activities/export",
+        params={"format": "ndjson", "deal_id": deals[0]["id"]},
+        headers=headers,
+    )
+
+    activities = [json.loads(line) for line in response.text.splitlines()]
+    assert len(activities) == 1
+    assert activities[0]["activity_type"] == "system"
+
+
+def test_export_invalid_format(client, test_user_token):
+    """Test that unknown export formats are rejected."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+
+    response = client.get("/api/deals/export", params={"format": "xml"}, headers=headers)
+
+    assert response.status_code == 422
@@ -0,0 +1,77 @@
+"""Tests for Idempotency-Key handling on write endpoints."""
+from app.models.deal import Deal
+
+
+def test_create_deal_replay(client, test_user_token, db):
+    """Test a retried create with the same key returns the stored response."""
+    headers = {
+        "Authorization": f"Bearer {test_user_token['token']}",
+        "Idempotency-Key": "create-1",
+    }
+    payload = {"title": "Idempotent Deal", "company_name": "Retry GmbH", "value": 1000.0}
+
+    first = client.post("/api/deals", json=payload, headers=headers)
+    second = client.post("/api/deals", json=payload, headers=headers)
+
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert second.headers["idempotent-replayed"] == "true"
+    # AI recommendations are generated after the commit and not stored
+    assert first.json()["next_actions"]
+    assert second.json() == {**first.json(), "next_actions": None}
+    assert db.query(Deal).count() == 1
+
+
+def test_bulk_create_replay(client, test_user_token, db):
+    """Test a retried bulk create does not create the deals again."""
+    headers = {
+        "Authorization": f"Bearer {test_user_token['token']}",
+        "Idempotency-Key": "bulk-1",
+    }
+    payload = [
+        {"title": f"Bulk {i}", "company_name": "Retry AG", "value": 100.0}
+        for i in range(10)
+    ]
+
+    first = client.post("/api/deals/bulk", json=payload, headers=headers)
+    second = client.post("/api/deals/bulk", json=payload, headers=headers)
+
+    assert second.json() == first.json()
+    assert db.query(Deal).count() == 10
+
+
+def test_key_reused_with_different_payload(client, test_user_token):
+    """Test reusing a key for a different request is rejected."""
+    headers = {
+        "Authorization": f"Bearer {test_user_token['token']}",
+        "Idempotency-Key": "reused",
+    }
+
+    client.post(
+        "/api/deals",
+        json={"title": "First", "company_name": "A", "value": 1.0},
+        headers=headers,
+    )
+    response = client.post(
+        "/api/deals",
+        json={"title": "Second", "company_name": "B", "value": 2.0},
+        headers=headers,
+    )
+
+    assert response.status_code == 422
+
+
+def test_failed_request_releases_key(client, test_user_token):
+    """Test a key is released when the original request fails."""
+    headers = {
+        "Authorization": f"Bearer {test_user_token['token']}",
+        "Idempotency-Key": "activity-1",
+    }
+    payload = {"deal_id": 12345, "activity_type": "call", "title": "Call"}
+
+    first = client.post("/api/activities", json=payload, headers=headers)
+    second = client.post("/api/activities", json=payload, headers=headers)
+
+    assert first.status_code == 404
+    assert second.status_code == 404
+    assert "idempotent-replayed" not in second.headers
@@ -0,0 +1,89 @@
+"""Tests for streaming deal imports."""
+import json
+
+
+def test_import_csv(client, test_user_token):
+    """Test CSV import commits valid rows in chunks and counts errors."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    lines = ["title,company_name,value,stage"]
+    lines += [f"Import {i},Firma {i} GmbH,{1000 + i},qualified" for i in range(25)]
+    lines.append("Broken,Firma X,-5,lead")
+    lines.append(",Firma Y,100,lead")
+    content = "\n".join(lines).encode()
+
+    response = client.post(
+        "/api/deals/import",
+        params={"chunk_size": 10},
+        files={"file": ("deals.csv", content, "text/csv")},
+        headers=headers,
+    )
+
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    # Background task has run by the time the test client returns
+    job = client.get(f"/api/deals/import/{job_id}", headers=headers).json()
+    assert job["status"] == "completed"
+    assert job["file_format"] == "csv"
+    assert job["processed_rows"] == 27
+    assert job["imported_rows"] == 25
+    assert job["failed_rows"] == 2
+    assert [error["index"] for error in job["errors"]] == [25, 26]
+
+    deals = client.get("/api/deals", params={"stages": ["qualified"]}, headers=headers).json()
+    assert deals["total"] == 25
+
+
+def test_import_csv_reports_undecodable_rows(client, test_user_token):
+    """Test invalid UTF-8 in a later chunk fails only that row."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    lines = [b"title,company_name,value"]
+    lines += [f"Import {i},Firma {i} GmbH,{1000 + i}".encode() for i in range(12)]
+    lines.insert(11, b"M\xfcller,Firma \xff GmbH,500")
+    content = b"\n".join(lines)
+
+    response = client.post(
+        "/api/deals/import",
+        params={"chunk_size": 5},
+        files={"file": ("deals.csv", content, "text/csv")},
+        headers=headers,
+    )
+
+    job = client.get(f"/api/deals/import/{response.json()['id']}", headers=headers).json()
+    assert job["status"] == "completed"
+    assert job["processed_rows"] == 13
+    assert job["imported_rows"] == 12
+    assert job["errors"] == [
+        {"index": 10, "errors": [{"type": "parse_error", "msg": "Invalid UTF-8"}]}
+    ]
+
+
+def test_import_ndjson(client, test_user_token):
+    """Test NDJSON import reports unparseable lines."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    lines = [json.dumps({"title": "NDJSON Deal", "company_name": "Stream AG", "value": 500})]
+    lines.append("{not json")
+    lines.append(json.dumps({"title": "Second", "company_name": "Stream AG", "value": 700}))
+    content = "\n".join(lines).encode()
+
+    response = client.post(
+        "/api/deals/import",
+        files={"file": ("deals.ndjson", content, "application/x-ndjson")},
+        headers=headers,
+    )
+
+    job = client.get(f"/api/deals/import/{response.json()['id']}", headers=headers).json()
+    assert job["file_format"] == "ndjson"
+    assert job["imported_rows"] == 2
+    assert job["failed_rows"] == 1
+    assert job["errors"][0]["index"] == 1
+    assert job["errors"][0]["errors"][0]["type"] == "parse_error"
+
+
+def test_import_job_not_found(client, test_user_token):
+    """Test polling an unknown import job."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+
+    response = client.get("/api/deals/import/9999", headers=headers)
+
+    assert response.status_code == 404
@@ -0,0 +1,131 @@
+"""Tests for startup upgrades of existing databases."""
+import asyncio
+
+from sqlalchemy import inspect, text
+
+from app.db.migrations import upgrade_schema
+from app.services.outbox import outbox_relay
+from tests.conftest import TestingAsyncSessionLocal, engine
+
+
+def test_upgrade_backfills_activity_tenant_id(client, test_user_token, db):
+    """Test activities of an older database get their deals' tenant."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    deal = client.post(
+        "/api/deals",
+        json={"title": "Legacy", "company_name": "SAP SE", "value": 1000.0},
+        headers=headers,
+    ).json()
+
+    # Activities table as created before activities had a tenant_id
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE activities"))
+        conn.execute(text(
+            "CREATE TABLE activities ("
+            "id INTEGER NOT NULL PRIMARY KEY, "
+            "deal_id INTEGER NOT NULL REFERENCES deals (id), "
+            "user_id INTEGER NOT NULL REFERENCES users (id), "
+            "activity_type VARCHAR(12) NOT NULL, "
+            "title VARCHAR(255) NOT NULL, "
+            "description VARCHAR(2000), "
+            "created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL)"
+        ))
+        conn.execute(
+            text("INSERT INTO activities (deal_id, user_id, activity_type, title) VALUES (:deal, :user, 'CALL', 'Old')"),
+            {"deal": deal["id"], "user": test_user_token["user"].id},
+        )
+
+    upgrade_schema(engine)
+    upgrade_schema(engine)  # Idempotent
+
+    with engine.connect() as conn:
+        tenant_ids = conn.execute(text("SELECT tenant_id FROM activities")).scalars().all()
+    assert tenant_ids == [test_user_token["tenant"].id]
+    assert "ix_activities_tenant_created_at" in {
+        index["name"] for index in inspect(engine).get_indexes("activities")
+    }
+
+    response = client.get("/api/activities/feed", headers=headers)
+    assert response.status_code == 200
+    assert [activity["title"] for activity in response.json()["activities"]] == ["Old"]
+
+
+def test_upgrade_backfills_activity_counters(client, test_user_token, db):
+    """Test counter columns added to an older deals table are recounted."""
+    from app.db.migrations import ACTIVITY_COUNTER_COLUMNS
+
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    deal = client.post(
+        "/api/deals",
+        json={"title": "Legacy", "company_name": "SAP SE", "value": 1000.0},
+        headers=headers,
+    ).json()
+    for activity_type in ("call", "call", "note"):
+        client.post(
+            "/api/activities",
+            json={"deal_id": deal["id"], "activity_type": activity_type, "title": "Old"},
+            headers=headers,
+        )
+
+    # Deals table as created before the counters existed
+    with engine.begin() as conn:
+        for name in ACTIVITY_COUNTER_COLUMNS:
+            conn.execute(text(f"ALTER TABLE deals DROP COLUMN {name}"))
+
+    upgrade_schema(engine)
+
+    with engine.connect() as conn:
+        counts = conn.execute(
+            text("SELECT activity_count, call_count, note_count, last_activity_at FROM deals WHERE id = :id"),
+            {"id": deal["id"]},
+        ).one()
+    activities = client.get(f"/api/activities/deal/{deal['id']}", headers=headers).json()["activities"]
+    assert counts.activity_count == len(activities)
+    assert (counts.call_count, counts.note_count) == (2, 1)
+    assert counts.last_activity_at is not None
+
+
+def test_upgrade_adds_change_sequences(client, test_user_token, db):
+    """Test existing deals appear in the change feed after the upgrade."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    deal = client.post(
+        "/api/deals",
+        json={"title": "Legacy", "company_name": "SAP SE", "value": 1000.0},
+        headers=headers,
+    ).json()
+
+    # Tables as created before the change feed existed
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_deals_tenant_change_seq"))
+        conn.execute(text("ALTER TABLE deals DROP COLUMN change_seq"))
+        conn.execute(text("ALTER TABLE tenants DROP COLUMN change_seq"))
+
+    upgrade_schema(engine)
+
+    changes = client.get("/api/deals/changes", headers=headers).json()
+    assert [(change["deal_id"], change["change_seq"]) for change in changes["changes"]] == [(deal["id"], 0)]
+
+    client.patch(f"/api/deals/{deal['id']}", json={"title": "Renamed"}, headers=headers)
+    changes = client.get("/api/deals/changes", params={"since": changes["next_cursor"]}, headers=headers).json()
+    assert [change["change_seq"] for change in changes["changes"]] == [1]
+
+
+def test_upgrade_adds_outbox_failure_columns(client, test_user_token, db):
+    """Test queued outbox events of an older database are relayed after the upgrade."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    client.post(
+        "/api/deals",
+        json={"title": "Legacy", "company_name": "SAP SE", "value": 1000.0},
+        headers=headers,
+    )
+
+    # Outbox table as created before failures were tracked
+    with engine.begin() as conn:
+        for name in ("attempts", "last_error", "failed_at"):
+            conn.execute(text(f"ALTER TABLE outbox DROP COLUMN {name}"))
+
+    upgrade_schema(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT attempts, failed_at FROM outbox")).all() == [(0, None)]
+    assert asyncio.run(outbox_relay.drain(TestingAsyncSessionLocal)) == 1
@@ -0,0 +1,121 @@
+"""Tests for the transactional outbox."""
+import asyncio
+
+from app.models.outbox import OutboxEvent
+from app.services.outbox import OutboxRelay
+from tests.conftest import TestingAsyncSessionLocal
+
+
+def _event_types(db):
+    """Get the outbox event types in order."""
+    return [
+        (event.event_type, event.aggregate_id)
+        for event in db.query(OutboxEvent).order_by(OutboxEvent.id)
+    ]
+
+
+def test_writes_append_outbox_events(client, test_user_token, db):
+    """Test deal and activity writes record their events."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    deal = client.post(
+        "/api/deals",
+        json={"title": "Rollout", "company_name": "Bosch", "value": 1000.0},
+        headers=headers,
+    ).json()
+    client.patch(f"/api/deals/{deal['id']}", json={"stage": "closed_won"}, headers=headers)
+    activity = client.post(
+        "/api/activities",
+        json={"deal_id": deal["id"], "activity_type": "call", "title": "Kickoff"},
+        headers=headers,
+    ).json()
+    bulk = client.post(
+        "/api/deals/bulk",
+        json=[{"title": "Bulk", "company_name": "SAP", "value": 500.0}],
+        headers=headers,
+    ).json()
+    bulk_id = bulk["created"][0]["id"]
+    client.patch("/api/deals/bulk-update", json=[{"id": bulk_id, "value": 800.0}], headers=headers)
+    client.delete(f"/api/deals/{bulk_id}", headers=headers)
+
+    assert _event_types(db) == [
+        ("deal.created", deal["id"]),
+        ("deal.updated", deal["id"]),
+        ("deal.won", deal["id"]),
+        ("activity.created", activity["id"]),
+        ("deal.created", bulk_id),
+        ("deal.updated", bulk_id),
+        ("deal.deleted", bulk_id),
+    ]
+    update = db.query(OutboxEvent).filter(OutboxEvent.event_type == "deal.updated").first()
+    assert update.payload == {"changes": ["stage"], "stage": "closed_won", "old_stage": "lead"}
+
+
+def test_relay_drains_in_batches_and_keeps_failed_batches(client, test_user_token, db):
+    """Test handled events are deleted and failed batches stay queued."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    for index in range(3):
+        client.post(
+            "/api/deals",
+            json={"title": f"Deal {index}", "company_name": "Bosch", "value": 1000.0},
+            headers=headers,
+        )
+
+    def failing(db_session, events):
+        raise RuntimeError("handler down")
+
+    assert asyncio.run(OutboxRelay(2, [failing], 3).drain(TestingAsyncSessionLocal)) == 0
+    assert [(event.attempts, event.last_error) for event in db.query(OutboxEvent)] == [
+        (1, "RuntimeError: handler down"),
+        (1, "RuntimeError: handler down"),
+        (0, None),
+    ]
+
+    handled = []
+    relay = OutboxRelay(2, [lambda db_session, events: handled.extend(e.id for e in events)], 3)
+    assert asyncio.run(relay.drain(TestingAsyncSessionLocal)) == 2
+    assert asyncio.run(relay.drain(TestingAsyncSessionLocal)) == 1
+    assert asyncio.run(relay.drain(TestingAsyncSessionLocal)) == 0
+    assert handled == sorted(handled) and len(handled) == 3
+    db.expire_all()
+    assert db.query(OutboxEvent).count() == 0
+
+
+def test_failing_event_is_isolated_and_set_aside(client, test_user_token, db):
+    """Test one event failing its handler does not block the others."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    deal_ids = [
+        client.post(
+            "/api/deals",
+            json={"title": f"Deal {index}", "company_name": "Bosch", "value": 1000.0},
+            headers=headers,
+        ).json()["id"]
+        for index in range(3)
+    ]
+    handled = []
+
+    def handler(db_session, events):
+        if any(event.aggregate_id == deal_ids[1] for event in events):
+            raise ValueError("bad payload")
+        handled.extend(event.aggregate_id for event in events)
+
+    relay = OutboxRelay(10, [handler], 2)
+    assert asyncio.run(relay.drain(TestingAsyncSessionLocal)) == 2
+    assert handled == [deal_ids[0], deal_ids[2]]
+    event = db.query(OutboxEvent).one()
+    assert (event.aggregate_id, event.attempts, event.failed_at) == (deal_ids[1], 1, None)
+
+    # Retried with later batches until set aside, then skipped
+    assert asyncio.run(relay.drain(TestingAsyncSessionLocal)) == 0
+    db.expire_all()
+    event = db.query(OutboxEvent).one()
+    assert event.attempts == 2
+    assert event.failed_at is not None
+    assert event.last_error == "ValueError: bad payload"
+
+    client.post(
+        "/api/deals",
+        json={"title": "Later", "company_name": "Bosch", "value": 1000.0},
+        headers=headers,
+    )
+    assert asyncio.run(relay.drain(TestingAsyncSessionLocal)) == 1
+    assert len(handled) == 3
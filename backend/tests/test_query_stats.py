@@ -0,0 +1,84 @@
+"""Tests for per-request SQL statistics."""
+import logging
+import re
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.db.query_stats import QueryStats, QueryStatsMiddleware, _current_stats, statement_shape
+from app.models.deal import Deal
+from tests.conftest import TestingSessionLocal
+
+
+def test_statement_shape_ignores_list_lengths():
+    """Test IN lists and multi-row VALUES of any length share one shape."""
+    assert statement_shape("SELECT * FROM deals WHERE id IN (?, ?, ?)") == statement_shape(
+        "SELECT *\n  FROM deals WHERE id IN (?, ?)"
+    )
+    assert statement_shape("INSERT INTO t (a, b) VALUES ($1::INTEGER, $2), ($3, $4)") == (
+        "INSERT INTO t (a, b) VALUES (...)"
+    )
+    assert statement_shape("SELECT * FROM deals WHERE id = %(id_1)s") == (
+        "SELECT * FROM deals WHERE id = %(id_1)s"
+    )
+
+
+def test_repeated_statements_are_reported(db, monkeypatch, caplog):
+    """Test counts, the Server-Timing header and the N+1 warning."""
+    monkeypatch.setattr(settings, "DEBUG", True)
+    app = FastAPI()
+
+    @app.get("/loop")
+    def loop():
+        with TestingSessionLocal() as session:
+            session.scalars(select(Deal.id)).all()
+            for deal_id in range(3):
+                session.get(Deal, deal_id + 1)
+        return {}
+
+    app.add_middleware(QueryStatsMiddleware, threshold=2)
+
+    with caplog.at_level(logging.INFO, logger="app.db.query_stats"):
+        response = TestClient(app).get("/loop")
+
+    assert re.fullmatch(r'db;dur=[\d.]+;desc="4 queries"', response.headers["Server-Timing"])
+    summary, warning = [record for record in caplog.records if record.name == "app.db.query_stats"]
+    assert summary.extra["sql"]["queries"] == 4
+    assert summary.extra["sql"]["distinct_statements"] == 2
+    assert summary.extra["sql"]["repeated"][0]["count"] == 3
+    assert warning.levelname == "WARNING"
+    assert "3 times" in warning.getMessage()
+
+
+def test_server_timing_only_in_debug(client, test_user_token, db, monkeypatch):
+    """Test the app reports database time per request in debug mode only."""
+    monkeypatch.setattr(settings, "DEBUG", False)
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    assert "Server-Timing" not in client.get("/api/deals/insights/summary", headers=headers).headers
+
+    monkeypatch.setattr(settings, "DEBUG", True)
+    timing = client.get("/api/deals/insights/summary", headers=headers).headers["Server-Timing"]
+    assert int(re.search(r'desc="(\d+) queries"', timing).group(1)) >= 6
+
+
+def test_failed_statements_do_not_leak_timers(db):
+    """Test a failing statement leaves no start time behind on its connection."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        with TestingSessionLocal() as session:
+            connection = session.connection()
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM missing_table"))
+            session.rollback()
+
+            connection = session.connection()
+            connection.execute(text("SELECT 1"))
+            assert not connection.info.get("query_started")
+    finally:
+        _current_stats.reset(token)
+    assert stats.count == 1
@@ -0,0 +1,122 @@
+"""Tests for read replica routing, with a second SQLite file as the replica."""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.database import Base
+from app.db.replica import replica_router
+from app.models.deal import Deal
+from app.models.replication import ReplicationHeartbeat
+from tests.conftest import TestingAsyncSessionLocal, engine as primary_engine
+
+
+@pytest.fixture
+def replica(tmp_path):
+    """Configure an empty replica database file."""
+    path = tmp_path / "replica.db"
+    replica_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=replica_engine)
+    replica_router.configure(
+        async_sessionmaker(
+            bind=create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool),
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+    )
+    yield replica_engine
+    replica_router.configure(None)
+    replica_engine.dispose()
+
+
+def _replicate(replica_engine):
+    """Copy all rows of the primary to the replica."""
+    with primary_engine.connect() as source, replica_engine.begin() as target:
+        for table in reversed(Base.metadata.sorted_tables):
+            target.execute(delete(table))
+        for table in Base.metadata.sorted_tables:
+            rows = [dict(row._mapping) for row in source.execute(select(table))]
+            if rows:
+                target.execute(insert(table), rows)
+
+
+def _check_lag():
+    """Run one heartbeat round."""
+    return asyncio.run(replica_router.check_lag(TestingAsyncSessionLocal))
+
+
+def _titles(client, headers):
+    """List deal titles (one deal per page keeps the AI rate limit cost at one)."""
+    response = client.get("/api/deals", params={"limit": 1}, headers=headers)
+    return [deal["title"] for deal in response.json()["deals"]]
+
+
+def test_reads_use_replica_once_caught_up(client, test_user_token, db, replica):
+    """Test list reads go to the replica unless it misses the tenant's writes."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    deal = client.post(
+        "/api/deals",
+        json={"title": "Rollout", "company_name": "Bosch", "value": 1000.0},
+        headers=headers,
+    ).json()
+
+    # No heartbeat on the replica yet: lag unknown, primary
+    assert _check_lag() is None
+    assert _titles(client, headers) == ["Rollout"]
+
+    _replicate(replica)
+    assert _check_lag() == 0.0
+    with replica.begin() as connection:
+        connection.execute(update(Deal).values(title="Replica copy"))
+    assert _titles(client, headers) == ["Replica copy"]
+
+    # A write the replica has not applied yet sends the tenant to the primary
+    client.patch(f"/api/deals/{deal['id']}", json={"title": "Renamed"}, headers=headers)
+    assert _titles(client, headers) == ["Renamed"]
+    assert client.get("/api/activities/feed", headers=headers).status_code == 200
+
+    _replicate(replica)
+    with replica.begin() as connection:
+        connection.execute(update(Deal).values(title="Replica copy"))
+    assert _titles(client, headers) == ["Replica copy"]
+
+    assert client.get("/metrics/db-replica", headers=headers).status_code == 403
+    test_user_token["user"].is_admin = True
+    db.commit()
+    reads = client.get("/metrics/db-replica", headers=headers).json()["reads"]
+    assert reads["replica"] == 2
+    assert reads["primary_lag"] == 1
+    assert reads["primary_read_your_writes"] == 2
+
+
+def test_lagging_or_unreachable_replica_falls_back_to_primary(client, test_user_token, db, replica, tmp_path):
+    """Test reads go to the primary while the replica lags or is down."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    client.post(
+        "/api/deals",
+        json={"title": "Rollout", "company_name": "Bosch", "value": 1000.0},
+        headers=headers,
+    )
+    _check_lag()
+    _replicate(replica)
+    _check_lag()
+    with replica.begin() as connection:
+        connection.execute(update(Deal).values(title="Replica copy"))
+        connection.execute(
+            update(ReplicationHeartbeat).values(beat_at=datetime.utcnow() - timedelta(seconds=60))
+        )
+
+    assert _check_lag() > replica_router.max_lag_seconds
+    assert _titles(client, headers) == ["Rollout"]
+
+    replica_router.configure(
+        async_sessionmaker(
+            bind=create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db", poolclass=NullPool),
+            class_=AsyncSession,
+        )
+    )
+    assert _check_lag() is None
+    assert _titles(client, headers) == ["Rollout"]
@@ -0,0 +1,372 @@
+"""Tests for outbound webhook delivery."""
+import asyncio
+import hmac
+from datetime import datetime, timedelta
+
+import httpx
+import orjson
+import pytest
+from fastapi import FastAPI, Request, Response
+from sqlalchemy import event, update
+
+from app.core.config import settings
+from app.models.deal import Deal
+from app.models.webhook import DeliveryStatus, WebhookDelivery, WebhookEvent, WebhookSubscription
+from app.services.outbox import outbox_relay
+from app.services.webhook_service import (
+    WebhookDispatcher,
+    WebhookService,
+    deal_event_payload,
+    sign_payload,
+)
+from tests.conftest import TestingAsyncSessionLocal, TestingSessionLocal, async_engine
+
+
+@pytest.fixture(autouse=True)
+def webhook_admin(test_user_token, db, monkeypatch):
+    """Make the test user an admin and allow the local stub receiver."""
+    test_user_token["user"].is_admin = True
+    db.commit()
+    monkeypatch.setattr(settings, "WEBHOOK_ALLOW_PRIVATE_TARGETS", True)
+
+
+def _stub_receiver(*secrets, fail=False, delay=0.0):
+    """Create a local receiver app recording deliveries signed with one of the secrets."""
+    stub = FastAPI()
+    stub.state.received = []
+    stub.state.in_flight = 0
+    stub.state.max_in_flight = 0
+
+    @stub.post("/hook")
+    async def hook(request: Request):
+        stub.state.in_flight += 1
+        stub.state.max_in_flight = max(stub.state.max_in_flight, stub.state.in_flight)
+        await asyncio.sleep(delay)
+        stub.state.in_flight -= 1
+
+        body = (await request.body()).decode()
+        signature = request.headers["X-Webhook-Signature"]
+        assert any(hmac.compare_digest(sign_payload(body, secret), signature) for secret in secrets)
+        stub.state.received.append((request.headers["X-Webhook-Event"], body))
+        return Response(status_code=500 if fail else 204)
+
+    return stub
+
+
+def _relay():
+    """Fan the outbox out into webhook deliveries."""
+    return asyncio.run(outbox_relay.drain(TestingAsyncSessionLocal))
+
+
+def _dispatch(stub, **options):
+    """Run one dispatch batch against the stub receiver."""
+    dispatcher = WebhookDispatcher(
+        **{
+            "batch_size": 100,
+            "max_attempts": 3,
+            "backoff_base": 0.0,
+            "backoff_max": 0.0,
+            "endpoint_concurrency": 4,
+            **options,
+        }
+    )
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=stub), base_url="http://receiver"
+        ) as client:
+            dispatcher.use_client(client)
+            return await dispatcher.dispatch(TestingAsyncSessionLocal)
+
+    return asyncio.run(run())
+
+
+def _subscribe(client, headers, events, **extra):
+    """Subscribe the stub receiver to events."""
+    response = client.post(
+        "/api/webhooks/subscriptions",
+        json={"url": "http://receiver/hook", "events": events, **extra},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_deal_updates_are_pushed_signed(client, test_user_token, db):
+    """Test updates queue subscribed events and deliver them signed."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    won = _subscribe(client, headers, ["deal.won"])
+    updated = _subscribe(client, headers, ["deal.updated", "deal.won"])
+
+    deal = client.post(
+        "/api/deals",
+        json={"title": "Rollout", "company_name": "Bosch", "value": 1000.0},
+        headers=headers,
+    ).json()
+    client.patch(f"/api/deals/{deal['id']}", json={"notes": "Call back"}, headers=headers)
+    client.patch(f"/api/deals/{deal['id']}", json={"stage": "closed_won"}, headers=headers)
+
+    # Nothing is queued until the outbox is relayed
+    assert db.query(WebhookDelivery).count() == 0
+    _relay()
+
+    # 2 updates to one subscription, the win to both
+    assert db.query(WebhookDelivery).count() == 4
+
+    stub = _stub_receiver(won["secret"], updated["secret"])
+    assert _dispatch(stub) == 4
+    assert sorted(event for event, _ in stub.state.received) == [
+        "deal.updated",
+        "deal.updated",
+        "deal.won",
+        "deal.won",
+    ]
+    assert all(
+        delivery.status == DeliveryStatus.DELIVERED and delivery.attempts == 1
+        for delivery in db.query(WebhookDelivery)
+    )
+
+    # Delivered rows are not sent again
+    assert _dispatch(stub) == 0
+
+
+def test_failed_deliveries_back_off_and_dead_letter(client, test_user_token, db):
+    """Test failures are retried, dead-lettered and can be requeued."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    subscription = _subscribe(client, headers, ["deal.updated"])
+    deal = client.post(
+        "/api/deals",
+        json={"title": "Rollout", "company_name": "Bosch", "value": 1000.0},
+        headers=headers,
+    ).json()
+    client.patch(f"/api/deals/{deal['id']}", json={"notes": "Call back"}, headers=headers)
+    _relay()
+
+    stub = _stub_receiver(subscription["secret"], fail=True)
+    for attempt in range(1, 4):
+        assert _dispatch(stub) == 1
+        db.expire_all()
+        delivery = db.query(WebhookDelivery).one()
+        assert delivery.attempts == attempt
+        assert delivery.last_status_code == 500
+        assert delivery.last_error == "HTTP 500"
+    assert delivery.status == DeliveryStatus.DEAD
+    assert _dispatch(stub) == 0
+
+    dead = client.get("/api/webhooks/deliveries", params={"status": "dead"}, headers=headers).json()
+    assert [item["id"] for item in dead] == [delivery.id]
+
+    response = client.post(f"/api/webhooks/deliveries/{delivery.id}/retry", headers=headers)
+    assert response.json()["status"] == "pending"
+    assert _dispatch(_stub_receiver(subscription["secret"])) == 1
+
+
+def test_endpoint_concurrency_is_capped(client, test_user_token, db):
+    """Test parallel requests to one endpoint respect its limit."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    subscription = _subscribe(client, headers, ["deal.updated"], max_concurrency=2)
+    deal = client.post(
+        "/api/deals",
+        json={"title": "Rollout", "company_name": "Bosch", "value": 1000.0},
+        headers=headers,
+    ).json()
+    for index in range(6):
+        client.patch(f"/api/deals/{deal['id']}", json={"notes": f"Note {index}"}, headers=headers)
+    _relay()
+
+    stub = _stub_receiver(subscription["secret"], delay=0.05)
+    assert _dispatch(stub) == 6
+    assert len(stub.state.received) == 6
+    assert stub.state.max_in_flight == 2
+
+
+def test_digest_batches_and_coalesces_events(client, test_user_token, db):
+    """Test digest subscriptions get one coalesced delivery per window or size."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    subscription = _subscribe(client, headers, ["deal.updated"], digest_window_seconds=60, digest_max_events=3)
+    deal_ids = [
+        client.post(
+            "/api/deals",
+            json={"title": f"Deal {index}", "company_name": "Bosch", "value": 1000.0},
+            headers=headers,
+        ).json()["id"]
+        for index in range(4)
+    ]
+
+    # Repeated updates of a deal collapse into one entry
+    client.patch(
+        "/api/deals/bulk-update",
+        json=[{"id": deal_id, "notes": "First"} for deal_id in deal_ids[:2]],
+        headers=headers,
+    )
+    client.patch(f"/api/deals/{deal_ids[0]}", json={"notes": "Second"}, headers=headers)
+    _relay()
+
+    stub = _stub_receiver(subscription["secret"])
+    assert _dispatch(stub) == 0  # Window still open
+    digest = db.query(WebhookDelivery).one()
+    assert digest.status == DeliveryStatus.BATCHING
+    entries = orjson.loads(digest.body)["events"]
+    assert [(entry["deal"]["id"], entry["deal"]["notes"]) for entry in entries] == [
+        (deal_ids[0], "Second"),
+        (deal_ids[1], "First"),
+    ]
+
+    # Filling the digest closes it at once and opens the next one
+    client.patch(
+        "/api/deals/bulk-update",
+        json=[{"id": deal_id, "notes": "Third"} for deal_id in deal_ids],
+        headers=headers,
+    )
+    _relay()
+    assert _dispatch(stub) == 1
+    event, body = stub.state.received[0]
+    assert event == "digest"
+    assert orjson.loads(body)["count"] == 3
+
+    db.execute(update(WebhookDelivery).values(next_attempt_at=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+    assert _dispatch(stub) == 1
+    assert [entry["deal"]["id"] for entry in orjson.loads(stub.state.received[1][1])["events"]] == [
+        deal_ids[3]
+    ]
+
+
+def test_subscriptions_require_admin(client, test_user_token, db):
+    """Test only admins manage subscriptions and deliveries."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    test_user_token["user"].is_admin = False
+    db.commit()
+
+    response = client.post(
+        "/api/webhooks/subscriptions",
+        json={"url": "http://receiver/hook", "events": ["deal.won"]},
+        headers=headers,
+    )
+    assert response.status_code == 403
+    assert client.get("/api/webhooks/subscriptions", headers=headers).status_code == 403
+    assert client.get("/api/webhooks/deliveries", headers=headers).status_code == 403
+
+
+def test_private_targets_are_rejected(client, test_user_token, db, monkeypatch):
+    """Test subscriptions cannot target internal addresses, at creation or send time."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    monkeypatch.setattr(settings, "WEBHOOK_ALLOW_PRIVATE_TARGETS", False)
+
+    for url in (
+        "http://127.0.0.1/hook",
+        "http://localhost:8000/hook",
+        "http://10.0.0.5/hook",
+        "http://169.254.169.254/latest/meta-data",
+        "http://[::ffff:127.0.0.1]/hook",
+    ):
+        response = client.post(
+            "/api/webhooks/subscriptions",
+            json={"url": url, "events": ["deal.updated"]},
+            headers=headers,
+        )
+        assert response.status_code == 400, url
+
+    # A subscription whose host resolves privately later is not called
+    monkeypatch.setattr(settings, "WEBHOOK_ALLOW_PRIVATE_TARGETS", True)
+    _subscribe(client, headers, ["deal.updated"])
+    deal = client.post(
+        "/api/deals",
+        json={"title": "Rollout", "company_name": "Bosch", "value": 1000.0},
+        headers=headers,
+    ).json()
+    client.patch(f"/api/deals/{deal['id']}", json={"notes": "Call back"}, headers=headers)
+    _relay()
+    db.execute(update(WebhookSubscription).values(url="http://127.0.0.1/hook"))
+    db.commit()
+
+    monkeypatch.setattr(settings, "WEBHOOK_ALLOW_PRIVATE_TARGETS", False)
+    stub = _stub_receiver()
+    assert _dispatch(stub) == 1
+    assert stub.state.received == []
+    delivery = db.query(WebhookDelivery).one()
+    assert delivery.last_status_code is None
+    assert "non-public address 127.0.0.1" in delivery.last_error
+
+
+def test_subscription_secrets_are_generated_and_rotated(client, test_user_token, db):
+    """Test each subscription gets its own secret, shown only on creation and rotation."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    first = _subscribe(client, headers, ["deal.updated"])
+    second = _subscribe(client, headers, ["deal.updated"])
+    assert len(first["secret"]) == 64
+    assert first["secret"] != second["secret"]
+    assert all("secret" not in item for item in client.get("/api/webhooks/subscriptions", headers=headers).json())
+
+    deal = client.post(
+        "/api/deals",
+        json={"title": "Rollout", "company_name": "Bosch", "value": 1000.0},
+        headers=headers,
+    ).json()
+    client.patch(f"/api/deals/{deal['id']}", json={"notes": "Call back"}, headers=headers)
+    _relay()
+
+    # Legacy subscriptions without a secret are not sent with the global one
+    db.execute(update(WebhookSubscription).where(WebhookSubscription.id == first["id"]).values(secret=None))
+    db.commit()
+    stub = _stub_receiver(second["secret"])
+    assert _dispatch(stub) == 2
+    assert len(stub.state.received) == 1
+    failed = db.query(WebhookDelivery).filter_by(subscription_id=first["id"]).one()
+    assert failed.status == DeliveryStatus.PENDING
+    assert "no signing secret" in failed.last_error
+
+    rotated = client.post(f"/api/webhooks/subscriptions/{first['id']}/secret", headers=headers).json()
+    assert len(rotated["secret"]) == 64
+    db.execute(update(WebhookDelivery).values(next_attempt_at=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+    assert _dispatch(_stub_receiver(rotated["secret"])) == 1
+
+
+def test_digest_entries_added_before_the_claim_are_sent(client, test_user_token, db):
+    """Test entries added between the due select and the claim are in the sent digest."""
+    headers = {"Authorization": f"Bearer {test_user_token['token']}"}
+    subscription = _subscribe(client, headers, ["deal.updated"], digest_window_seconds=60)
+    first, second = [
+        client.post(
+            "/api/deals",
+            json={"title": f"Deal {index}", "company_name": "Bosch", "value": 1000.0},
+            headers=headers,
+        ).json()["id"]
+        for index in range(2)
+    ]
+    client.patch(f"/api/deals/{first}", json={"notes": "First"}, headers=headers)
+    _relay()
+
+    # Window closed for the dispatcher
+    closed_at = datetime.utcnow() - timedelta(seconds=1)
+    db.execute(update(WebhookDelivery).values(next_attempt_at=closed_at))
+    db.commit()
+
+    added = []
+
+    def add_entry(conn, cursor, statement, parameters, context, executemany):
+        """Commit a fan-out that started before the window closed, right before the claim."""
+        if added or not statement.startswith("UPDATE webhook_deliveries"):
+            return
+        added.append(second)
+        with TestingSessionLocal() as session:
+            payload = deal_event_payload(WebhookEvent.DEAL_UPDATED, session.get(Deal, second))
+            WebhookService.add_to_digest(
+                session,
+                session.get(WebhookSubscription, subscription["id"]),
+                [(WebhookEvent.DEAL_UPDATED, payload)],
+                closed_at - timedelta(seconds=1),
+            )
+            session.commit()
+
+    stub = _stub_receiver(subscription["secret"])
+    event.listen(async_engine.sync_engine, "before_cursor_execute", add_entry)
+    try:
+        assert _dispatch(stub) == 1
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", add_entry)
+
+    assert added == [second]
+    entries = orjson.loads(stub.state.received[0][1])["events"]
+    assert [entry["deal"]["id"] for entry in entries] == [first, second]
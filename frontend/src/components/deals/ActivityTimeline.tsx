@@ -1,5 +1,9 @@
 import { useState } from "react";
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import {
+  useInfiniteQuery,
+  useMutation,
+  useQueryClient,
+} from "@tanstack/react-query";
 import { useForm } from "react-hook-form";
 import {
   MessageSquare,
@@ -42,11 +46,15 @@ export const ActivityTimeline = ({ dealId }: ActivityTimelineProps) => {
     description?: string;
   }>();
 
-  // Fetch activities
-  const { data: activities, isLoading } = useQuery({
-    queryKey: ["activities", dealId],
-    queryFn: () => activitiesApi.list(dealId),
-  });
+  // Fetch activities (newest first, one page at a time)
+  const { data, isLoading, hasNextPage, fetchNextPage, isFetchingNextPage } =
+    useInfiniteQuery({
+      queryKey: ["activities", dealId],
+      queryFn: ({ pageParam }) => activitiesApi.list(dealId, pageParam),
+      initialPageParam: undefined as string | undefined,
+      getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+    });
+  const activities = data?.pages.flatMap((page) => page.activities);
 
   // Create activity mutation
   const createMutation = useMutation({
@@ -181,6 +189,17 @@ export const ActivityTimeline = ({ dealId }: ActivityTimelineProps) => {
               </div>
             );
           })}
+          {hasNextPage && (
+            <div className="text-center">
+              <button
+                onClick={() => fetchNextPage()}
+                className="btn btn-secondary text-sm"
+                disabled={isFetchingNextPage}
+              >
+                {isFetchingNextPage ? "Lädt..." : "Ältere Aktivitäten laden"}
+              </button>
+            </div>
+          )}
         </div>
       ) : (
         <p className="text-center text-gray-600 py-8">
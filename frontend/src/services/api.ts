@@ -6,6 +6,7 @@ import type {
   DealUpdate,
   Activity,
   ActivityCreate,
+  ActivityPage,
   DealInsights,
 } from "../types";
 
@@ -85,8 +86,10 @@ export const dealsApi = {
 
 // Activities API
 export const activitiesApi = {
-  list: async (dealId: number): Promise<Activity[]> => {
-    const response = await api.get(`/api/activities/deal/${dealId}`);
+  list: async (dealId: number, cursor?: string): Promise<ActivityPage> => {
+    const response = await api.get(`/api/activities/deal/${dealId}`, {
+      params: cursor ? { cursor } : undefined,
+    });
     return response.data;
   },
 
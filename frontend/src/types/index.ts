@@ -48,6 +48,10 @@ export interface Deal {
   notes?: string;
   created_at: string;
   updated_at: string;
+  activity_count?: number;
+  activity_counts?: Record<ActivityType, number>;
+  last_activity_type?: ActivityType;
+  last_activity_at?: string;
   next_actions?: string[];
 }
 
@@ -85,6 +89,11 @@ export interface Activity {
   created_at: string;
 }
 
+export interface ActivityPage {
+  activities: Activity[];
+  next_cursor: string | null;
+}
+
 export interface ActivityCreate {
   deal_id: number;
   activity_type: ActivityType;